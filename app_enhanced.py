@@ -3,17 +3,31 @@ Enhanced App with Flexible Date Format Support for PT KAI Talent Profiles
 """
 
 import base64
-import io
 import os
+import shutil
 import tempfile
 import zipfile
 import re
 from datetime import datetime
 
-import pandas as pd
 import streamlit as st
 from fpdf import FPDF
 
+try:
+    from dateutil import parser as date_parser
+except ImportError:
+    date_parser = None
+
+import font_cache
+import pipeline
+import preview
+import text_layout
+import timing
+from enhanced_date_parser import parse_birth_column
+from merge_sources import load_uploaded, to_excel_bytes
+from photo_cache import get_thumbnail
+from talent_data import build_nipp_index, find_photo, normalize_header
+
 # ========== ENHANCED DATE PARSER ==========
 class EnhancedDateParser:
     """Advanced date parser supporting multiple Indonesian and international formats"""
@@ -42,11 +56,11 @@ class EnhancedDateParser:
         date_str = re.sub(r'\s+', ' ', date_str)
         
         # Try dateutil parser if available
-        try:
-            from dateutil import parser as date_parser
-            return date_parser.parse(date_str, dayfirst=True)
-        except:
-            pass
+        if date_parser is not None:
+            try:
+                return date_parser.parse(date_str, dayfirst=True)
+            except:
+                pass
             
         # Try manual pattern matching
         for pattern in cls.DATE_PATTERNS:
@@ -190,20 +204,40 @@ st.markdown("""
 FONTS_DIR = "fonts"
 FONT_PATH = os.path.join(FONTS_DIR, "DejaVuSans.ttf")
 FONT_BOLD_PATH = os.path.join(FONTS_DIR, "DejaVuSans-Bold.ttf")
+font_cache.install()
 
 # ========== PDF CLASS ==========
 class CustomPDF(FPDF):
     def __init__(self):
         super().__init__()
-        if os.path.exists(FONT_PATH):
-            self.add_font("DejaVu", "", FONT_PATH, uni=True)
-        if os.path.exists(FONT_BOLD_PATH):
-            self.add_font("DejaVu", "B", FONT_BOLD_PATH, uni=True)
+        with timing.stage("font_loading"):
+            if os.path.exists(FONT_PATH):
+                font_cache.add_cached_font(self, "DejaVu", "", FONT_PATH)
+            if os.path.exists(FONT_BOLD_PATH):
+                font_cache.add_cached_font(self, "DejaVu", "B", FONT_BOLD_PATH)
         if os.path.exists(FONT_PATH):
             self.set_font("DejaVu", "", 12)
         else:
             self.set_font("Arial", "", 12)
 
+    @timing.timed("image_embedding")
+    def image(self, *args, **kwargs):
+        return super().image(*args, **kwargs)
+
+    @timing.timed("pdf_output")
+    def output(self, name='', dest=''):
+        return super().output(name, dest)
+
+    def get_string_width(self, s):
+        return text_layout.string_width(self, s)
+
+    # Seperti FPDF.multi_cell: error yang jelas kalau belum ada add_page()
+    @FPDF.check_page
+    def multi_cell(self, w, h, txt='', border=0, align='J', fill=0, split_only=False):
+        if split_only:
+            return [text for text, _ in text_layout.wrap(self, w, txt)]
+        text_layout.multi_cell(self, w, h, txt, border, align, fill)
+
     def header(self):
         try:
             self.image("logo_kai.png", 10, 8, 30)
@@ -224,15 +258,19 @@ class CustomPDF(FPDF):
         if self.get_y() + h > self.page_break_trigger:
             self.add_page()
 
+    @timing.timed("layout")
     def add_profile(self, data, foto_path):
         def get_val(field):
             val = str(data.get(field, "-")).strip()
             return val if val else "-"
 
-        # Process birth place and date
-        birth_info = EnhancedDateParser.extract_place_and_date(
-            get_val("Tempat & Tanggal Lahir")
-        )
+        # Tempat & tanggal lahir sudah diproses per kolom di process_date_fields
+        if "TANGGAL_LAHIR_FORMATTED" in data:
+            birth_info = {"place": get_val("TEMPAT_LAHIR"), "formatted_date": get_val("TANGGAL_LAHIR_FORMATTED")}
+        else:
+            birth_info = EnhancedDateParser.extract_place_and_date(
+                get_val("Tempat & Tanggal Lahir")
+            )
         
         self.set_xy(10, 28)
         self.rect(10, 28, 190, 255)
@@ -307,13 +345,13 @@ class CustomPDF(FPDF):
 
         for line in get_val("Working Experience").split("\n"):
             if line.strip():
-                self.check_page_break(40)
                 if "(" in line and ")" in line:
                     jabatan = line.split("(")[0].strip()
                     tanggal = line[line.find("("):].strip()
                 else:
                     jabatan = line.strip()
                     tanggal = ""
+                self.check_page_break(10 if tanggal else 5)
                 self.set_x(15)
                 self.set_font("DejaVu", "B", 9)
                 self.cell(175, 5, jabatan, ln=1)
@@ -324,26 +362,30 @@ class CustomPDF(FPDF):
         y_exp_end = self.get_y()
         self.rect(15, y_exp_start - 8, 175, y_exp_end - y_exp_start + 10)
 
-        y_attr_start = y_exp_end + 6
-        self.set_y(y_attr_start)
-        self.set_x(15)
-        self.set_font("DejaVu", "B", 10)
-        self.cell(0, 6, "PERSONAL ATTRIBUTES", ln=1)
-        self.line(15, self.get_y(), 190, self.get_y())
-        y_attr_content_start = self.get_y() + 2
-
         # Use processed birth info
         birth_place = birth_info["place"]
         birth_date = birth_info["formatted_date"]
-        
-        for label, field, value in [
+        attributes = [
             ("Tempat & Tanggal Lahir", "Tempat & Tanggal Lahir", f"{birth_place}, {birth_date}"),
             ("Usia", "Usia", get_val("Usia")),
             ("Pendidikan", "Pendidikan", get_val("Pendidikan")),
             ("Grade", "Grade", get_val("Grade")),
             ("Penghargaan", "Penghargaan", get_val("Penghargaan")),
             ("Hukuman Disiplin", "Hukuman Disiplin", get_val("Hukuman Disiplin")),
-        ]:
+        ]
+        attr_height = 6 + sum(text_layout.text_height(self, 125, 5, value, font=("DejaVu", "", 9))
+                              for _, _, value in attributes)
+
+        y_attr_start = y_exp_end + 6
+        self.set_y(y_attr_start)
+        self.check_page_break(attr_height)
+        self.set_x(15)
+        self.set_font("DejaVu", "B", 10)
+        self.cell(0, 6, "PERSONAL ATTRIBUTES", ln=1)
+        self.line(15, self.get_y(), 190, self.get_y())
+        y_attr_content_start = self.get_y() + 2
+        
+        for label, field, value in attributes:
             self.set_x(16)
             self.set_font("DejaVu", "B", 9)
             self.cell(43, 5, f"{label}:", ln=0)
@@ -355,6 +397,23 @@ class CustomPDF(FPDF):
         self.rect(15, y_attr_content_start - 8, 175, end_y - y_attr_content_start + 10)
 
 # ========== MAIN APP ==========
+def remember_timings(timings):
+    """Simpan hasil timing terakhir per jenis request untuk panel sidebar"""
+    st.session_state.setdefault("timings", {})[timings.name] = timings
+
+def show_timings_panel():
+    with st.sidebar:
+        st.subheader("⏱️ Waktu per tahap")
+        all_timings = st.session_state.get("timings", {})
+        if not all_timings:
+            st.caption("Belum ada request yang diukur.")
+        for name, timings in all_timings.items():
+            st.caption(f"**{name}** · {timings.total:.2f} detik")
+            st.dataframe(timings.rows(), hide_index=True, use_container_width=True)
+            if timings.profile_path:
+                st.caption(f"cProfile: `{timings.profile_path}`")
+        st.caption(f"Log: `{timing.TIMING_LOG}`")
+
 def main():
     st.markdown('<div class="main-header">Profil Staff PT KAI - Enhanced Date Support</div>', unsafe_allow_html=True)
     
@@ -364,20 +423,32 @@ def main():
         st.info("Sistem mendukung berbagai format tanggal:\n- 15 Januari 1990\n- 23/05/1985\n- 12-03-1992\n- 30 Juni 1988")
         
         st.header("📁 Upload Data")
-        uploaded_file = st.file_uploader(
-            "Unggah file Excel (.xlsx)",
-            type=['xlsx'],
-            help="File Excel dengan kolom 'NAMA', 'TEMPAT & TANGGAL LAHIR', dll."
+        uploaded_files = st.file_uploader(
+            "Unggah file Excel (.xlsx) atau CSV template",
+            type=['xlsx', 'csv'],
+            accept_multiple_files=True,
+            help="File Excel dengan kolom 'NAMA', 'TEMPAT & TANGGAL LAHIR', dll. "
+                 "Beberapa file digabung per NIPP; kalau NIPP sama, file yang diunggah terakhir menang."
         )
+        
+        st.header("⏱️ Performa")
+        show_timings = st.toggle("Tampilkan waktu per tahap")
+        profile_batch = st.toggle("Rekam cProfile untuk batch berikutnya",
+                                  help=f"Hasil .prof disimpan di {timing.PROFILE_DIR}")
     
-    if uploaded_file:
+    if uploaded_files:
         try:
-            # Read Excel file
-            df = pd.read_excel(uploaded_file)
-            df.columns = [col.strip().upper() for col in df.columns]
-            
-            # Process date fields
-            df = process_date_fields(df)
+            # Read Excel file and process date fields (di-cache per isi file)
+            file_names = ", ".join(f.name for f in uploaded_files)
+            with timing.collect("enhanced.ingest", log=False, file_name=file_names) as ingest_timings:
+                df, conflicts = load_uploaded(
+                    uploaded_files, name_column="NAMA",
+                    clean=clean_uploaded_data, namespace="enhanced", columns=None
+                )
+            # Rerun yang kena cache memori tidak punya stage; hanya ingest sungguhan yang dicatat
+            if ingest_timings.seconds:
+                timing.write_log(ingest_timings)
+                remember_timings(ingest_timings)
             
             # Display summary
             st.subheader("📊 Ringkasan Data")
@@ -397,86 +468,119 @@ def main():
             with col4:
                 st.metric("Data Kosong", missing_dates)
             
+            if not conflicts.empty:
+                with st.expander(f"⚠️ {conflicts['NIPP'].nunique()} NIPP berbeda antar file, dipakai file yang lebih baru"):
+                    st.dataframe(conflicts, hide_index=True, use_container_width=True)
+                    st.download_button("📥 Download daftar konflik", data=to_excel_bytes(conflicts),
+                                       file_name="konflik_gabungan.xlsx")
+            
             # Display processed data
             st.subheader("📋 Data yang Diproses")
             display_cols = ["NAMA", "TEMPAT_LAHIR", "TANGGAL_LAHIR_FORMATTED", "TALENT_CLASSIFICATION"]
             available_cols = [col for col in display_cols if col in df.columns]
             
             if available_cols:
-                st.dataframe(df[available_cols], use_container_width=True)
+                # Satu halaman per rerun; teks lengkap muncul saat baris dipilih
+                preview.show_preview(
+                    preview.frame_fetch(df, "NAMA"),
+                    available_cols,
+                    sort_columns=available_cols,
+                    filter_values={col: preview.frame_values(df, col) for col in ("TALENT_CLASSIFICATION",)
+                                   if col in df.columns},
+                    name_label="NAMA",
+                    key="enhanced_preview",
+                )
             
             # Download options
             st.subheader("⬇️ Opsi Download")
             
             col1, col2 = st.columns(2)
             
+            # Kunci baris: NIPP kalau ada (nama bisa kembar), selain itu NAMA
+            key_col = "NIPP" if "NIPP" in df.columns else "NAMA"
+            row_index = build_nipp_index(df, key_col) if key_col in df.columns else {}
+            row_labels = {key: f"{df.at[idx, 'NAMA']} ({key})" if key_col == "NIPP" else key
+                          for key, idx in row_index.items()}
+            
             with col1:
                 if "NAMA" in df.columns:
-                    selected_name = st.selectbox("Pilih individu:", df["NAMA"].dropna().unique())
+                    selected_key = st.selectbox("Pilih individu:", list(row_index), format_func=row_labels.get)
                     
                     if st.button("📄 Generate PDF Individu"):
-                        with st.spinner("Membuat PDF..."):
-                            data = df[df["NAMA"] == selected_name].iloc[0]
+                        with st.spinner("Membuat PDF..."), timing.collect("enhanced.individual", nipp=selected_key) as t:
+                            data = df.loc[row_index[selected_key]]
+                            selected_name = data["NAMA"]
+                            
+                            pdf = CustomPDF()
+                            pdf.add_page()
                             
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                                pdf = CustomPDF()
-                                pdf.add_page()
-                                
-                                foto_file = str(data.get("FOTO", "")).strip()
-                                img_path = os.path.join("Foto Talent Profile", foto_file) if foto_file else None
-                                if not (img_path and os.path.isfile(img_path)):
-                                    img_path = None
-                                
-                                pdf.add_profile(data.to_dict(), img_path)
-                                pdf.output(tmp.name)
-                                
-                                with open(tmp.name, "rb") as f:
-                                    st.download_button(
-                                        label="📥 Download PDF",
-                                        data=f.read(),
-                                        file_name=f"Profil_{selected_name}.pdf",
-                                        mime="application/pdf"
-                                    )
+                            img_path = find_photo(data.get("FOTO"), data.get("NIPP"))
+                            pdf.add_profile(data.to_dict(), get_thumbnail(img_path))
+                            pdf_bytes = pdf.output(dest='S').encode('latin-1')
+                        remember_timings(t)
+                        
+                        st.download_button(
+                                label="📥 Download PDF",
+                                data=pdf_bytes,
+                                file_name=f"Profil_{selected_name}.pdf",
+                                mime="application/pdf"
+                            )
             
             with col2:
                 batch_size = st.number_input("Jumlah per batch:", min_value=1, max_value=50, value=10)
                 
-                names = df["NAMA"].dropna().unique()
-                total_batches = (len(names) + batch_size - 1) // batch_size
+                keys = list(row_index)
+                total_batches = (len(keys) + batch_size - 1) // batch_size
                 selected_batch = st.selectbox("Pilih batch:", range(1, total_batches + 1))
                 
                 if st.button("📦 Generate PDF Batch"):
-                    with st.spinner("Membuat batch PDF..."):
+                    with st.spinner("Membuat batch PDF..."), timing.collect(
+                        "enhanced.batch_zip", profile=profile_batch, batch=selected_batch
+                    ) as batch_timings:
                         start = (selected_batch - 1) * batch_size
-                        end = min(selected_batch * batch_size, len(names))
-                        selected_names = names[start:end]
+                        end = min(selected_batch * batch_size, len(keys))
+                        selected_keys = keys[start:end]
                         
-                        buffer = io.BytesIO()
-                        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                            for name in selected_names:
-                                row = df[df["NAMA"] == name].iloc[0]
-                                
-                                pdf = CustomPDF()
-                                pdf.add_page()
-                                
-                                foto_file = str(row.get("FOTO", "")).strip()
-                                img_path = os.path.join("Foto Talent Profile", foto_file) if foto_file else None
-                                if not (img_path and os.path.isfile(img_path)):
-                                    img_path = None
-                                
-                                pdf.add_profile(row.to_dict(), img_path)
-                                
-                                pdf_bytes = pdf.output(dest='S')
-                                safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                                zipf.writestr(f"Profil_{safe_name}.pdf", pdf_bytes)
+                        # ZIP ditulis ke file sementara di disk lalu diberikan ke download_button
+                        # sebagai file terbuka; PDF sudah terkompresi sehingga disimpan tanpa
+                        # kompresi ulang
+                        # Foto profil berikutnya disiapkan dan ZIP ditulis di thread lain
+                        # selagi profil sekarang dirender (pipeline.py)
+                        def load_photo(key):
+                            row = df.loc[row_index[key]]
+                            return row, get_thumbnail(find_photo(row.get("FOTO"), row.get("NIPP")))
                         
-                        buffer.seek(0)
-                        st.download_button(
-                            label="📥 Download ZIP Batch",
-                            data=buffer.getvalue(),
-                            file_name=f"batch_{selected_batch}.zip",
-                            mime="application/zip"
-                        )
+                        def write_pdf(arcname, pdf_bytes):
+                            with timing.stage("zip_write"):
+                                zipf.writestr(arcname, pdf_bytes)
+                        
+                        tmp_dir = tempfile.mkdtemp(prefix="talent-batch-")
+                        zip_path = os.path.join(tmp_dir, f"batch_{selected_batch}.zip")
+                        try:
+                            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+                                with pipeline.Writer(write_pdf) as writer:
+                                    for key, loaded in pipeline.prefetch(selected_keys, load_photo):
+                                        if isinstance(loaded, Exception):
+                                            raise loaded
+                                        row, img_path = loaded
+                                        pdf = CustomPDF()
+                                        pdf.add_page()
+                                        pdf.add_profile(row.to_dict(), img_path)
+                                        
+                                        pdf_bytes = pdf.output(dest='S').encode('latin-1')
+                                        safe_name = "".join(c for c in row_labels[key] if c.isalnum() or c in (' ', '-', '_')).rstrip()
+                                        writer.put(f"Profil_{safe_name}.pdf", pdf_bytes)
+                            
+                            with open(zip_path, "rb") as f:
+                                st.download_button(
+                                    label="📥 Download ZIP Batch",
+                                    data=f,
+                                    file_name=f"batch_{selected_batch}.zip",
+                                    mime="application/zip"
+                                )
+                        finally:
+                            shutil.rmtree(tmp_dir, ignore_errors=True)
+                    remember_timings(batch_timings)
             
             # Show invalid dates if any
             if 'TANGGAL_VALID' in df.columns:
@@ -491,12 +595,22 @@ def main():
         except Exception as e:
             st.error(f"Terjadi kesalahan: {str(e)}")
             st.info("Pastikan file Excel memiliki kolom yang sesuai.")
+    
+    if show_timings:
+        show_timings_panel()
+
+def clean_uploaded_data(df):
+    """Samakan nama kolom lalu proses kolom tanggal"""
+    df = df.copy()
+    df.columns = [normalize_header(col) for col in df.columns]
+    return process_date_fields(df)
 
 def process_date_fields(df):
     """Process date fields with flexible format support"""
     
     # Standard column mapping
     rename_dict = {
+        "NIPP": "NIPP",
         "NAMA": "NAMA",
         "TALENT CLASSIFICATION": "TALENT_CLASSIFICATION",
         "WORKING EXPERIENCE": "WORKING_EXPERIENCE",
@@ -513,6 +627,7 @@ def process_date_fields(df):
         "PERSONAL ATTRIBUTES (AWARD)": "PENGHARGAAN",
         "PERSONAL ATTRIBUTES (HUKUMAN DISIPLIN)": "HUKUMAN_DISIPLIN",
         "TEMPAT & TANGGAL LAHIR": "TEMPAT_TANGGAL_LAHIR",
+        "TEMPAT_TANGGAL_LAHIR": "TEMPAT_TANGGAL_LAHIR",
         "PHOTO": "FOTO"
     }
     
@@ -524,12 +639,12 @@ def process_date_fields(df):
     available_cols = [k for k in rename_dict if k in df.columns]
     df = df[available_cols].rename(columns={k: rename_dict[k] for k in available_cols})
     
-    # Process birth place and date
+    # Process birth place and date (sekali per kolom, bukan per baris)
     if "TEMPAT_TANGGAL_LAHIR" in df.columns:
-        birth_info = df["TEMPAT_TANGGAL_LAHIR"].apply(EnhancedDateParser.extract_place_and_date)
-        df["TEMPAT_LAHIR"] = birth_info.apply(lambda x: x["place"])
-        df["TANGGAL_LAHIR_FORMATTED"] = birth_info.apply(lambda x: x["formatted_date"])
-        df["TANGGAL_VALID"] = birth_info.apply(lambda x: x["date"] is not None)
+        birth_info = parse_birth_column(df["TEMPAT_TANGGAL_LAHIR"], parse_date=EnhancedDateParser.parse_date)
+        df["TEMPAT_LAHIR"] = birth_info["place"]
+        df["TANGGAL_LAHIR_FORMATTED"] = birth_info["formatted_date"]
+        df["TANGGAL_VALID"] = birth_info["date"].notna()
     
     return df
 
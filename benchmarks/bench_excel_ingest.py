@@ -0,0 +1,112 @@
+"""
+Benchmark ingest Excel: pd.read_excel vs excel_ingest (proyeksi kolom)
+
+Setiap cara dijalankan di proses baru: sekali untuk waktu, sekali lagi
+dengan tracemalloc untuk puncak memori objek Python. Dengan --scale N dibuat
+juga workbook sintetis "seluruh perusahaan": baris D6 diulang N kali plus 40
+kolom tambahan yang tidak dipakai profil.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_excel_ingest.py [file.xlsx ...] [--scale 30]
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import excel_ingest
+from talent_data import SOURCE_COLUMNS
+
+
+def read_pandas(path):
+    return pd.read_excel(path)
+
+
+def read_openpyxl(path):
+    return excel_ingest.read_excel_columns(path, SOURCE_COLUMNS, engine="openpyxl")
+
+
+def read_calamine(path):
+    return excel_ingest.read_excel_columns(path, SOURCE_COLUMNS, engine="calamine")
+
+
+METHODS = {
+    "pd.read_excel (semua kolom)": read_pandas,
+    "excel_ingest openpyxl": read_openpyxl,
+    "excel_ingest calamine": read_calamine,
+}
+
+
+def _measure(method, path, queue):
+    start = time.perf_counter()
+    df = METHODS[method](path)
+    elapsed = time.perf_counter() - start
+    shape = df.shape
+    del df
+
+    tracemalloc.start()
+    METHODS[method](path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    queue.put((elapsed, peak / 1024 / 1024, shape))
+
+
+def measure(method, path):
+    """(detik, puncak memori dalam MB, shape) di proses terpisah"""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(method, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def make_company_workbook(source, scale, path):
+    """Workbook sintetis besar dari baris source yang diulang"""
+    df = pd.read_excel(source)
+    big = pd.concat([df] * scale, ignore_index=True)
+    for i in range(40):
+        big[f"Kolom Lain {i + 1}"] = f"isi kolom lain {i + 1}"
+    big.to_excel(path, index=False, sheet_name="FORMAT")
+    return len(big)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("inputs", nargs="*", help="File .xlsx (default: semua .xlsx di folder repo)")
+    parser.add_argument("--scale", type=int, default=30,
+                        help="Pengali baris D6 untuk workbook sintetis (0 untuk tidak membuat)")
+    args = parser.parse_args()
+
+    inputs = args.inputs or sorted(glob.glob("*.xlsx"))
+    methods = [m for m in METHODS if "calamine" not in m or excel_ingest.CalamineWorkbook is not None]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.scale:
+            big_path = os.path.join(tmp, "company_wide.xlsx")
+            rows = make_company_workbook("Talent Profile D6 REVISI.xlsx", args.scale, big_path)
+            print(f"Workbook sintetis: {rows} baris x {len(pd.read_excel(big_path, nrows=0).columns)} kolom")
+            inputs.append(big_path)
+
+        for path in inputs:
+            print(f"\n{os.path.basename(path)}")
+            baseline = None
+            for method in methods:
+                elapsed, peak_mb, shape = measure(method, path)
+                baseline = baseline or elapsed
+                print(f"  {method:28s} {elapsed * 1000:8.1f} ms  {peak_mb:7.1f} MB  "
+                      f"{baseline / elapsed:5.1f}x  {shape}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark cache font CustomPDF: waktu per profil untuk batch 50 orang
+
+Sebelum: setiap CustomPDF memanggil FPDF.add_font dan makeSubset mem-parsing
+ulang tabel TTF. Sesudah: font_cache memuat metrik dan tabel sekali per proses.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_font_cache.py ["Talent Profile D6 REVISI.xlsx"] [--size 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import font_cache
+from custom_pdf import FONT_BOLD_PATH, FONT_PATH, CustomPDF
+from talent_data import clean_talent_data, get_photo_path, read_talent_file
+
+
+class UncachedPDF(CustomPDF):
+    """CustomPDF dengan pemuatan font lama (FPDF.add_font per instance)"""
+
+    def __init__(self):
+        super(CustomPDF, self).__init__()
+        self.add_font("DejaVu", "", FONT_PATH, uni=True)
+        self.add_font("DejaVu", "B", FONT_BOLD_PATH, uni=True)
+        self.set_font("DejaVu", "", 12)
+        self.use_templates = True
+        self.templates = {}
+        self.outlines = []
+        self.outline_root = None
+
+
+def render_batch(pdf_class, rows):
+    start = time.perf_counter()
+    for data in rows:
+        pdf = pdf_class()
+        pdf.add_page()
+        pdf.add_profile(data, get_photo_path(data))
+        pdf.output(dest='S')
+    return (time.perf_counter() - start) / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", nargs="?", default="Talent Profile D6 REVISI.xlsx")
+    parser.add_argument("--size", type=int, default=50, help="Jumlah profil per batch")
+    args = parser.parse_args()
+
+    df = clean_talent_data(read_talent_file(args.input))
+    rows = df[df["Nama"].notna()].head(args.size).to_dict("records")
+
+    font_cache.uninstall()
+    render_batch(UncachedPDF, rows[:1])   # pemanasan: .pkl bawaan fpdf dibuat sekali
+    before = render_batch(UncachedPDF, rows)
+
+    font_cache.install()
+    render_batch(CustomPDF, rows[:1])
+    after = render_batch(CustomPDF, rows)
+
+    print(f"Batch {len(rows)} profil dari {args.input}")
+    print(f"  tanpa cache font : {before * 1000:7.1f} ms/profil")
+    print(f"  dengan cache font: {after * 1000:7.1f} ms/profil")
+    print(f"  percepatan       : {before / after:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
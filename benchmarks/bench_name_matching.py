@@ -0,0 +1,80 @@
+"""
+Benchmark deteksi nama mirip (name_matching.find_clusters)
+
+Nama dari template CSV diulang sampai --rows baris, sebagian diberi varian
+ejaan (MOH./MUHAMMAD, Y disisipkan, inisial) supaya blok dan cluster mirip
+data asli. Dicetak juga jumlah pasangan kandidat dibanding n² / 2.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_name_matching.py [--rows 8500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+import name_matching
+from talent_data import clean_talent_data, iter_talent_csv
+
+SOURCE = "Template_Talent Profile 28 Jul - 8 Aug(FORMAT).csv"
+
+
+def variant(name, rng):
+    """Satu varian ejaan acak dari nama"""
+    tokens = name.split()
+    kind = rng.random()
+    if kind < 0.3 and tokens[0] in ("MUHAMMAD", "MOHAMAD", "MUH.", "MOH."):
+        tokens[0] = rng.choice(["MOH.", "MUH", "MOCHAMAD", "MUHAMMAD"])
+    elif kind < 0.6:
+        i = rng.randrange(len(tokens))
+        tokens[i] = tokens[i].replace("IA", "IYA").replace("OE", "U").replace("AI", "AE")
+    else:
+        tokens.insert(rng.randrange(len(tokens) + 1), rng.choice("ABRSW") + ".")
+    return " ".join(tokens)
+
+
+def synthetic_frame(rows, seed=0):
+    rng = random.Random(seed)
+    source = pd.concat(clean_talent_data(chunk) for chunk in iter_talent_csv(SOURCE, columns={"NIPP", "NAMA", "PIC"}))
+    source = source[source["Nama"].notna()]
+    names, pics = source["Nama"].tolist(), source["PIC"].tolist()
+    records = []
+    for i in range(rows):
+        j = i % len(names)
+        # Salinan pertama tetap asli, salinan berikutnya 1 dari 5 jadi varian
+        name = names[j] if i < len(names) or rng.random() > 0.2 else variant(names[j], rng)
+        records.append({"NIPP": str(100000 + i), "Nama": name, "PIC": pics[j]})
+    return pd.DataFrame(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=8500)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    unique = df["Nama"].map(name_matching.normalize_name).nunique()
+    print(f"{len(df)} baris, {unique} nama unik sesudah normalisasi")
+
+    start = time.perf_counter()
+    pairs = name_matching.candidate_pairs(set(df["Nama"].map(name_matching.normalize_name)))
+    t_pairs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = name_matching.find_clusters(df)
+    elapsed = time.perf_counter() - start
+
+    print(f"  pasangan kandidat : {len(pairs):8d} (tanpa blocking {unique * (unique - 1) // 2})")
+    print(f"  blocking saja     : {t_pairs * 1000:8.1f} ms")
+    print(f"  find_clusters     : {elapsed * 1000:8.1f} ms")
+    print(f"  cluster           : {report['cluster'].nunique():8d} ({len(report)} baris)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark template halaman CustomPDF: waktu dan ukuran per profil
+
+Sebelum: header, bingkai dan judul bagian digambar ulang dengan cell/rect
+untuk setiap profil. Sesudah: bagian tetap direkam sekali per proses
+sebagai PageTemplate dan di-embed sebagai Form XObject.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_page_template.py ["Talent Profile D6 REVISI.xlsx"] [--size 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import custom_pdf
+from talent_data import clean_talent_data, get_photo_path, read_talent_file
+
+
+class InlinePDF(custom_pdf.CustomPDF):
+    """CustomPDF yang menggambar semua bagian tetap langsung di halaman"""
+
+    def __init__(self):
+        super().__init__(use_templates=False)
+
+
+def single(pdf_class, profiles):
+    """(detik layout per profil, rata-rata byte per PDF) untuk PDF satu profil"""
+    layout = size = 0
+    for data, foto_path in profiles:
+        pdf = pdf_class()
+        start = time.perf_counter()
+        pdf.add_page()
+        pdf.add_profile(data, foto_path)
+        layout += time.perf_counter() - start
+        size += len(pdf.output(dest='S'))
+    return layout / len(profiles), size / len(profiles)
+
+
+def merged(pdf_class, profiles):
+    """Byte PDF gabungan semua profil"""
+    custom_pdf.CustomPDF, original = pdf_class, custom_pdf.CustomPDF
+    try:
+        return len(custom_pdf.render_merged(profiles))
+    finally:
+        custom_pdf.CustomPDF = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", nargs="?", default="Talent Profile D6 REVISI.xlsx")
+    parser.add_argument("--size", type=int, default=100, help="Jumlah profil")
+    args = parser.parse_args()
+
+    df = clean_talent_data(read_talent_file(args.input))
+    profiles = [(data, get_photo_path(data)) for data in df[df["Nama"].notna()].head(args.size).to_dict("records")]
+
+    single(InlinePDF, profiles[:1])
+    single(custom_pdf.CustomPDF, profiles[:1])
+    results = {}
+    for name, pdf_class in (("tanpa template", InlinePDF), ("dengan template", custom_pdf.CustomPDF)):
+        layout, size = single(pdf_class, profiles)
+        results[name] = (layout, size, merged(pdf_class, profiles))
+
+    print(f"{len(profiles)} profil dari {args.input}")
+    for name, (layout, size, merged_size) in results.items():
+        print(f"  {name:16s}: header+add_profile {layout * 1000:6.2f} ms/profil, "
+              f"PDF satu profil {size / 1024:6.1f} KB, PDF gabungan {merged_size / 1024:8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark batch ZIP berurutan vs pipeline baca -> render -> tulis
+
+Folder foto di jaringan disimulasikan dengan jeda --latency ms setiap kali
+file foto asli di-stat atau dibaca (photo_cache.cache_path dan
+make_thumbnail). Thumbnail dibuat di folder sementara supaya setiap mode
+mulai dingin. Isi PDF di kedua ZIP dicek sama.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_pipeline.py ["Talent Profile D6 REVISI.xlsx"] [--size 50] [--latency 20]
+"""
+
+import argparse
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.mkdtemp(prefix="talent-pipeline-")
+os.environ["TALENT_PHOTO_CACHE"] = os.path.join(TMP_DIR, "thumbnails")
+
+import photo_cache
+import pipeline
+from talent_data import clean_talent_data, get_photo_path, read_talent_file
+
+
+def with_latency(func, seconds):
+    def wrapper(*args, **kwargs):
+        time.sleep(seconds)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def sequential(fileobj, items):
+    """Loop lama: thumbnail, render dan tulis ZIP berurutan di satu thread"""
+    pipeline.write_zip(fileobj, items, depth=0)
+
+
+def pipelined(fileobj, items):
+    pipeline.write_zip(fileobj, items)
+
+
+def run(mode, items):
+    # Setiap mode mulai tanpa thumbnail
+    shutil.rmtree(photo_cache.PHOTO_CACHE_DIR, ignore_errors=True)
+    buffer = io.BytesIO()
+    start = time.perf_counter()
+    mode(buffer, items)
+    return time.perf_counter() - start, buffer
+
+
+def pdfs(buffer):
+    with zipfile.ZipFile(buffer) as zipf:
+        return {name: re.sub(rb"/CreationDate \(D:\d+\)", b"", zipf.read(name)) for name in zipf.namelist()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", nargs="?", default="Talent Profile D6 REVISI.xlsx")
+    parser.add_argument("--size", type=int, default=50, help="Jumlah profil")
+    parser.add_argument("--latency", type=float, default=20, help="Jeda per akses foto asli (ms)")
+    args = parser.parse_args()
+
+    df = clean_talent_data(read_talent_file(args.input))
+    rows = df[df["Nama"].notna()].head(args.size).to_dict("records")
+    items = [(f"Profil_{i}.pdf", row, get_photo_path(row, thumbnail=False)) for i, row in enumerate(rows)]
+
+    latency = args.latency / 1000
+    photo_cache.cache_path = with_latency(photo_cache.cache_path, latency)
+    photo_cache.make_thumbnail = with_latency(photo_cache.make_thumbnail, latency)
+
+    try:
+        results = {name: run(mode, items) for name, mode in (("berurutan", sequential), ("pipeline", pipelined))}
+    finally:
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+    photos = sum(1 for *_, foto_path in items if foto_path)
+    print(f"{len(items)} profil ({photos} dengan foto) dari {args.input}, jeda {args.latency:g} ms per akses foto")
+    for name, (seconds, _) in results.items():
+        print(f"  {name:10s}: {seconds:6.2f} s ({seconds / len(items) * 1000:6.1f} ms/profil)")
+    print(f"  percepatan: {results['berurutan'][0] / results['pipeline'][0]:5.2f}x")
+    print(f"  PDF identik: {'ya' if pdfs(results['berurutan'][1]) == pdfs(results['pipeline'][1]) else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark profile_service: render ulang vs cache vs GET bersyarat (304)
+
+Store dan folder foto diisi data sintetis (--rows baris), lalu server
+dijalankan di thread pada port bebas. Diukur lewat koneksi HTTP keep-alive:
+
+- cold     : GET /profile/<NIPP>.pdf pertama kali (render di pool)
+- cached   : GET profil yang sama lagi (dari cache LRU)
+- 304      : GET dengan If-None-Match (tanpa body)
+- parallel : --clients klien bersamaan, profil dari cache
+- batch    : POST /batch --batch NIPP, dingin lalu dari cache
+
+Isi PDF dari cache dicek sama dengan hasil render pertama.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_profile_service.py [--rows 500] [--profiles 30] [--clients 8] [--batch 50]
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == "__main__":
+    # Hanya di proses utama; worker pool (spawn) mewarisi environment ini
+    TMP_DIR = tempfile.mkdtemp(prefix="talent-service-")
+    os.environ["TALENT_STORE"] = os.path.join(TMP_DIR, "talent.sqlite3")
+    os.environ["TALENT_PHOTO_CACHE"] = os.path.join(TMP_DIR, "thumbnails")
+    os.environ["TALENT_PHOTO_DIRS"] = os.path.join(TMP_DIR, "data", "foto")
+
+import profile_service
+import talent_store
+from synthetic import make_dataset
+from talent_data import clean_talent_data, read_talent_file
+
+
+def get(conn, nipp, headers=None):
+    conn.request("GET", f"/profile/{nipp}.pdf", headers=headers or {})
+    response = conn.getresponse()
+    return response.status, response.getheader("ETag"), response.read()
+
+
+def timed(func, items):
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    return (time.perf_counter() - start) / len(items) * 1000, results
+
+
+def post_batch(port, nipps):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    start = time.perf_counter()
+    conn.request("POST", "/batch", json.dumps(nipps), {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    body = response.read()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    assert response.status == 200, body[:200]
+    return elapsed, len(zipfile.ZipFile(io.BytesIO(body)).namelist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--profiles", type=int, default=30, help="Profil untuk GET cold/cached/304")
+    parser.add_argument("--clients", type=int, default=8, help="Klien bersamaan untuk parallel")
+    parser.add_argument("--batch", type=int, default=50, help="Jumlah NIPP untuk POST /batch")
+    args = parser.parse_args()
+
+    try:
+        dataset = make_dataset(args.rows, os.path.join(TMP_DIR, "data"), xlsx=False)
+        df = clean_talent_data(read_talent_file(dataset.csv_path))
+        talent_store.replace_all(df, "bench")
+        nipps = [nipp for nipp, _ in talent_store.people()]
+
+        server = profile_service.make_server(port=0, quiet=True)
+        port = server.server_port
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        # Worker pool dinyalakan dulu supaya waktu spawn tidak ikut terukur
+        get(conn, nipps[-1])
+
+        sample = nipps[:args.profiles]
+        cold_ms, cold = timed(lambda nipp: get(conn, nipp), sample)
+        cached_ms, cached = timed(lambda nipp: get(conn, nipp), sample)
+        assert all(a[0] == 200 and a[2] == b[2] for a, b in zip(cold, cached))
+        etags = dict(zip(sample, (tag for _, tag, _ in cold)))
+        not_modified_ms, not_modified = timed(lambda nipp: get(conn, nipp, {"If-None-Match": etags[nipp]}), sample)
+        assert all(status == 304 and not body for status, _, body in not_modified)
+        conn.close()
+
+        counts = []
+
+        def client(seconds=2.0):
+            client_conn = http.client.HTTPConnection("127.0.0.1", port)
+            deadline, n = time.perf_counter() + seconds, 0
+            while time.perf_counter() < deadline:
+                assert get(client_conn, sample[n % len(sample)])[0] == 200
+                n += 1
+            client_conn.close()
+            counts.append(n)
+
+        clients = [threading.Thread(target=client) for _ in range(args.clients)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+
+        batch = nipps[args.profiles:args.profiles + args.batch]
+        batch_cold, files = post_batch(port, batch)
+        batch_cached, _ = post_batch(port, batch)
+        server.shutdown()
+
+        size = sum(len(body) for _, _, body in cold) / len(cold) / 1024
+        print(f"{args.rows} baris, {dataset.photos} foto, {profile_service.SERVICE_WORKERS} worker, "
+              f"PDF rata-rata {size:.0f} KB")
+        print(f"  cold     : {cold_ms:7.2f} ms per profil")
+        print(f"  cached   : {cached_ms:7.2f} ms per profil ({cold_ms / cached_ms:.0f}x)")
+        print(f"  304      : {not_modified_ms:7.2f} ms per profil")
+        print(f"  parallel : {sum(counts) / 2.0:7.0f} request/detik dengan {args.clients} klien")
+        print(f"  batch {len(batch)} : {batch_cold * 1000:7.0f} ms dingin, {batch_cached * 1000:.0f} ms dari cache "
+              f"({files} file di ZIP)")
+        print(f"  cache    : {profile_service._cache.stats()}")
+    finally:
+        if profile_service._pool is not None:
+            profile_service._pool.shutdown()
+        shutil.rmtree(TMP_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
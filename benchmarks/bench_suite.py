@@ -0,0 +1,198 @@
+"""
+Benchmark suite end-to-end dengan data sintetis (benchmarks/synthetic.py)
+
+Untuk setiap ukuran (default 100, 1k dan 10k baris) diukur:
+
+- ingest_csv / ingest_xlsx : read_talent_file + clean_talent_data
+- ingest_parquet           : load_cleaned dari cache Parquet (setelah restart)
+- date_parsing             : parse_birth_column untuk kolom tempat & tanggal lahir
+- individual_download      : satu profil dengan thumbnail baru (target TODO.md: < 2 detik)
+- batch_zip_50             : 50 profil ke ZIP lewat pipeline.write_zip
+- add_profile              : CustomPDF.add_profile + output per profil (thumbnail sudah ada)
+- full_sheet               : generate_profiles untuk seluruh sheet
+
+Hasil ditulis sebagai JSON (default .cache/bench/suite-<waktu>.json) dan bisa
+dibandingkan dengan run sebelumnya lewat --compare.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_suite.py [--sizes 100,1000,10000] [-j 4] [--compare lama.json]
+"""
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+TMP_DIR = tempfile.mkdtemp(prefix="talent-bench-")
+atexit.register(shutil.rmtree, TMP_DIR, ignore_errors=True)
+# Thumbnail dibuat di folder sementara supaya setiap run mulai dingin
+os.environ["TALENT_PHOTO_CACHE"] = os.path.join(TMP_DIR, "thumbnails")
+
+import fpdf
+import pandas as pd
+
+import excel_ingest
+import generate_profiles
+import ingest_cache
+import pipeline
+from custom_pdf import render_profile
+from enhanced_date_parser import parse_birth_column
+from synthetic import make_dataset
+from talent_data import clean_talent_data, get_photo_path, read_talent_file
+
+ADD_PROFILE_SAMPLE = 100
+BATCH_SIZE = 50
+INDIVIDUAL_TARGET_SECONDS = 2.0
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def result(rows, stage, seconds, count, **extra):
+    return {"rows": rows, "stage": stage, "seconds": round(seconds, 4),
+            "per_item_ms": round(seconds / count * 1000, 3) if count else None, "items": count, **extra}
+
+
+def bench_size(rows, workers, with_xlsx):
+    tmp = os.path.join(TMP_DIR, str(rows))
+    setup, dataset = timed(make_dataset, rows, tmp, xlsx=with_xlsx)
+    print(f"\n{rows} baris ({dataset.photos} foto, data dibuat dalam {setup:.1f} detik)")
+    results = []
+
+    def add(entry):
+        results.append(entry)
+        per_item = f"{entry['per_item_ms']:9.2f} ms/item" if entry["per_item_ms"] is not None else ""
+        print(f"  {entry['stage']:20s} {entry['seconds']:9.3f} s {per_item}")
+
+    seconds, df = timed(lambda: clean_talent_data(read_talent_file(dataset.csv_path)))
+    add(result(rows, "ingest_csv", seconds, rows))
+    if dataset.xlsx_path:
+        seconds, _ = timed(lambda: clean_talent_data(read_talent_file(dataset.xlsx_path)))
+        add(result(rows, "ingest_xlsx", seconds, rows))
+
+    with open(dataset.csv_path, "rb") as f:
+        data = f.read()
+    cache_dir = os.path.join(tmp, "ingest")
+    ingest_cache.load_cleaned(data, "talent.csv", cache_dir=cache_dir)
+    ingest_cache.clear_memory()
+    seconds, _ = timed(ingest_cache.load_cleaned, data, "talent.csv", cache_dir=cache_dir)
+    add(result(rows, "ingest_parquet", seconds, rows))
+
+    raw = pd.read_csv(dataset.csv_path, dtype=str)
+    combined = raw["Personal Attributes (Birthplace)"] + ", " + raw["Personal Attributes (Date of Birth)"]
+    seconds, _ = timed(parse_birth_column, combined)
+    add(result(rows, "date_parsing", seconds, rows))
+
+    records = df.to_dict("records")
+    photo_dir = dataset.photo_dir
+
+    def individual(row):
+        return render_profile(row, get_photo_path(row, photo_dir))
+
+    # Baris pertama yang punya foto, supaya thumbnail ikut terukur
+    first = next((row for row in records if get_photo_path(row, photo_dir, thumbnail=False)), records[0])
+    seconds, _ = timed(individual, first)
+    add(result(rows, "individual_download", seconds, 1, target_seconds=INDIVIDUAL_TARGET_SECONDS,
+               within_target=seconds < INDIVIDUAL_TARGET_SECONDS))
+
+    batch = records[:BATCH_SIZE]
+    zip_buffer = io.BytesIO()
+    seconds, errors = timed(pipeline.write_zip, zip_buffer, [
+        (f"Profil_{row['Nama']}_{row['NIPP']}.pdf", row, get_photo_path(row, photo_dir, thumbnail=False)) for row in batch
+    ])
+    count = len(batch) - len(errors)
+    add(result(rows, f"batch_zip_{BATCH_SIZE}", seconds, count, zip_bytes=zip_buffer.tell()))
+
+    sample = records[:ADD_PROFILE_SAMPLE]
+    thumbnails = [get_photo_path(row, photo_dir) for row in sample]
+    durations = []
+    for row, thumbnail in zip(sample, thumbnails):
+        seconds, _ = timed(render_profile, row, thumbnail)
+        durations.append(seconds)
+    p95 = sorted(durations)[int(len(durations) * 0.95) - 1] if len(durations) >= 20 else max(durations)
+    add(result(rows, "add_profile", sum(durations), len(durations),
+               median_ms=round(statistics.median(durations) * 1000, 3), p95_ms=round(p95 * 1000, 3)))
+
+    output_dir = os.path.join(tmp, "output")
+    argv = [dataset.csv_path, "-o", output_dir, "-j", str(workers), "--photo-dir", photo_dir]
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, _ = timed(generate_profiles.main, argv)
+    add(result(rows, "full_sheet", seconds, rows, workers=workers))
+    return results
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workers": args.workers,
+        "pandas": pd.__version__,
+        "fpdf": fpdf.FPDF_VERSION,
+        "calamine": excel_ingest.CalamineWorkbook is not None,
+    }
+
+
+def compare(previous_path, results):
+    """Cetak rasio waktu terhadap file hasil sebelumnya"""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    old = {(r["rows"], r["stage"]): r["seconds"] for r in previous["results"]}
+    print(f"\nDibanding {previous_path} (commit {previous['meta'].get('commit')}):")
+    for entry in results:
+        before = old.get((entry["rows"], entry["stage"]))
+        if before:
+            ratio = entry["seconds"] / before
+            print(f"  {entry['rows']:>6} {entry['stage']:20s} {before:9.3f} s -> {entry['seconds']:9.3f} s  ({ratio:5.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100,1000,10000", help="Jumlah baris, dipisah koma")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Jumlah worker untuk full_sheet")
+    parser.add_argument("--xlsx-max-rows", type=int, default=10000,
+                        help="Lewati ingest_xlsx untuk ukuran lebih besar dari ini (menulis xlsx lambat)")
+    parser.add_argument("-o", "--output", help="File JSON hasil (default .cache/bench/suite-<waktu>.json)")
+    parser.add_argument("--compare", help="File JSON hasil run sebelumnya")
+    args = parser.parse_args()
+
+    results = []
+    for rows in (int(size) for size in args.sizes.split(",")):
+        results.extend(bench_size(rows, args.workers, rows <= args.xlsx_max_rows))
+
+    output = args.output or os.path.join(REPO_DIR, ".cache", "bench", time.strftime("suite-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": metadata(args), "results": results}, f, indent=1)
+    print(f"\nHasil disimpan ke {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
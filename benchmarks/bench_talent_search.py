@@ -0,0 +1,70 @@
+"""
+Benchmark pemilih staff: semua nama di selectbox vs pencarian talent_search
+
+Dengan data sintetis --rows baris diukur ukuran opsi yang dikirim ke
+browser (jumlah label dan byte) dan waktu per query saat mengetik nama
+huruf demi huruf, plus waktu membangun index sekali per upload.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_talent_search.py [--rows 8500]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import talent_search
+import talent_store
+from synthetic import make_frame
+from talent_data import clean_talent_data
+
+QUERIES = ["agus santoso", "moh wibowo", "4012", "sri lestari"]
+
+
+def payload(people):
+    labels = [f"{nama} ({nipp})" for nipp, nama in people]
+    return len(labels), sum(len(label.encode("utf-8")) for label in labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=8500)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="talent-search-")
+    try:
+        path = os.path.join(tmp_dir, "talent.sqlite3")
+        talent_store.replace_all(clean_talent_data(make_frame(args.rows)), "bench", path=path)
+
+        start = time.perf_counter()
+        talent_search.get_index(path)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # Setiap huruf yang diketik menjadi satu query
+        times, sizes = [], []
+        for query in QUERIES:
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                matches = talent_search.search(query[:end], path=path)
+                times.append(time.perf_counter() - start)
+                sizes.append(payload(matches))
+
+        labels, size = payload(talent_store.people(path=path))
+        print(f"{args.rows} baris, index dibangun {build_ms:.0f} ms")
+        print(f"  selectbox semua nama : {labels} opsi, {size / 1024:.0f} KB per rerun")
+        print(f"  talent_search        : <= {max(n for n, _ in sizes)} opsi, "
+              f"<= {max(b for _, b in sizes) / 1024:.1f} KB per rerun")
+        print(f"  per query ({len(times)} ketikan): rata-rata {sum(times) / len(times) * 1000:.2f} ms, "
+              f"terlama {max(times) * 1000:.2f} ms")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
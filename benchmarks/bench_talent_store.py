@@ -0,0 +1,128 @@
+"""
+Benchmark membuka app: DataFrame dari cache Parquet vs talent_store (SQLite)
+
+Dengan data sintetis --rows baris (default 8500, template seluruh
+perusahaan) diukur waktu yang dibutuhkan halaman app.py sebelum pengguna
+bisa memilih orang:
+
+- parquet : load_cleaned dari file Parquet (proses baru) + build_nipp_index
+            + label per NIPP, seperti sebelum ada store
+- store   : info + preview halaman pertama (50 baris) + people + distinct PIC/LEVEL
+- record  : satu profil lewat index NIPP, dan 50 profil untuk batch
+
+Lalu --readers proses membaca store bersamaan selagi satu proses menulis
+ulang seluruh isinya, untuk memastikan mode WAL tidak saling mengunci.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_talent_store.py [--rows 8500] [--readers 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import ingest_cache
+import talent_store
+from synthetic import make_frame
+from talent_data import build_nipp_index
+
+REPEAT = 20
+
+
+def best_ms(func, repeat=REPEAT):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, statistics.median(times) * 1000
+
+
+def open_parquet(data, cache_dir):
+    ingest_cache.clear_memory()
+    df = ingest_cache.load_cleaned(data, "talent.csv", cache_dir=cache_dir)
+    index = build_nipp_index(df)
+    return {nipp: f"{df.at[idx, 'Nama']} ({nipp})" for nipp, idx in index.items()}
+
+
+def open_store(path):
+    talent_store.info(path)
+    talent_store.page(0, 50, path=path)
+    people = talent_store.people(path=path)
+    talent_store.distinct("PIC", path)
+    talent_store.distinct("LEVEL", path)
+    return {nipp: f"{nama} ({nipp})" for nipp, nama in people}
+
+
+def read_loop(path, seconds, counts):
+    """Proses pembaca: buka store berulang-ulang selama seconds detik"""
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        assert open_store(path)
+        n += 1
+    counts.put(n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=8500)
+    parser.add_argument("--readers", type=int, default=4, help="Proses pembaca bersamaan")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="talent-store-")
+    try:
+        csv_path = os.path.join(tmp_dir, "talent.csv")
+        make_frame(args.rows).to_csv(csv_path, index=False)
+        with open(csv_path, "rb") as f:
+            data = f.read()
+        cache_dir = os.path.join(tmp_dir, "ingest")
+        path = os.path.join(tmp_dir, "talent.sqlite3")
+
+        df = ingest_cache.load_cleaned(data, "talent.csv", cache_dir=cache_dir)
+        start = time.perf_counter()
+        talent_store.replace_all(df, "bench", {"talent.csv": len(df)}, path)
+        write_ms = (time.perf_counter() - start) * 1000
+
+        assert open_parquet(data, cache_dir) == open_store(path)
+        nipps = [nipp for nipp, _ in talent_store.people(path=path)]
+        results = {
+            "parquet": best_ms(lambda: open_parquet(data, cache_dir)),
+            "store": best_ms(lambda: open_store(path)),
+            "record": best_ms(lambda: talent_store.get_record(nipps[len(nipps) // 2], path)),
+            "record x50": best_ms(lambda: talent_store.get_records(nipps[-50:], path)),
+        }
+
+        print(f"{args.rows} baris, tulis ke store {write_ms:.0f} ms "
+              f"({os.path.getsize(path) / 1e6:.1f} MB)")
+        for name, (best, median) in results.items():
+            print(f"  {name:11s}: {best:7.2f} ms (median {median:7.2f} ms)")
+
+        ctx = multiprocessing.get_context("spawn")
+        counts = ctx.Queue()
+        readers = [ctx.Process(target=read_loop, args=(path, 3.0, counts)) for _ in range(args.readers)]
+        for reader in readers:
+            reader.start()
+        writes = 0
+        deadline = time.perf_counter() + 3.0
+        while time.perf_counter() < deadline:
+            talent_store.replace_all(df, f"bench-{writes}", {"talent.csv": len(df)}, path)
+            writes += 1
+        for reader in readers:
+            reader.join()
+        reads = sum(counts.get() for _ in readers)
+        print(f"  {args.readers} pembaca + 1 penulis, 3 detik: {reads} kali buka, {writes} kali tulis ulang")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark layout teks CustomPDF: waktu add_profile per profil
+
+Sebelum: FPDF.multi_cell dan get_string_width mengukur teks huruf per huruf
+setiap kali. Sesudah: text_layout memakai tabel lebar per font dan cache
+pemotongan baris. Isi PDF dicek sama persis.
+
+Jalankan dari folder repo:
+    python benchmarks/bench_text_layout.py ["Talent Profile D6 REVISI.xlsx"] [--size 200]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fpdf import FPDF
+
+from custom_pdf import CustomPDF
+from talent_data import clean_talent_data, read_talent_file
+
+
+class UncachedPDF(CustomPDF):
+    """CustomPDF dengan multi_cell dan get_string_width bawaan FPDF"""
+
+    get_string_width = FPDF.get_string_width
+    multi_cell = FPDF.multi_cell
+
+
+def layout_batch(pdf_class, rows):
+    """Rata-rata detik add_profile per profil (tanpa foto dan output)"""
+    elapsed = 0.0
+    for data in rows:
+        pdf = pdf_class()
+        pdf.add_page()
+        start = time.perf_counter()
+        pdf.add_profile(data, None)
+        elapsed += time.perf_counter() - start
+    return elapsed / len(rows)
+
+
+def same_output(rows):
+    for data in rows:
+        outputs = []
+        for pdf_class in (UncachedPDF, CustomPDF):
+            pdf = pdf_class()
+            pdf.add_page()
+            pdf.add_profile(data, None)
+            outputs.append(re.sub(r"/CreationDate \(D:\d+\)", "", pdf.output(dest='S')))
+        if outputs[0] != outputs[1]:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", nargs="?", default="Talent Profile D6 REVISI.xlsx")
+    parser.add_argument("--size", type=int, default=200, help="Jumlah profil")
+    args = parser.parse_args()
+
+    df = clean_talent_data(read_talent_file(args.input))
+    rows = df[df["Nama"].notna()].head(args.size).to_dict("records")
+
+    layout_batch(UncachedPDF, rows[:1])
+    before = layout_batch(UncachedPDF, rows)
+    layout_batch(CustomPDF, rows[:1])
+    after = layout_batch(CustomPDF, rows)
+
+    print(f"{len(rows)} profil dari {args.input}")
+    print(f"  multi_cell FPDF    : {before * 1000:7.2f} ms/profil")
+    print(f"  text_layout (cache): {after * 1000:7.2f} ms/profil")
+    print(f"  percepatan         : {before / after:7.2f}x")
+    print(f"  PDF identik        : {'ya' if same_output(rows) else 'TIDAK'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Cek regresi manifest: NIPP yang muncul dua kali di satu input
+
+Dua baris dengan NIPP sama (nama berbeda) dibuat dari template CSV lalu
+generate_profiles dijalankan dua kali. Run kedua harus melewati semua
+profil, kedua PDF harus tetap ada, dan manifest punya satu entri per baris.
+Sebelumnya kedua baris berbagi satu entri sehingga selalu dirender ulang.
+
+Jalankan dari folder repo:
+    python benchmarks/check_manifest.py
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_profiles
+from manifest import Manifest
+from talent_data import read_talent_file
+
+TEMPLATE = "Template_Talent Profile 28 Jul - 8 Aug(FORMAT).csv"
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="talent-manifest-")
+    try:
+        df = read_talent_file(TEMPLATE).head(3).copy()
+        nipp_col = next(col for col in df.columns if str(col).strip().upper() == "NIPP")
+        df.loc[df.index[1], nipp_col] = df.loc[df.index[0], nipp_col]
+        input_path = os.path.join(tmp_dir, "duplikat.csv")
+        df.to_csv(input_path, index=False)
+        output_dir = os.path.join(tmp_dir, "output")
+
+        argv = [input_path, "-o", output_dir, "-j", "1"]
+        assert generate_profiles.main(argv) == 0
+        first = Manifest(output_dir)
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            assert generate_profiles.main(argv) == 0
+        second = Manifest(output_dir)
+        assert "3 profil tidak berubah dilewati, 0 PDF lama dihapus" in log.getvalue(), log.getvalue()
+
+        pdfs = sorted(name for name in os.listdir(output_dir) if name.endswith(".pdf"))
+        assert len(first.entries) == 3, first.entries
+        assert second.entries == first.entries, "entri manifest berubah di run kedua"
+        assert len(pdfs) == 3, pdfs
+        for entry in second.entries.values():
+            assert os.path.exists(os.path.join(output_dir, entry["output"])), entry
+        print(f"OK: {len(pdfs)} PDF, {len(second.entries)} entri manifest untuk 1 NIPP duplikat")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
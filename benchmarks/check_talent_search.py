@@ -0,0 +1,58 @@
+"""
+Cek regresi talent_search: nama yang sedang diketik huruf demi huruf
+
+Store dibangun dari template CSV. Query "m", "mo" dan "moc" harus
+menemukan baris "MOCH ..." (awalan yang belum lengkap tidak boleh
+dinormalisasi menjadi "MUHAMMAD"), "abd" harus menemukan "ABDUL ...",
+dan kata yang sudah lengkap ("moch ") tetap mencakup semua varian
+MUHAMMAD.
+
+Jalankan dari folder repo:
+    python benchmarks/check_talent_search.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import talent_search
+import talent_store
+from talent_data import clean_talent_data, read_talent_file
+
+TEMPLATE = "Template_Talent Profile 28 Jul - 8 Aug(FORMAT).csv"
+
+
+def names(query, path, limit):
+    return [nama for _, nama in talent_search.search(query, limit=limit, path=path)]
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="talent-search-")
+    try:
+        path = os.path.join(tmp_dir, "talent.sqlite3")
+        talent_store.replace_all(clean_talent_data(read_talent_file(TEMPLATE)), "check", path=path)
+        everyone = [nama for _, nama in talent_store.people(path=path)]
+        moch = {nama for nama in everyone if nama.upper().split()[0] == "MOCH"}
+        assert moch, "template tidak berisi nama MOCH"
+
+        for query in ["m", "mo", "moc"]:
+            found = names(query, path, len(everyone))
+            assert moch <= set(found), (query, moch - set(found))
+        # "m" juga mencakup nama M lain, bukan hanya varian MUHAMMAD
+        assert any(nama.upper().startswith("MAR") for nama in names("m", path, len(everyone)))
+        assert moch <= set(names("moc", path, talent_search.SEARCH_LIMIT))
+        assert any(nama.upper().startswith("ABDUL") for nama in names("abd", path, len(everyone)))
+
+        # Kata lengkap tetap diseragamkan: "moch " juga menemukan MUHAMMAD, MOHAMAD, ...
+        complete = set(names("moch ", path, len(everyone)))
+        assert moch <= complete and any(nama.upper().startswith("MUHAMMAD") for nama in complete), complete
+        print(f"OK: {len(moch)} nama MOCH ditemukan dengan m/mo/moc, {len(complete)} varian MUHAMMAD dengan 'moch '")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
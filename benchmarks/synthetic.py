@@ -0,0 +1,179 @@
+"""
+Generator data talent sintetis dengan seed, untuk benchmark
+
+Baris mengikuti header template CSV ("Template_Talent Profile ... (FORMAT).csv")
+dengan Working Experience dan Knowledge panjang bertingkat, tanggal lahir
+dalam beberapa format, dan foto contoh. Foto dibuat sekali (beberapa ukuran
+kamera) lalu di-hardlink per NIPP supaya 10k foto tidak memakan 10k x 100 KB.
+
+Dipakai dari benchmark lain:
+    from synthetic import make_dataset
+    dataset = make_dataset(1000, tmp_dir)
+"""
+
+import os
+import random
+import shutil
+
+import pandas as pd
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:  # Tanpa Pillow semua baris tanpa foto
+    Image = None
+
+HEADERS = [
+    "No", "PIC", "STATUS", "NIPP", "LEVEL", "Nama", "Talent Classification", "Working Experience",
+    "Nilai Kinerja (2022)", "Nilai Kinerja (2023)", "Nilai Kinerja (2024)",
+    "Behaviour Competencies ( Assessment)", "Behaviour Competencies (Multirater)", "Knowledge",
+    "Personal Attributes (Birthplace)", "Personal Attributes (Date of Birth)", "Personal Attributes (Age)",
+    "Personal Attributes (Education)", "Personal Attributes (Grade)", "Personal Attributes (Award)", "Photo",
+]
+
+FIRST_NAMES = ["AGUS", "BUDI", "DWI", "EKO", "FAJAR", "HENDRA", "IWAN", "JOKO", "MUHAMMAD", "NUR", "RINA",
+               "SITI", "SRI", "TRI", "WAHYU", "YUDI", "ANDI", "DEWI", "RAHMAT", "SUPRIYADI", "MOH.", "ZAENAL"]
+LAST_NAMES = ["SANTOSO", "PRASETYO", "WIBOWO", "HIDAYAT", "SETIAWAN", "KURNIAWAN", "SAPUTRA", "NUGROHO",
+              "LESTARI", "RAMADHAN", "SUHERMAN", "ABIDIN", "SUTRISNO", "WIDODO", "HERMAWAN", "PURNOMO"]
+PICS = ["ODIE", "FANI", "SENA", "JESS", "HIDAYAH", "ADIS", "THINA"]
+LEVELS = ["BoD-1", "BoD-2", "BOD-2", "BoD-3", "BOD-3"]
+CLASSES = ["HIPO 1", "HIPO 2", "PROMOTABLE 1", "PROMOTABLE 2", "PROMOTABLE 3", "SOLID CONTRIBUTOR"]
+POSITIONS = ["Manager", "Senior Manager", "Vice President", "Executive Vice President", "Deputy", "Kepala",
+             "Asisten Manager", "Staf Ahli Utama", "Direktur"]
+UNITS = ["Pengadaan Barang & Jasa DIVRE II Sumatera Barat", "Keuangan Daop 1 Jakarta", "Sarana Perkeretaapian",
+         "Finance Consolidation", "Teknologi Informasi", "Operasi & Pemasaran Daop 8 Surabaya",
+         "Human Capital Management", "Prasarana Jalan Rel dan Jembatan", "Corporate Strategy"]
+TRAININGS = ["Executive Leadership Development Program", "CFO School", "Strategic Discussion Forum & Critical "
+             "Business Insight", "Growth Through Merger, Acquisition & Strategic Aliance", "Update PSAK Deals Cycle",
+             "Sertifikasi Manajemen Risiko Tingkat 2", "Diklat Pimpinan Tingkat II", "Project Management "
+             "Professional (PMP)", "Workshop Good Corporate Governance", "Pelatihan Keselamatan Perkeretaapian"]
+PLACES = ["Jakarta", "Bandung", "Surabaya", "Yogyakarta", "Medan", "Palembang", "Semarang", "Madiun", "Padang"]
+MONTHS = ["Januari", "Februari", "Maret", "April", "Mei", "Juni",
+          "Juli", "Agustus", "September", "Oktober", "November", "Desember"]
+EDUCATION = ["S1-Akuntansi, UI (2007)", "S2-Manajemen, UGM (2012)", "D3-Teknik Mesin, ITS (1998)",
+             "S1-Teknik Sipil, ITB (2003)", "S2-Magister Transportasi, ITB (2015)"]
+
+# Ukuran foto contoh, mengikuti variasi di "Foto Talent Profile"
+PHOTO_SIZES = [(1200, 1600), (561, 800), (800, 931), (1176, 1764), (923, 1231), (683, 1024), (1378, 1967)]
+PHOTO_RATIO = 0.8
+
+
+def _date(rng):
+    day, month, year = rng.randint(1, 28), rng.randint(1, 12), rng.randint(1965, 2000)
+    kind = rng.random()
+    if kind < 0.6:
+        return f"{day} {MONTHS[month - 1]} {year}"
+    if kind < 0.85:
+        return f"{day:02d}/{month:02d}/{year}"
+    if kind < 0.95:
+        return f"{year}-{month:02d}-{day:02d} 00:00:00"
+    return "-"
+
+
+def _numbered(items):
+    return "\n".join(f"{i}. {item}" for i, item in enumerate(items, start=1))
+
+
+def make_row(i, rng):
+    nipp = str(40000 + i * 7 + rng.randint(0, 6))
+    years = sorted(rng.sample(range(1995, 2025), rng.randint(3, 12)), reverse=True)
+    experience = [
+        f"{rng.choice(POSITIONS)} {rng.choice(UNITS)} ({rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{year}"
+        f" - {'Sekarang' if j == 0 else f'{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{years[j - 1]}'})"
+        for j, year in enumerate(years)
+    ]
+    knowledge = rng.sample(TRAININGS, rng.randint(3, len(TRAININGS)))
+    return {
+        "No": i + 1,
+        "PIC": rng.choice(PICS),
+        "STATUS": rng.choice(["", "foto belum", "lengkap"]),
+        "NIPP": nipp,
+        "LEVEL": rng.choice(LEVELS),
+        "Nama": " ".join([rng.choice(FIRST_NAMES)] + rng.sample(LAST_NAMES, rng.randint(1, 2))),
+        "Talent Classification": rng.choice(CLASSES),
+        "Working Experience": _numbered(experience),
+        "Nilai Kinerja (2022)": round(rng.uniform(90, 110), 2),
+        "Nilai Kinerja (2023)": round(rng.uniform(90, 110), 2),
+        "Nilai Kinerja (2024)": round(rng.uniform(90, 110), 2),
+        "Behaviour Competencies ( Assessment)": rng.choice(["", "-", round(rng.uniform(50, 90), 2)]),
+        "Behaviour Competencies (Multirater)": rng.choice(["-", round(rng.uniform(3, 5), 2)]),
+        "Knowledge": _numbered(knowledge),
+        "Personal Attributes (Birthplace)": rng.choice(PLACES),
+        "Personal Attributes (Date of Birth)": _date(rng),
+        "Personal Attributes (Age)": f"{rng.randint(25, 58)} TAHUN",
+        "Personal Attributes (Education)": rng.choice(EDUCATION),
+        "Personal Attributes (Grade)": str(rng.randint(12, 20)),
+        "Personal Attributes (Award)": rng.choice(["-", "Satyalancana Karya Satya 10 Tahun", "Pegawai Teladan 2019"]),
+        "Photo": f"{nipp}.jpg",
+    }
+
+
+def make_frame(rows, seed=0):
+    """DataFrame mentah dengan header template CSV"""
+    rng = random.Random(seed)
+    return pd.DataFrame([make_row(i, rng) for i in range(rows)], columns=HEADERS)
+
+
+def make_sample_photos(photo_dir, seed=0):
+    """Satu foto contoh per ukuran di PHOTO_SIZES, kembalikan list path"""
+    if Image is None:
+        return []
+    rng = random.Random(seed)
+    sample_dir = os.path.join(photo_dir, "_contoh")
+    os.makedirs(sample_dir, exist_ok=True)
+    paths = []
+    for width, height in PHOTO_SIZES:
+        img = Image.new("RGB", (width, height), (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(200):
+            x, y = rng.randrange(width), rng.randrange(height)
+            color = (rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+            draw.ellipse([x, y, x + rng.randint(10, width // 3), y + rng.randint(10, height // 3)], fill=color)
+        path = os.path.join(sample_dir, f"{width}x{height}.jpg")
+        img.save(path, "JPEG", quality=90)
+        paths.append(path)
+    return paths
+
+
+def link_photos(df, photo_dir, samples, seed=0):
+    """Foto <NIPP>.jpg untuk PHOTO_RATIO baris, hardlink ke salah satu foto contoh"""
+    rng = random.Random(seed)
+    count = 0
+    for nipp in df["NIPP"]:
+        if not samples or rng.random() > PHOTO_RATIO:
+            continue
+        target = os.path.join(photo_dir, f"{nipp}.jpg")
+        if os.path.exists(target):
+            continue
+        source = rng.choice(samples)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+        count += 1
+    return count
+
+
+class Dataset:
+    def __init__(self, rows, csv_path, xlsx_path, photo_dir, photos):
+        self.rows = rows
+        self.csv_path = csv_path
+        self.xlsx_path = xlsx_path
+        self.photo_dir = photo_dir
+        self.photos = photos
+
+
+def make_dataset(rows, tmp_dir, seed=0, xlsx=True):
+    """Tulis CSV (dan xlsx) sintetis serta folder foto ke tmp_dir"""
+    df = make_frame(rows, seed)
+    os.makedirs(tmp_dir, exist_ok=True)
+    csv_path = os.path.join(tmp_dir, f"talent_{rows}.csv")
+    df.to_csv(csv_path, index=False)
+    xlsx_path = None
+    if xlsx:
+        xlsx_path = os.path.join(tmp_dir, f"talent_{rows}.xlsx")
+        df.to_excel(xlsx_path, index=False, sheet_name="FORMAT")
+
+    photo_dir = os.path.join(tmp_dir, "foto")
+    os.makedirs(photo_dir, exist_ok=True)
+    photos = link_photos(df, photo_dir, make_sample_photos(photo_dir, seed), seed)
+    return Dataset(rows, csv_path, xlsx_path, photo_dir, photos)
@@ -1,22 +1,34 @@
+import sys
+
 import pandas as pd
 
-# ===== 1. Load file Excel =====
-file_path = "Template_Talent Profile 28 Jul - 8 Aug (2).xlsx"
-df = pd.read_excel(file_path, sheet_name="FORMAT")
+from name_matching import normalize_name
+from talent_data import clean_talent_data, iter_talent_csv, read_talent_file
+
+# ===== 1. Load file Excel / CSV =====
+# File CSV dibaca per chunk dan hanya kolom Nama dan PIC yang diambil
+file_path = sys.argv[1] if len(sys.argv) > 1 else "Template_Talent Profile 28 Jul - 8 Aug(FORMAT).csv"
+columns = {"NAMA", "PIC"}
+if file_path.lower().endswith(".csv"):
+    chunks = iter_talent_csv(file_path, columns=columns)
+else:
+    chunks = [read_talent_file(file_path, sheet_name="FORMAT", columns=columns)]
 
 # ===== 2. Filter kolom yang dibutuhkan =====
 # Pastikan kolom "Nama" dan "PIC" sesuai nama di file Excel kamu
-df_check = df[['Nama', 'PIC']].dropna()
+df_check = pd.concat(clean_talent_data(chunk)[['Nama', 'PIC']].dropna() for chunk in chunks)
+# "MOH. SOLEH" dan "MUHAMMAD SOLEH" dihitung sebagai nama yang sama
+df_check['Nama Normal'] = df_check['Nama'].map(normalize_name)
 
 # ===== 3. Cari nama yang muncul di lebih dari 1 PIC =====
 # Hitung jumlah PIC unik untuk setiap nama
-pic_count = df_check.groupby('Nama')['PIC'].nunique()
+pic_count = df_check.groupby('Nama Normal')['PIC'].nunique()
 
 # Ambil hanya yang punya PIC > 1 (artinya nama itu ada di beberapa PIC)
 duplicate_names = pic_count[pic_count > 1].index
 
 # ===== 4. Ambil data detailnya =====
-duplicates_detail = df_check[df_check['Nama'].isin(duplicate_names)].sort_values(by='Nama')
+duplicates_detail = df_check[df_check['Nama Normal'].isin(duplicate_names)].sort_values(by=['Nama Normal', 'Nama'])
 
 # ===== 5. Simpan hasil ke Excel =====
 output_path = "nama_sama_di_semua_PIC.xlsx"
@@ -1,66 +1,511 @@
+import os
+import threading
+import zlib
 
 from fpdf import FPDF
 
-class CustomPDF(FPDF):
+import font_cache
+import text_layout
+import timing
+from talent_data import normalize_nipp
+
+# ========== FONTS ==========
+FONTS_DIR = "fonts"
+FONT_PATH = os.path.join(FONTS_DIR, "DejaVuSans.ttf")
+FONT_BOLD_PATH = os.path.join(FONTS_DIR, "DejaVuSans-Bold.ttf")
+
+# Naikkan kalau layout add_profile berubah, supaya manifest merender ulang semua profil
+RENDERER_VERSION = 3
+
+# Metrik dan tabel font di-parsing sekali per proses, dipakai semua CustomPDF
+font_cache.install()
+
+
+# ========== PDF CLASS ==========
+class _PdfBuffer:
+    """Buffer output FPDF yang menumpuk potongan string, bukan menyambung ulang"""
+
     def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    def __iadd__(self, s):
+        self.parts.append(s)
+        self.length += len(s)
+        return self
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return "".join(self.parts)
+
+
+class CustomPDF(FPDF):
+    def __init__(self, use_templates=True):
         super().__init__()
-        self.set_auto_page_break(auto=True, margin=15)
-        self.add_font('DejaVu', '', 'fonts/DejaVuSans.ttf', uni=True)
-        self.add_font('DejaVu', 'B', 'fonts/DejaVuSans-Bold.ttf', uni=True)
-        self.set_font('DejaVu', '', 12)
+        # Bagian halaman yang tetap digambar dari PageTemplate (lihat PAGE_TEMPLATES)
+        self.use_templates = use_templates
+        self.templates = {}
+        with timing.stage("font_loading"):
+            if os.path.exists(FONT_PATH):
+                font_cache.add_cached_font(self, "DejaVu", "", FONT_PATH)
+            if os.path.exists(FONT_BOLD_PATH):
+                font_cache.add_cached_font(self, "DejaVu", "B", FONT_BOLD_PATH)
+        self.set_font("DejaVu", "", 12)
+        self.outlines = []
+        self.outline_root = None
 
-    def header(self):
-        self.set_font('DejaVu', 'B', 14)
-        self.cell(0, 10, 'Profil Staff PT KAI', ln=True, align='C')
-        self.ln(5)
-
-    def draw_bounded_box(self, title, content_lines, x, y, w, max_h):
-        self.set_xy(x, y)
-        self.set_font('DejaVu', 'B', 12)
-        self.cell(w, 10, title, 0, ln=1)
-        self.set_font('DejaVu', '', 11)
-
-        start_y = self.get_y()
-        for line in content_lines:
-            if self.get_y() > 270:
+    def bookmark(self, txt, level=0, y=-1):
+        """Tambah entri outline/bookmark ke halaman saat ini"""
+        if y == -1:
+            y = self.get_y()
+        self.outlines.append({'t': txt, 'l': level, 'y': (self.h - y) * self.k, 'p': self.page_no()})
+
+    def _outline_text(self, txt):
+        # Teks non-ASCII ditulis sebagai UTF-16BE dengan BOM
+        if not txt.isascii():
+            txt = '\xfe\xff' + txt.encode('utf-16-be').decode('latin-1')
+        return self._textstring(txt)
+
+    def _putbookmarks(self):
+        nb = len(self.outlines)
+        if nb == 0:
+            return
+        lru = {}
+        level = 0
+        for i, o in enumerate(self.outlines):
+            if o['l'] > 0:
+                parent = lru[o['l'] - 1]
+                # Set parent and last pointers
+                o['parent'] = parent
+                self.outlines[parent]['last'] = i
+                if o['l'] > level:
+                    # Level increasing: set first pointer
+                    self.outlines[parent]['first'] = i
+            else:
+                o['parent'] = nb
+            if o['l'] <= level and i > 0:
+                # Set prev and next pointers
+                prev = lru[o['l']]
+                self.outlines[prev]['next'] = i
+                o['prev'] = prev
+            lru[o['l']] = i
+            level = o['l']
+
+        n = self.n + 1
+        for o in self.outlines:
+            self._newobj()
+            self._out('<</Title ' + self._outline_text(o['t']))
+            self._out('/Parent %d 0 R' % (n + o['parent']))
+            for key, name in (('prev', 'Prev'), ('next', 'Next'), ('first', 'First'), ('last', 'Last')):
+                if key in o:
+                    self._out('/%s %d 0 R' % (name, n + o[key]))
+            # Objek halaman ke-p di FPDF 1.7 bernomor 1 + 2 * p
+            self._out('/Dest [%d 0 R /XYZ 0 %.2f null]' % (1 + 2 * o['p'], o['y']))
+            self._out('/Count 0>>')
+            self._out('endobj')
+
+        # Outline root
+        self._newobj()
+        self.outline_root = self.n
+        self._out('<</Type /Outlines /First %d 0 R' % n)
+        self._out('/Last %d 0 R>>' % (n + lru[0]))
+        self._out('endobj')
+
+    def close(self):
+        # FPDF menyambung self.buffer += s untuk setiap baris, kuadratik pada
+        # dokumen gabungan yang besar; tumpuk dulu lalu gabungkan sekali.
+        if self.state == 3:
+            return
+        self.buffer = _PdfBuffer()
+        super().close()
+        self.buffer = str(self.buffer)
+
+    @timing.timed("image_embedding")
+    def image(self, *args, **kwargs):
+        return super().image(*args, **kwargs)
+
+    @timing.timed("pdf_output")
+    def output(self, name='', dest=''):
+        return super().output(name, dest)
+
+    def preload_image(self, path, info):
+        """Daftarkan gambar yang sudah dibaca load_image, supaya image(path) tidak membaca file lagi"""
+        if path not in self.images:
+            # Salinan per dokumen: _putimages menghapus 'data' setelah ditulis
+            self.images[path] = dict(info, i=len(self.images) + 1)
+
+    def get_string_width(self, s):
+        return text_layout.string_width(self, s)
+
+    # Seperti FPDF.multi_cell: error yang jelas kalau belum ada add_page()
+    @FPDF.check_page
+    def multi_cell(self, w, h, txt='', border=0, align='J', fill=0, split_only=False):
+        if split_only:
+            return [text for text, _ in text_layout.wrap(self, w, txt)]
+        text_layout.multi_cell(self, w, h, txt, border, align, fill)
+
+    def text_height(self, w, h, txt, font=None):
+        """Tinggi multi_cell(w, h, txt) sebelum digambar, dengan font aktif atau font=(family, style, size)"""
+        return text_layout.text_height(self, w, h, txt, font)
+
+    def _putresources(self):
+        super()._putresources()
+        self._putbookmarks()
+
+    def _putpages(self):
+        # Template yang hanya dipakai sekali (misalnya di PDF satu profil) lebih
+        # kecil kalau langsung ditulis di halamannya daripada sebagai XObject
+        for name, placed in list(self.templates.items()):
+            if placed['uses'] == 1:
+                page = placed['page']
+                self.pages[page] = self.pages[page].replace(
+                    '/TPL%d Do' % placed['i'], 'q\n%sQ' % placed['stream'])
+                del self.templates[name]
+        super()._putpages()
+
+    def _putimages(self):
+        super()._putimages()
+        self._puttemplates()
+
+    def _puttemplates(self):
+        # Template ditulis sebagai Form XObject yang memakai resource dictionary halaman
+        for placed in self.templates.values():
+            self._newobj()
+            placed['n'] = self.n
+            stream = placed['stream']
+            if self.compress:
+                stream = zlib.compress(stream.encode('latin-1'))
+            self._out('<</Type /XObject /Subtype /Form /BBox [0 0 %.2f %.2f] /Resources 2 0 R'
+                      % (self.fw_pt, self.fh_pt))
+            self._out('%s/Length %d>>' % ('/Filter /FlateDecode ' if self.compress else '', len(stream)))
+            self._putstream(stream)
+            self._out('endobj')
+
+    def _putxobjectdict(self):
+        super()._putxobjectdict()
+        for placed in self.templates.values():
+            self._out('/TPL%d %d 0 R' % (placed['i'], placed['n']))
+
+    def _putcatalog(self):
+        super()._putcatalog()
+        if self.outlines:
+            self._out('/Outlines %d 0 R' % self.outline_root)
+            self._out('/PageMode /UseOutlines')
+
+    def use_template(self, name):
+        """
+        Gambar bagian tetap name di halaman ini, di posisi y saat ini untuk judul bagian.
+
+        Template direkam sekali per proses (get_template) dan di-embed sekali
+        per dokumen; setiap pemakaian cukup satu operator Do.
+        """
+        if not self.use_templates:
+            getattr(self, PAGE_TEMPLATES[name][0])()
+            return
+        template = get_template(name)
+        placed = self.templates.get(name)
+        if placed is None:
+            placed = self.templates[name] = {'i': len(self.templates) + 1, 'stream': template.adopt(self), 'uses': 0}
+        placed['uses'] += 1
+        placed['page'] = self.page
+        if template.relative:
+            # Judul bagian ikut pindah halaman seperti cell biasa
+            if self.y + template.end[1] > self.page_break_trigger:
                 self.add_page()
-                self.set_y(40)
-            self.multi_cell(w, 8, line, border=0)
-
-        box_bottom_y = self.get_y()
-        self.rect(x, start_y - 10, w, box_bottom_y - (start_y - 10))
-
-    def add_profile(self, data, img_path=None):
-        if img_path:
-            self.image(img_path, x=160, y=30, w=30)
-
-        self.set_font('DejaVu', 'B', 12)
-        self.cell(0, 10, f"Nama: {data.get('Nama', '-')}", ln=True)
-        self.set_font('DejaVu', '', 11)
-
-        self.ln(3)
-        self.cell(0, 8, f"Talent Classification: {data.get('Talent Classification', '-')}", ln=True)
-        self.cell(0, 8, f"Nilai Kinerja (2022): {data.get('Nilai Kinerja (2022)', '-')}", ln=True)
-        self.cell(0, 8, f"Nilai Kinerja (2023): {data.get('Nilai Kinerja (2023)', '-')}", ln=True)
-        self.cell(0, 8, f"Nilai Kinerja (2024): {data.get('Nilai Kinerja (2024)', '-')}", ln=True)
-
-        self.ln(5)
-        working_exp = str(data.get('Working Experience', '-'))
-        working_exp_lines = working_exp.split('\n')
-        self.draw_bounded_box("Working Experience", working_exp_lines, x=10, y=self.get_y(), w=190, max_h=100)
-
-        self.ln(5)
-        self.cell(0, 8, "Behaviour Competencies", ln=True)
-        self.cell(0, 8, f"- BUMN Assessment: {data.get('Behaviour Competencies BUMN', '-')}", ln=True)
-        self.cell(0, 8, f"- Multirater: {data.get('Behaviour Competencies Multirater', '-')}", ln=True)
-
-        self.ln(5)
-        knowledge = str(data.get('Knowledge', '-')).split('\n')
-        self.draw_bounded_box("Knowledge", knowledge, x=10, y=self.get_y(), w=190, max_h=100)
-
-        self.ln(5)
-        self.cell(0, 8, f"Tgl Lahir: {data.get('Tgl Lahir', '-')}", ln=True)
-        self.cell(0, 8, f"Usia: {data.get('Usia', '-')}", ln=True)
-        self.cell(0, 8, f"Pendidikan: {data.get('Pendidikan', '-')}", ln=True)
-        self.cell(0, 8, f"Grade: {data.get('Grade', '-')}", ln=True)
-        self.multi_cell(0, 8, f"Penghargaan: {data.get('Penghargaan', '-')}", ln=True)
\ No newline at end of file
+            self._out('q 1 0 0 1 0 %.2f cm /TPL%d Do Q' % (-self.y * self.k, placed['i']))
+            self.x, self.y = template.end[0], self.y + template.end[1]
+        else:
+            self._out('/TPL%d Do' % placed['i'])
+            self.x, self.y = template.end
+
+    def header(self):
+        self.use_template("header")
+
+    def _draw_header(self):
+        try:
+            # Use absolute path for logo to ensure it loads correctly
+            logo_path = os.path.join(os.getcwd(), "logo_kai.png")
+            if os.path.exists(logo_path):
+                # Add white background rectangle for better logo visibility
+                self.set_fill_color(255, 255, 255)
+                self.rect(8, 6, 36, 20, 'F')
+                self.image(logo_path, 10, 8, 32)
+        except Exception as e:
+            # Fallback if logo can't be loaded
+            self.set_font("DejaVu", "B", 12)
+            self.set_xy(130, 12)
+            self.cell(0, 10, "PT KAI", ln=0, align="R")
+        self.set_font("DejaVu", "B", 12)
+        self.set_xy(130, 12)
+        self.set_text_color(33, 64, 154)
+        self.cell(0, 10, "Profil Ringkas Kandidat PT KAI", ln=0, align="R")
+        self.set_text_color(0, 0, 0)
+
+    def check_page_break(self, h):
+        if self.get_y() + h > self.page_break_trigger:
+            self.add_page()
+
+    def _draw_frame(self):
+        # Kotak luar, kotak klasifikasi/nilai dan judul tabel behaviour di halaman pertama profil
+        self.rect(10, 28, 190, 255)
+        self.rect(50, 42, 135, 38)
+        self.set_font("DejaVu", "B", 10)
+        self.set_xy(52, 44)
+        self.cell(0, 6, "TALENT CLASSIFICATION:")
+        self.set_xy(52, 59)
+        self.cell(0, 6, "NILAI KINERJA:")
+        self.set_y(86)
+        self.set_x(15)
+        self.multi_cell(175, 6, "BEHAVIOUR COMPETENCIES", border=1, align="C")
+        self.set_font("DejaVu", "B", 9)
+        self.set_x(15)
+        self.cell(87.5, 6, "BUMN Assessment", border=1, align="C")
+        self.cell(87.5, 6, "Multirater", border=1, align="C")
+        self.ln()
+
+    def _draw_knowledge_title(self):
+        self.set_x(15)
+        self.set_font("DejaVu", "B", 10)
+        self.multi_cell(175, 6, "KNOWLEDGE", border=1, align="C")
+
+    def _draw_experience_title(self):
+        self.set_x(15)
+        self.set_font("DejaVu", "B", 10)
+        self.cell(0, 6, "5 LATEST WORKING EXPERIENCE", ln=1)
+        self.line(15, self.get_y(), 190, self.get_y())
+
+    def _draw_attributes_title(self):
+        self.set_x(15)
+        self.set_font("DejaVu", "B", 10)
+        self.cell(0, 6, "PERSONAL ATTRIBUTES", ln=1)
+        self.line(15, self.get_y(), 190, self.get_y())
+
+    @timing.timed("layout")
+    def add_profile(self, data, foto_path):
+        def get_val(field):
+            val = str(data.get(field, "-")).strip()
+            return val if val else "-"
+
+        self.use_template("frame")
+        self.set_xy(15, 30)
+        self.set_font("DejaVu", "B", 14)
+        self.cell(0, 10, get_val("Nama"), ln=True)
+
+        y_start = 42
+        if foto_path:
+            try:
+                self.image(foto_path, x=15, y=y_start, w=30, h=38)
+            except:
+                pass
+
+        self.set_font("DejaVu", "", 10)
+        self.set_xy(52, y_start + 8)
+        self.multi_cell(130, 5, get_val("Talent Classification"))
+
+        y_score = y_start + 23
+        for tahun in ["2024", "2023", "2022"]:
+            self.set_xy(52, y_score)
+            self.cell(0, 5, f"{tahun} : {get_val(f'Nilai Kinerja ({tahun})')}")
+            y_score += 5
+
+        # Judul behaviour dan header tabelnya sudah ada di template frame
+        y_table_start = y_start + 38 + 6 + 6
+        self.set_font("DejaVu", "", 9)
+        self.set_y(y_table_start + 6)
+        self.set_x(15)
+        self.multi_cell(87.5, 5, get_val("Behaviour Competencies BUMN"), border=1)
+
+        y_temp = self.get_y()
+        self.set_xy(102.5, y_table_start + 6)
+        self.multi_cell(87.5, 5, get_val("Behaviour Competencies Multirater"), border=1)
+
+        y_next = max(self.get_y(), y_temp) + 6
+
+        self.set_y(y_next)
+        self.use_template("knowledge")
+        self.set_font("DejaVu", "", 9)
+        self.set_x(15)
+        self.multi_cell(175, 5, get_val("Knowledge"), border=1)
+        y_know = self.get_y()
+
+        self.set_y(y_know + 6)
+        self.use_template("experience")
+        y_exp_start = self.get_y() + 2
+
+        for line in get_val("Working Experience").split("\n"):
+            if line.strip():
+                if "(" in line and ")" in line:
+                    jabatan = line.split("(")[0].strip()
+                    tanggal = line[line.find("("):].strip()
+                else:
+                    jabatan = line.strip()
+                    tanggal = ""
+                # Jabatan dan tanggal satu baris masing-masing, jadi tingginya pasti
+                self.check_page_break(10 if tanggal else 5)
+                self.set_x(15)
+                self.set_font("DejaVu", "B", 9)
+                self.cell(175, 5, jabatan, ln=1)
+                if tanggal:
+                    self.set_x(15)
+                    self.set_font("DejaVu", "", 9)
+                    self.cell(175, 5, tanggal, ln=1)
+        y_exp_end = self.get_y()
+        self.rect(15, y_exp_start - 8, 175, y_exp_end - y_exp_start + 10)
+
+        attributes = [
+            ("Tempat & Tanggal Lahir", "Tempat & Tanggal Lahir"),
+            ("Usia", "Usia"),
+            ("Pendidikan", "Pendidikan"),
+            ("Grade", "Grade"),
+            ("Penghargaan", "Penghargaan"),
+            ("Hukuman Disiplin", "Hukuman Disiplin"),
+        ]
+        # Kotak personal attributes tidak dipotong di tengah: kalau tidak muat, pindah halaman
+        attr_height = 6 + sum(self.text_height(125, 5, get_val(field), font=("DejaVu", "", 9))
+                              for _, field in attributes)
+        y_attr_start = y_exp_end + 6
+        self.set_y(y_attr_start)
+        self.check_page_break(attr_height)
+        self.use_template("attributes")
+        y_attr_content_start = self.get_y() + 2
+
+        for label, field in attributes:
+            self.set_x(16)
+            self.set_font("DejaVu", "B", 9)
+            self.cell(43, 5, f"{label}", ln=0)
+            self.cell(6, 5, ":", ln=0)
+            self.set_font("DejaVu", "", 9)
+            self.multi_cell(125, 5, get_val(field))
+
+        end_y = self.get_y()
+        self.rect(15, y_attr_content_start - 8, 175, end_y - y_attr_content_start + 10)
+
+
+# nama template -> (method penggambar, posisinya mengikuti y saat dipakai)
+PAGE_TEMPLATES = {
+    "header": ("_draw_header", False),
+    "frame": ("_draw_frame", False),
+    "knowledge": ("_draw_knowledge_title", True),
+    "experience": ("_draw_experience_title", True),
+    "attributes": ("_draw_attributes_title", True),
+}
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+class PageTemplate:
+    """
+    Bagian tetap halaman profil yang digambar sekali per proses.
+
+    Menyimpan operator PDF hasil gambar, huruf yang harus masuk subset font,
+    gambar yang dipakai (logo) dan posisi x/y sesudah digambar. Template
+    relative direkam di y=0 dan digeser ke y saat dipakai.
+    """
+
+    def __init__(self, method, relative):
+        pdf = CustomPDF(use_templates=False)
+        pdf.header = lambda: None   # halaman rekaman hanya berisi template ini
+        pdf.add_page()
+        if relative:
+            pdf.set_y(0)
+        getattr(pdf, method)()
+        self.stream = pdf.pages[pdf.page]
+        self.relative = relative
+        self.end = (pdf.x, pdf.y)
+        self.chars = {fontkey: list(font['subset']) for fontkey, font in pdf.fonts.items()}
+        self.images = {path: info for path, info in pdf.images.items()
+                       if '/I%d Do' % info['i'] in self.stream}
+
+    def adopt(self, pdf):
+        """Daftarkan huruf dan gambar template ke dokumen pdf, kembalikan stream-nya"""
+        for fontkey, chars in self.chars.items():
+            subset = pdf.fonts[fontkey]['subset']
+            for char in chars:
+                subset.append(char)
+        stream = self.stream
+        for path, info in self.images.items():
+            pdf.preload_image(path, info)
+            if pdf.images[path]['i'] != info['i']:
+                stream = stream.replace('/I%d Do' % info['i'], '/I%d Do' % pdf.images[path]['i'])
+        return stream
+
+
+def get_template(name):
+    """PageTemplate bersama untuk name, direkam saat pertama dipakai"""
+    template = _templates.get(name)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(name)
+            if template is None:
+                template = _templates[name] = PageTemplate(*PAGE_TEMPLATES[name])
+    return template
+
+
+_image_parser = FPDF()
+
+
+@timing.timed("image_read")
+def load_image(path):
+    """
+    Baca dan parsing gambar seperti FPDF.image tanpa dokumen PDF.
+
+    Hasilnya bisa dibuat di thread lain lalu dipakai CustomPDF.preload_image.
+    """
+    if os.path.splitext(path)[1].lower() == ".png":
+        return _image_parser._parsepng(path)
+    return _image_parser._parsejpg(path)
+
+
+def render_profile(data, foto_path, image=None):
+    """
+    Render satu profil dan kembalikan isi PDF sebagai bytes.
+
+    image: hasil load_image(foto_path) kalau foto sudah dibaca sebelumnya
+    """
+    pdf = CustomPDF()
+    pdf.add_page()
+    if image is not None and foto_path:
+        pdf.preload_image(foto_path, image)
+    pdf.add_profile(data, foto_path)
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def profile_label(data):
+    """Label bookmark untuk satu profil: Nama (NIPP)"""
+    nama = str(data.get("Nama", "-")).strip()
+    nipp = normalize_nipp(data.get("NIPP"))
+    return f"{nama} ({nipp})" if nipp else nama
+
+
+def render_merged(profiles, group_by=None, progress=None):
+    """
+    Render banyak profil ke satu PDF dengan bookmark per NIPP.
+
+    Font, logo dan gambar yang sama hanya di-embed sekali untuk seluruh
+    dokumen. Kalau group_by diisi (misalnya "PIC"), bookmark dikelompokkan
+    per nilai kolom tersebut; urutkan profiles berdasarkan kolom itu dulu.
+
+    Args:
+        profiles: Iterable berisi (data, foto_path)
+        group_by: Nama kolom untuk bookmark level pertama, atau None
+        progress: Fungsi yang dipanggil dengan data setiap profil selesai
+    """
+    pdf = CustomPDF()
+    current_group = None
+    for data, foto_path in profiles:
+        pdf.add_page()
+        level = 0
+        if group_by:
+            group = str(data.get(group_by, "-")).strip() or "-"
+            if group != current_group:
+                pdf.bookmark(group, 0, y=28)
+                current_group = group
+            level = 1
+        pdf.bookmark(profile_label(data), level, y=28)
+        pdf.add_profile(data, foto_path)
+        if progress:
+            progress(data)
+    return pdf.output(dest='S').encode('latin-1')
@@ -31,3 +31,13 @@ class DateFormatter:
 
         # Jika gagal parsing, kembalikan string mentah
         return date_str
+
+
+def format_date_column(dates, output_format="%d %B %Y"):
+    """
+    DateFormatter.format_date untuk satu kolom.
+    Setiap nilai unik diformat sekali lalu hasilnya disebar ke semua baris.
+    """
+    dates = dates.astype(object)
+    formatted = {value: DateFormatter.format_date(value, output_format) for value in pd.unique(dates.dropna())}
+    return dates.map(formatted).fillna("-")
@@ -5,9 +5,13 @@ Supports Indonesian and international date formats
 
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict, Any
 import dateutil.parser as parser
 from dateutil.parser import ParserError
+import pandas as pd
+
+import timing
 
 class EnhancedDateParser:
     """Advanced date parser supporting multiple formats and languages"""
@@ -169,3 +173,93 @@ class EnhancedDateParser:
     def validate_date(cls, date_string: str) -> bool:
         """Validate if string can be parsed as date"""
         return cls.parse_date(date_string) is not None
+
+
+# ========== COLUMNAR PARSING ==========
+# Pola cepat yang hasilnya pasti sama dengan EnhancedDateParser.parse_date.
+# YYYY-MM-DD sengaja tidak ada: dateutil dengan dayfirst=True menukar bulan
+# dan tanggalnya, jadi tetap lewat parser lengkap.
+_TEXT_MONTH_PATTERN = r'^(\d{1,2}) ([a-z]+) (\d{4})$'
+_NUMERIC_PATTERN = r'^(\d{1,2})([/.-])(\d{1,2})\2(\d{4})$'
+_DATE_IN_TEXT_PATTERN = r'(\d{1,2}[\s/.,-]+\w+[\s/.,-]+\d{4})'
+
+
+@lru_cache(maxsize=None)
+def _memoized(parse_date):
+    return lru_cache(maxsize=4096)(parse_date)
+
+
+def parse_unique_dates(date_strings: pd.Series, parse_date=None) -> Dict[str, Optional[datetime]]:
+    """
+    Parse setiap string tanggal unik sekali saja.
+
+    Format "15 Januari 1990" dan "15/01/1990" dikenali sekaligus dengan regex
+    vektor; sisanya lewat parse_date (default EnhancedDateParser.parse_date)
+    yang hasilnya di-cache antar pemanggilan.
+
+    Returns:
+        Dict string asli -> datetime, atau None kalau gagal
+    """
+    parse_date = _memoized(parse_date or EnhancedDateParser.parse_date)
+    uniques = pd.Series(pd.unique(date_strings.dropna()), dtype=object)
+    if uniques.empty:
+        return {}
+    norm = uniques.astype(str).str.strip().str.lower().str.replace(r'\s+', ' ', regex=True)
+
+    text = norm.str.extract(_TEXT_MONTH_PATTERN)
+    numeric = norm.str.extract(_NUMERIC_PATTERN)
+    text_month = text[1].map(EnhancedDateParser.INDONESIAN_MONTHS)
+    use_text = text_month.notna()
+    parts = pd.DataFrame({
+        "year": text[2].where(use_text, numeric[3]),
+        "month": text_month.where(use_text, numeric[2]),
+        "day": text[0].where(use_text, numeric[0]),
+    }).apply(pd.to_numeric)
+    fast = pd.to_datetime(parts, errors="coerce")
+
+    result = {}
+    for original, value in zip(uniques, fast):
+        result[original] = value.to_pydatetime() if not pd.isna(value) else parse_date(original)
+    return result
+
+
+@timing.timed("date_parsing")
+def parse_birth_column(combined: pd.Series, parse_date=None) -> pd.DataFrame:
+    """
+    Versi kolom dari EnhancedDateParser.extract_place_and_date.
+
+    Tempat dan tanggal dipisah dengan operasi string vektor, lalu setiap
+    string tanggal unik di-parse sekali lewat parse_unique_dates.
+
+    Args:
+        combined: Kolom berisi string seperti "Jakarta, 15 Januari 1990"
+        parse_date: Parser untuk format yang tidak dikenali pola cepat
+
+    Returns:
+        DataFrame dengan index yang sama dan kolom place, date, formatted_date
+    """
+    text = combined.astype(str).str.strip()
+    missing = combined.isna() | text.isin(['-', '', 'nan', 'None'])
+
+    has_comma = text.str.contains(',', regex=False)
+    split = text.str.partition(',')
+    place = split[0].str.strip().where(has_comma, text)
+    date_part = split[2].str.strip().where(has_comma)
+
+    # Tanpa koma: cari tanggal di dalam teks, sisanya dianggap tempat
+    no_comma = ~has_comma & ~missing
+    found = text[no_comma].str.extract(_DATE_IN_TEXT_PATTERN)[0].dropna()
+    date_part.loc[found.index] = found
+    place.loc[found.index] = [t.replace(d, '').strip() for t, d in zip(text[found.index], found)]
+
+    date_part = date_part.where(~missing)
+    place = place.where(~missing, '-')
+
+    parsed = parse_unique_dates(date_part, parse_date)
+    formatted = {s: EnhancedDateParser.format_indonesian_date(d) if d else "-" for s, d in parsed.items()}
+    dates = date_part.map(parsed)
+    return pd.DataFrame({
+        "place": place,
+        "date": dates.where(dates.notna(), None),
+        "formatted_date": date_part.map(formatted).fillna("-"),
+    }, index=combined.index)
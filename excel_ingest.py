@@ -0,0 +1,152 @@
+"""
+Pembacaan Excel cepat untuk file talent
+
+pd.read_excel mengonversi setiap sel di semua kolom, padahal yang dipakai
+profil hanya belasan kolom. Di sini baris header dibaca dulu untuk memilih
+sheet dan kolom, lalu hanya kolom itu yang di-stream baris per baris.
+
+Engine python-calamine (Rust) dipakai kalau terpasang
+(pip install python-calamine), selain itu openpyxl mode read-only.
+Hasil akhirnya tetap lewat TextParser pandas, jadi tipe data sama dengan
+pd.read_excel.
+"""
+
+import datetime
+from itertools import islice
+
+import pandas as pd
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # calamine tidak terpasang: pakai openpyxl
+    CalamineWorkbook = None
+
+EXCEL_ERRORS = {"#DIV/0!", "#N/A", "#NAME?", "#NULL!", "#NUM!", "#REF!", "#VALUE!"}
+
+
+def _convert_cell(value):
+    """Samakan nilai sel dengan konversi reader Excel pandas"""
+    if value is None or value == "":
+        return ""
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str) and value in EXCEL_ERRORS:
+        return float("nan")
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return datetime.datetime(value.year, value.month, value.day)
+    return value
+
+
+class _Workbook:
+    """Workbook read-only dengan akses baris yang seragam untuk kedua engine"""
+
+    def __init__(self, source, engine=None):
+        if engine is None:
+            engine = "calamine" if CalamineWorkbook is not None else "openpyxl"
+        self.engine = engine
+        if hasattr(source, "seek"):
+            source.seek(0)
+        if engine == "calamine":
+            self._wb = CalamineWorkbook.from_object(source)
+            self.sheet_names = list(self._wb.sheet_names)
+        else:
+            self._wb = load_workbook(source, read_only=True, data_only=True)
+            self.sheet_names = list(self._wb.sheetnames)
+
+    def iter_rows(self, sheet_name, max_col=None):
+        if self.engine == "calamine":
+            for row in self._wb.get_sheet_by_name(sheet_name).iter_rows():
+                yield row[:max_col] if max_col else row
+        else:
+            yield from self._wb[sheet_name].iter_rows(max_col=max_col, values_only=True)
+
+    def header(self, sheet_name):
+        """(posisi, isi) baris tidak kosong pertama di sheet, atau (-1, []) kalau kosong"""
+        for position, row in enumerate(self.iter_rows(sheet_name)):
+            if any(cell not in (None, "") for cell in row):
+                return position, list(row)
+        return -1, []
+
+    def close(self):
+        if self.engine == "openpyxl":
+            self._wb.close()
+
+
+def _resolve_sheet(wb, sheet_name):
+    """
+    Nama sheet yang dibaca. Kalau sheet_name None: sheet yang namanya diawali
+    FORMAT, lalu sheet pertama yang header-nya punya kolom NAMA.
+    """
+    if isinstance(sheet_name, int):
+        return wb.sheet_names[sheet_name]
+    if sheet_name is not None:
+        return sheet_name
+    if len(wb.sheet_names) == 1:
+        return wb.sheet_names[0]
+    for name in wb.sheet_names:
+        if name.strip().upper().startswith("FORMAT"):
+            return name
+    for name in wb.sheet_names:
+        if "NAMA" in (str(cell).strip().upper() for cell in wb.header(name)[1]):
+            return name
+    return wb.sheet_names[0]
+
+
+def _column_name(value, position):
+    # Header kosong diberi nama seperti pandas
+    return f"Unnamed: {position}" if value in (None, "") else value
+
+
+def _default_key(name):
+    return str(name).strip().upper()
+
+
+def read_excel_columns(source, columns=None, sheet_name=None, engine=None, key=_default_key):
+    """
+    Baca satu sheet Excel, hanya kolom yang header-nya ada di columns.
+
+    Args:
+        source: Path atau file-like .xlsx
+        columns: Nama header (sesudah key) yang dibaca;
+            None berarti semua kolom
+        sheet_name: Nama/index sheet, atau None untuk pilih otomatis
+        engine: "calamine", "openpyxl", atau None untuk yang tercepat
+        key: Fungsi penyama header sebelum dicocokkan dengan columns
+
+    Returns:
+        DataFrame dengan attrs["source_columns"] berisi semua header sheet
+    """
+    wb = _Workbook(source, engine)
+    try:
+        sheet = _resolve_sheet(wb, sheet_name)
+        header_row, header = wb.header(sheet)
+        if not header:
+            return pd.DataFrame()
+        header = [_column_name(cell, i) for i, cell in enumerate(header)]
+
+        if columns is None:
+            keep = list(range(len(header)))
+        else:
+            wanted = set(columns)
+            keep = [i for i, name in enumerate(header) if key(name) in wanted]
+
+        # Kolom di kanan kolom terakhir yang dipakai tidak perlu dibaca
+        max_col = keep[-1] + 1 if keep else 1
+        rows = islice(wb.iter_rows(sheet, max_col=max_col), header_row + 1, None)
+
+        data = []
+        last_filled = 0
+        for row in rows:
+            values = [_convert_cell(row[i]) if i < len(row) else "" for i in keep]
+            data.append(values)
+            if any(value != "" for value in values):
+                last_filled = len(data)
+    finally:
+        wb.close()
+
+    # Baris kosong di akhir sheet dibuang, seperti pd.read_excel
+    df = TextParser([[header[i] for i in keep]] + data[:last_filled], header=0).read()
+    df.attrs["source_columns"] = [str(name) for name in header]
+    return df
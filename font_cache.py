@@ -0,0 +1,215 @@
+"""
+Cache font TTF dan metrik glyph untuk satu proses
+
+FPDF.add_font membaca ulang file .pkl (atau mem-parsing TTF) untuk setiap
+CustomPDF, dan makeSubset mem-parsing ulang tabel cmap, hmtx dan loca setiap
+kali PDF di-output. Modul ini menyimpan hasil parsing tersebut sekali per
+proses sehingga biaya per profil tinggal layout dan output.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import struct
+import threading
+
+from fpdf import fpdf as fpdf_module
+from fpdf import ttfonts
+
+# Folder cache metrik di disk; kosongkan (TALENT_FONT_CACHE="") untuk mematikan
+FONT_CACHE_DIR = os.environ.get("TALENT_FONT_CACHE", os.path.join(".cache", "fonts"))
+
+_metrics = {}
+_tables = {}
+_lock = threading.Lock()
+_originals = (ttfonts.calcChecksum, fpdf_module.TTFontFile)
+
+
+def _font_key(path):
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_file(key, cache_dir):
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(key[0]))[0]
+    return os.path.join(cache_dir, f"{name}-{digest}.pkl")
+
+
+def _parse_metrics(path):
+    """Parsing TTF seperti FPDF.add_font(uni=True)"""
+    ttf = ttfonts.TTFontFile()
+    ttf.getMetrics(path)
+    desc = {
+        'Ascent': int(round(ttf.ascent, 0)),
+        'Descent': int(round(ttf.descent, 0)),
+        'CapHeight': int(round(ttf.capHeight, 0)),
+        'Flags': ttf.flags,
+        'FontBBox': "[%s %s %s %s]" % (
+            int(round(ttf.bbox[0], 0)),
+            int(round(ttf.bbox[1], 0)),
+            int(round(ttf.bbox[2], 0)),
+            int(round(ttf.bbox[3], 0))),
+        'ItalicAngle': int(ttf.italicAngle),
+        'StemV': int(round(ttf.stemV, 0)),
+        'MissingWidth': int(round(ttf.defaultWidth, 0)),
+    }
+    return {
+        'name': re.sub('[ ()]', '', ttf.fullName),
+        'type': 'TTF',
+        'desc': desc,
+        'up': round(ttf.underlinePosition),
+        'ut': round(ttf.underlineThickness),
+        'ttffile': path,
+        'originalsize': os.stat(path).st_size,
+        'cw': ttf.charWidths,
+    }
+
+
+def load_font_metrics(path, cache_dir=None):
+    """
+    Metrik font untuk path TTF, dimuat sekali per proses.
+
+    Returns:
+        Tuple (font_dict, path_pickle_di_disk atau None)
+    """
+    cache_dir = FONT_CACHE_DIR if cache_dir is None else cache_dir
+    key = _font_key(path)
+    with _lock:
+        if key in _metrics:
+            return _metrics[key]
+
+        unifilename = _cache_file(key, cache_dir) if cache_dir else None
+        font_dict = None
+        if unifilename and os.path.exists(unifilename):
+            try:
+                with open(unifilename, "rb") as fh:
+                    font_dict = pickle.load(fh)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                font_dict = None
+
+        if font_dict is None:
+            font_dict = _parse_metrics(path)
+            if unifilename:
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    with open(unifilename, "wb") as fh:
+                        pickle.dump(font_dict, fh)
+                except OSError:
+                    # Cache disk hanya optimasi, tetap jalan kalau folder read-only
+                    unifilename = None
+
+        _metrics[key] = (font_dict, unifilename)
+        return _metrics[key]
+
+
+class SubsetList(list):
+    """
+    Daftar glyph subset font tanpa duplikat.
+
+    FPDF menambahkan kode setiap karakter yang ditulis ke list ini, sehingga
+    pada dokumen gabungan list-nya berisi ratusan ribu entri dan pengecekan
+    `cid in subset` di _putTTfontwidths menjadi sangat lambat.
+    """
+
+    def __init__(self, items=()):
+        super().__init__()
+        self._seen = set()
+        for item in items:
+            self.append(item)
+
+    def append(self, item):
+        if item not in self._seen:
+            self._seen.add(item)
+            super().append(item)
+
+    def __contains__(self, item):
+        return item in self._seen
+
+    def __delitem__(self, index):
+        removed = self[index]
+        super().__delitem__(index)
+        if isinstance(index, slice):
+            self._seen.difference_update(removed)
+        else:
+            self._seen.discard(removed)
+
+
+def add_cached_font(pdf, family, style, path):
+    """Pengganti pdf.add_font(family, style, path, uni=True) yang memakai cache proses"""
+    family = family.lower()
+    style = style.upper()
+    fontkey = family + style
+    if fontkey in pdf.fonts:
+        return
+
+    font_dict, unifilename = load_font_metrics(path)
+    if hasattr(pdf, 'str_alias_nb_pages'):
+        sbarr = list(range(0, 57))   # include numbers in the subset!
+    else:
+        sbarr = list(range(0, 32))
+    pdf.fonts[fontkey] = {
+        'i': len(pdf.fonts) + 1, 'type': font_dict['type'],
+        'name': font_dict['name'], 'desc': font_dict['desc'],
+        'up': font_dict['up'], 'ut': font_dict['ut'],
+        'cw': font_dict['cw'],
+        'ttffile': font_dict['ttffile'], 'fontkey': fontkey,
+        'subset': SubsetList(sbarr), 'unifilename': unifilename,
+    }
+    pdf.font_files[fontkey] = {'length1': font_dict['originalsize'],
+                               'type': "TTF", 'ttffile': font_dict['ttffile']}
+    pdf.font_files[path] = {'type': "TTF"}
+
+
+def calc_checksum(data):
+    """Checksum tabel TTF, hasilnya sama dengan ttfonts.calcChecksum"""
+    if len(data) % 4:
+        data += b"\0" * (4 - (len(data) % 4))
+    total = sum(struct.unpack(">%dL" % (len(data) // 4), data)) & 0xFFFFFFFF
+    return (total >> 16, total & 0xFFFF)
+
+
+class CachedTTFontFile(ttfonts.TTFontFile):
+    """TTFontFile yang memakai ulang tabel cmap, hmtx dan loca per file font"""
+
+    def _cached(self, name, build):
+        key = (_font_key(self.filename), name)
+        if key not in _tables:
+            _tables[key] = build()
+        return _tables[key]
+
+    def getCMAP4(self, unicode_cmap_offset, glyphToChar, charToGlyph):
+        def build():
+            g2c, c2g = {}, {}
+            super(CachedTTFontFile, self).getCMAP4(unicode_cmap_offset, g2c, c2g)
+            return g2c, c2g, self.maxUniChar
+
+        g2c, c2g, self.maxUniChar = self._cached(("cmap4", unicode_cmap_offset), build)
+        glyphToChar.update(g2c)
+        charToGlyph.update(c2g)
+
+    def getHMTX(self, numberOfHMetrics, numGlyphs, glyphToChar, scale):
+        def build():
+            super(CachedTTFontFile, self).getHMTX(numberOfHMetrics, numGlyphs, glyphToChar, scale)
+            return self.charWidths, getattr(self, "defaultWidth", 0)
+
+        self.charWidths, self.defaultWidth = self._cached(("hmtx", numberOfHMetrics, numGlyphs, scale), build)
+
+    def getLOCA(self, indexToLocFormat, numGlyphs):
+        def build():
+            super(CachedTTFontFile, self).getLOCA(indexToLocFormat, numGlyphs)
+            return self.glyphPos
+
+        self.glyphPos = self._cached(("loca", indexToLocFormat, numGlyphs), build)
+
+
+def install():
+    """Pasang cache tabel dan checksum cepat ke fpdf untuk seluruh proses"""
+    ttfonts.calcChecksum = calc_checksum
+    fpdf_module.TTFontFile = CachedTTFontFile
+
+
+def uninstall():
+    """Kembalikan fpdf ke perilaku aslinya (dipakai benchmark)"""
+    ttfonts.calcChecksum, fpdf_module.TTFontFile = _originals
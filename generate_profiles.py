@@ -0,0 +1,291 @@
+"""
+Generate Talent Profile PDF secara massal tanpa Streamlit
+
+Contoh:
+    python generate_profiles.py "Talent Profile D6 REVISI.xlsx" -o TalentProfile_D6
+    python generate_profiles.py "Template_Talent Profile 28 Jul - 8 Aug(FORMAT).csv" -o Output_Template -j 8 --group-by PIC
+    python generate_profiles.py "Talent Profile D6 REVISI.xlsx" -o TalentProfile_D6 --group-by LEVEL --merged
+    python generate_profiles.py "Talent Profile D6 REVISI.xlsx" "Talent Profile D6 khusus.xlsx" -o TalentProfile_D6
+
+Beberapa file input dibaca paralel lalu digabung per NIPP lewat
+merge_sources.py; kalau satu NIPP ada di beberapa file, file yang paling
+baru diubah menang dan perbedaannya dicetak sebagai konflik.
+
+Output per profil dicatat di <output>/.manifest.json; run berikutnya hanya
+merender profil yang datanya, fotonya atau versi renderernya berubah, dan
+menghapus PDF milik baris yang sudah tidak ada (--force untuk render ulang
+semua).
+
+Di setiap worker foto untuk profil berikutnya disiapkan dan PDF yang sudah
+jadi ditulis di thread terpisah selagi profil sekarang dirender (lihat
+pipeline.py; TALENT_PREFETCH=0 untuk mematikan).
+
+Jalankan dari folder repo supaya folder fonts/, logo_kai.png dan folder
+foto (photo_index.PHOTO_DIRS) ditemukan.
+"""
+
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+import pipeline
+from custom_pdf import render_merged
+from merge_sources import load_merged, print_conflicts
+from manifest import Manifest
+from photo_cache import get_thumbnail
+from talent_data import (
+    clean_talent_data,
+    get_photo_path,
+    iter_talent_csv,
+    normalize_nipp,
+    read_talent_file,
+)
+
+
+def safe_filename(text):
+    """Buang karakter yang tidak boleh dipakai di nama file"""
+    return re.sub(r'[\\/:*?"<>|]', "", str(text)).strip()
+
+
+def build_jobs(df, output_dir, group_by=None, photo_dir=None, name_counts=None):
+    """
+    Susun daftar (data, foto, path_output) untuk setiap baris.
+
+    name_counts (jumlah kemunculan per nama) diisi kalau df hanya sebagian
+    dari file, supaya nama kembar di chunk lain tetap terdeteksi.
+    """
+    df = df[df["Nama"].notna()]
+    if name_counts is None:
+        name_counts = df["Nama"].value_counts()
+
+    jobs = []
+    for data in df.to_dict("records"):
+        nama = safe_filename(data["Nama"])
+        # Nama kembar diberi NIPP supaya file tidak saling menimpa
+        if name_counts[data["Nama"]] > 1 and "NIPP" in data:
+            filename = f"Profil_{nama}_{safe_filename(normalize_nipp(data['NIPP']))}.pdf"
+        else:
+            filename = f"Profil_{nama}.pdf"
+
+        target_dir = output_dir
+        if group_by:
+            target_dir = os.path.join(output_dir, safe_filename(data.get(group_by, "-")) or "-")
+
+        # Thumbnail dibuat di worker, bukan di proses utama
+        foto_path = get_photo_path(data, photo_dir, thumbnail=False)
+        jobs.append((data, foto_path, os.path.join(target_dir, filename)))
+    return jobs
+
+
+def render_chunk(jobs):
+    """Render sekumpulan profil di satu worker, kembalikan path yang berhasil dan yang gagal"""
+    return pipeline.write_files((output_path, data, foto_path) for data, foto_path, output_path in jobs)
+
+
+def build_merged_jobs(jobs, output_dir, group_by=None):
+    """Kelompokkan jobs menjadi satu PDF gabungan per folder grup: (profiles, group_by, output_path)"""
+    groups = {}
+    for data, foto_path, output_path in jobs:
+        groups.setdefault(os.path.dirname(output_path), []).append((data, foto_path))
+
+    merged_jobs = []
+    for group_dir, profiles in sorted(groups.items()):
+        if group_by:
+            filename = f"Profil_Gabungan_{os.path.basename(group_dir)}.pdf"
+        else:
+            filename = "Profil_Gabungan.pdf"
+        merged_jobs.append((profiles, group_by, os.path.join(output_dir, filename)))
+    return merged_jobs
+
+
+def render_merged_chunk(merged_jobs):
+    """Render setiap grup menjadi satu PDF gabungan dengan bookmark per NIPP (di bawah grupnya)"""
+    done, failed = [], []
+    for profiles, group_by, output_path in merged_jobs:
+        try:
+            photos = pipeline.prefetch(profiles, lambda profile: get_thumbnail(profile[1]))
+            pdf_bytes = render_merged(((data, thumbnail) for (data, _), thumbnail in photos), group_by=group_by)
+            with open(output_path, "wb") as f:
+                f.write(pdf_bytes)
+            done.append(output_path)
+        except Exception as e:
+            failed.append((output_path, str(e)))
+    return done, failed
+
+
+def split_chunks(jobs, n_chunks):
+    size = max(1, -(-len(jobs) // n_chunks))
+    return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+
+def make_output_dirs(jobs):
+    for output_dir in {os.path.dirname(job[-1]) for job in jobs}:
+        os.makedirs(output_dir, exist_ok=True)
+
+
+def run(jobs, workers, render=render_chunk, chunks_per_worker=4):
+    """Bagi pekerjaan ke beberapa proses dan kumpulkan hasilnya"""
+    make_output_dirs(jobs)
+
+    if workers <= 1:
+        return render(jobs)
+
+    done, failed = [], []
+    # Beberapa chunk per worker supaya beban tetap rata walau panjang profil berbeda
+    chunks = split_chunks(jobs, workers * chunks_per_worker)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            chunk_done, chunk_failed = future.result()
+            done.extend(chunk_done)
+            failed.extend(chunk_failed)
+    return done, failed
+
+
+def run_stream(job_chunks, workers):
+    """
+    Seperti run, tapi setiap chunk langsung dikirim ke worker begitu selesai
+    dibaca. Paling banyak workers * 2 chunk yang menunggu, jadi memori tetap
+    datar berapa pun jumlah baris input.
+    """
+    done, failed = [], []
+    if workers <= 1:
+        for jobs in job_chunks:
+            make_output_dirs(jobs)
+            chunk_done, chunk_failed = render_chunk(jobs)
+            done.extend(chunk_done)
+            failed.extend(chunk_failed)
+        return done, failed
+
+    def collect(futures):
+        for future in futures:
+            chunk_done, chunk_failed = future.result()
+            done.extend(chunk_done)
+            failed.extend(chunk_failed)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for jobs in job_chunks:
+            make_output_dirs(jobs)
+            pending.add(pool.submit(render_chunk, jobs))
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished)
+        collect(as_completed(pending))
+    return done, failed
+
+
+def count_names(path):
+    """Jumlah kemunculan setiap nama di CSV, dibaca per chunk"""
+    counts = Counter()
+    for chunk in iter_talent_csv(path, columns={"NAMA"}):
+        counts.update(clean_talent_data(chunk)["Nama"].dropna())
+    return counts
+
+
+def check_columns(df, group_by=None):
+    """Pesan error kalau kolom wajib tidak ada, atau None"""
+    if "Nama" not in df.columns:
+        return "Kolom 'Nama' wajib ada di file input."
+    if group_by and group_by not in df.columns:
+        return f"Kolom '{group_by}' tidak ditemukan di file input."
+    return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate Talent Profile PDF secara massal")
+    parser.add_argument("inputs", nargs="+", metavar="input",
+                        help="File Excel (.xlsx) atau CSV template talent; beberapa file digabung per NIPP")
+    parser.add_argument("-o", "--output", default="Output_TalentProfile", help="Folder output PDF")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Jumlah proses worker (default: jumlah core CPU)")
+    parser.add_argument("--sheet", help="Nama atau index sheet Excel (default: sheet FORMAT atau yang punya kolom NAMA)")
+    parser.add_argument("--group-by", help="Buat subfolder per nilai kolom ini, misalnya PIC atau LEVEL")
+    parser.add_argument("--photo-dir", action="append",
+                        help="Folder foto talent, boleh diulang (default: semua folder di photo_index.PHOTO_DIRS)")
+    parser.add_argument("--merged", action="store_true",
+                        help="Satu PDF gabungan (per grup kalau --group-by diisi) dengan bookmark per NIPP")
+    parser.add_argument("--force", action="store_true",
+                        help="Render ulang semua profil, abaikan manifest output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sheet = int(args.sheet) if args.sheet and args.sheet.isdigit() else args.sheet
+
+    start = time.perf_counter()
+    manifest = None if args.merged else Manifest(args.output, reset=args.force)
+    pending = {}
+
+    def skip_unchanged(jobs):
+        if manifest is None:
+            return jobs
+        todo, chunk_pending = manifest.plan(jobs)
+        pending.update(chunk_pending)
+        return todo
+
+    if len(args.inputs) == 1 and args.inputs[0].lower().endswith(".csv") and not args.merged:
+        path = args.inputs[0]
+        # CSV dibaca per chunk dan langsung dirender; tidak pernah dimuat utuh
+        frames = (clean_talent_data(chunk) for chunk in iter_talent_csv(path))
+        first = next(frames, None)
+        if first is None:
+            print("File input kosong.", file=sys.stderr)
+            return 1
+        error = check_columns(first, args.group_by)
+        if error:
+            print(error, file=sys.stderr)
+            return 1
+
+        name_counts = count_names(path)
+        job_chunks = (
+            skip_unchanged(build_jobs(df, args.output, group_by=args.group_by,
+                                      photo_dir=args.photo_dir, name_counts=name_counts))
+            for df in itertools.chain([first], frames)
+        )
+        print(f"{sum(name_counts.values())} profil akan dibuat dengan {args.workers} worker...")
+        done, failed = run_stream((jobs for jobs in job_chunks if jobs), args.workers)
+    else:
+        if len(args.inputs) == 1:
+            df = clean_talent_data(read_talent_file(args.inputs[0], sheet_name=sheet))
+        else:
+            df, conflicts = load_merged(args.inputs, sheet, args.workers)
+            print_conflicts(conflicts)
+        error = check_columns(df, args.group_by)
+        if error:
+            print(error, file=sys.stderr)
+            return 1
+
+        if args.merged and args.group_by:
+            df = df.sort_values(args.group_by, kind="stable")
+        jobs = build_jobs(df, args.output, group_by=args.group_by, photo_dir=args.photo_dir)
+        print(f"{len(jobs)} profil akan dibuat dengan {args.workers} worker...")
+        if args.merged:
+            merged_jobs = build_merged_jobs(jobs, args.output, group_by=args.group_by)
+            done, failed = run(merged_jobs, args.workers, render=render_merged_chunk, chunks_per_worker=1)
+        else:
+            done, failed = run(skip_unchanged(jobs), args.workers)
+
+    elapsed = time.perf_counter() - start
+    print(f"Selesai: {len(done)} PDF di '{args.output}' dalam {elapsed:.1f} detik")
+    if manifest is not None:
+        for path in done:
+            manifest.record(*pending[path], path)
+        removed = manifest.prune()
+        manifest.save()
+        print(f"{manifest.unchanged} profil tidak berubah dilewati, {removed} PDF lama dihapus")
+        if manifest.duplicates:
+            print(f"{manifest.duplicates} baris memakai NIPP yang sudah muncul; dicatat per file output")
+    for path, error in failed:
+        print(f"Gagal: {path} ({error})", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
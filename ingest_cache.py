@@ -0,0 +1,132 @@
+"""
+Cache data talent yang sudah dibersihkan, dengan kunci hash isi file upload
+
+Streamlit menjalankan ulang script pada setiap klik, sehingga tanpa cache
+file Excel di-parse ulang oleh openpyxl setiap kali. Di sini hasil
+pembersihan disimpan:
+
+- di memori, satu DataFrame per isi file dan dipakai bersama semua sesi
+  (anggap read-only, copy() dulu kalau perlu mengubah)
+- sebagai file Parquet di .cache/ingest supaya tetap ada setelah restart
+
+Naikkan INGEST_VERSION kalau hasil pembersihan berubah (misalnya
+RENAME_DICT atau format tanggal), supaya cache lama tidak terpakai.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import timing
+from talent_data import SOURCE_COLUMNS, clean_talent_data, read_talent_file
+
+INGEST_CACHE_DIR = os.environ.get("TALENT_INGEST_CACHE", os.path.join(".cache", "ingest"))
+INGEST_VERSION = 5
+MAX_MEMORY_ENTRIES = 8
+
+_frames = OrderedDict()
+_lock = threading.Lock()
+
+
+def file_digest(data):
+    """SHA-256 dari isi file upload"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_path(digest, namespace="talent", cache_dir=None):
+    """Path file Parquet untuk satu isi file dan satu cara pembersihan"""
+    cache_dir = cache_dir or INGEST_CACHE_DIR
+    return os.path.join(cache_dir, namespace, f"v{INGEST_VERSION}-{digest}.parquet")
+
+
+def _to_columnar(df):
+    """
+    Kolom object campuran (angka dan teks) dijadikan teks supaya bisa disimpan
+    sebagai Parquet. Nilai kosong tetap NaN, jadi tampilan di PDF tidak berubah.
+    """
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        values = df[col]
+        if not values.map(lambda v: isinstance(v, str) or pd.isna(v)).all():
+            df[col] = values.map(lambda v: v if isinstance(v, str) or pd.isna(v) else str(v))
+    return df
+
+
+@timing.timed("parquet_read")
+def _read_parquet(path):
+    df = pd.read_parquet(path)
+    # Parquet mengembalikan None untuk nilai kosong di kolom teks, samakan dengan NaN
+    obj_cols = df.columns[df.dtypes == object]
+    df[obj_cols] = df[obj_cols].where(df[obj_cols].notna(), float("nan"))
+    return df
+
+
+@timing.timed("parquet_write")
+def _write_parquet(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        # pyarrow tidak ada atau kolom tidak bisa disimpan: cukup cache memori
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _remember(key, df):
+    with _lock:
+        _frames[key] = df
+        _frames.move_to_end(key)
+        while len(_frames) > MAX_MEMORY_ENTRIES:
+            _frames.popitem(last=False)
+
+
+def load_cleaned(data, filename="upload.xlsx", clean=clean_talent_data, namespace="talent",
+                 columns=SOURCE_COLUMNS, cache_dir=None):
+    """
+    DataFrame hasil clean(read_talent_file(...)) untuk isi file data (bytes).
+
+    Upload ulang file yang sama cukup menghitung hash. Nama kolom asli file
+    tersedia di df.attrs["source_columns"].
+
+    Args:
+        data: Isi file upload (bytes)
+        filename: Nama file asli, dipakai untuk membedakan CSV dan Excel
+        clean: Fungsi pembersihan DataFrame mentah
+        namespace: Nama cache; bedakan per fungsi clean
+        columns: Kolom sumber yang dibaca (None untuk semua kolom)
+    """
+    digest = file_digest(data)
+    key = (namespace, digest)
+    with _lock:
+        if key in _frames:
+            _frames.move_to_end(key)
+            return _frames[key]
+
+    path = cache_path(digest, namespace, cache_dir)
+    if os.path.exists(path):
+        try:
+            df = _read_parquet(path)
+            _remember(key, df)
+            return df
+        except Exception:
+            pass
+
+    raw = read_talent_file(io.BytesIO(data), filename=filename, columns=columns)
+    source_columns = [str(col).strip().upper() for col in raw.attrs.get("source_columns", raw.columns)]
+    df = _to_columnar(clean(raw))
+    df.attrs["source_columns"] = source_columns
+    _write_parquet(df, path)
+    _remember(key, df)
+    return df
+
+
+def clear_memory():
+    """Kosongkan cache memori (file Parquet tidak dihapus)"""
+    with _lock:
+        _frames.clear()
@@ -0,0 +1,274 @@
+"""
+Job generate PDF di background untuk app Streamlit
+
+Setiap batch dijalankan oleh satu thread koordinator yang mengirim profil
+ke process pool bersama milik proses server. Tiap job hanya boleh punya
+JOB_WORKERS profil yang sedang dirender, jadi beberapa pengguna yang
+membuat paket bersamaan mendapat giliran bergantian, bukan antre di
+belakang job pertama. Kalau worker pool mati (misalnya kehabisan memori),
+pool diganti dan profil yang terkena dikirim ulang sekali.
+
+Koordinator diambil dari thread pool berukuran JOB_CONCURRENCY. Job PDF
+gabungan dan job cProfile merender di thread koordinator itu sendiri (di
+proses server), jadi paling banyak JOB_CONCURRENCY job yang berjalan
+bersamaan; job berikutnya berstatus "queued" sampai ada koordinator kosong.
+
+Job yang direkam cProfile dirender di thread job sendiri lewat pipeline.py:
+foto disiapkan dan ZIP ditulis di thread terpisah selagi profil dirender.
+Job PDF gabungan juga menyiapkan foto berikutnya di thread pembaca.
+
+Status job disimpan di memori proses (dipakai bersama semua sesi) dan
+hasilnya ditulis ke .cache/jobs, dihapus JOB_TTL detik setelah selesai.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pipeline
+import timing
+from custom_pdf import render_merged, render_profile
+from photo_cache import get_thumbnail
+
+JOB_DIR = os.environ.get("TALENT_JOB_DIR", os.path.join(".cache", "jobs"))
+JOB_WORKERS = int(os.environ.get("TALENT_JOB_WORKERS", os.cpu_count() or 1))
+JOB_CONCURRENCY = int(os.environ.get("TALENT_JOB_CONCURRENCY", 2))
+JOB_TTL = 60 * 60
+
+_jobs = {}
+_lock = threading.Lock()
+_pool = None
+_coordinators = None
+
+
+class BatchJob:
+    """Status satu job batch; dibaca halaman Streamlit, ditulis thread koordinator"""
+
+    def __init__(self, total, file_name, mime, profile=False):
+        self.id = uuid.uuid4().hex
+        self.total = total
+        self.file_name = file_name
+        self.mime = mime
+        self.status = "queued"
+        self.done = 0
+        self.errors = []
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.output_path = os.path.join(JOB_DIR, self.id + os.path.splitext(file_name)[1])
+        self.profile = profile
+        self.timings = None
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def rate(self):
+        """Profil per detik sejak job mulai"""
+        if not self.started or not self.done:
+            return 0.0
+        return self.done / ((self.finished or time.time()) - self.started)
+
+    @property
+    def is_finished(self):
+        return self.status in ("done", "failed")
+
+    def open_output(self):
+        """File hasil yang terbuka untuk dibaca (untuk st.download_button)"""
+        return open(self.output_path, "rb")
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # spawn: fork dari server Streamlit yang multi-thread tidak aman
+            _pool = ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(broken):
+    """Ganti pool yang rusak (worker mati) dengan pool baru"""
+    global _pool
+    with _lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+    return _get_pool()
+
+
+def _get_coordinators():
+    global _coordinators
+    with _lock:
+        if _coordinators is None:
+            _coordinators = ThreadPoolExecutor(max_workers=JOB_CONCURRENCY, thread_name_prefix="batch-job")
+        return _coordinators
+
+
+def render_item(data, foto_path):
+    """Dijalankan di worker: thumbnail foto lalu render satu profil, beserta waktu per stage"""
+    with timing.collect("render_item", log=False) as timings:
+        pdf_bytes = render_profile(data, get_thumbnail(foto_path))
+    return pdf_bytes, timings.as_dict()["stages"]
+
+
+def _run_zip_pipeline(job, items, tmp_path):
+    # Dipakai saat job direkam cProfile: render di thread ini supaya ikut terekam
+    def on_profile(arcname, error):
+        if error is not None:
+            job.errors.append((arcname, str(error)))
+        job.done += 1
+
+    with open(tmp_path, "wb") as f:
+        pipeline.write_zip(f, items, progress=on_profile)
+
+
+def _run_zip_pool(job, items, tmp_path):
+    pool = _get_pool()
+
+    def submit(data, foto_path, broken=None):
+        # Worker mati (misalnya kehabisan memori pada foto besar): pool lama tidak bisa
+        # dipakai lagi oleh siapa pun, jadi diganti sekali lalu profil dikirim ulang
+        nonlocal pool
+        if broken is not None and pool is broken:
+            pool = _reset_pool(broken)
+        try:
+            return pool, pool.submit(render_item, data, foto_path)
+        except BrokenProcessPool:
+            if broken is not None:
+                raise
+            return submit(data, foto_path, pool)
+
+    with open(tmp_path, "wb") as f, zipfile.ZipFile(f, "w", compression=zipfile.ZIP_STORED) as zipf:
+        pending = deque()
+
+        def write_oldest():
+            arcname, data, foto_path, used, future = pending.popleft()
+            try:
+                try:
+                    pdf_bytes, stages = future.result()
+                except BrokenProcessPool:
+                    pdf_bytes, stages = submit(data, foto_path, used)[1].result()
+                job.timings.merge(stages)
+                with timing.stage("zip_write"):
+                    zipf.writestr(arcname, pdf_bytes)
+            except Exception as e:
+                job.errors.append((arcname, str(e)))
+            job.done += 1
+
+        for arcname, data, foto_path in items:
+            pending.append((arcname, data, foto_path, *submit(data, foto_path)))
+            if len(pending) >= JOB_WORKERS:
+                write_oldest()
+        while pending:
+            write_oldest()
+
+
+def _write_output(job, write):
+    """write(tmp_path) lalu pindahkan ke output_path, supaya file setengah jadi tidak pernah diunduh"""
+    tmp_path = job.output_path + ".tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, job.output_path)
+    except BaseException:
+        # cleanup_jobs hanya menghapus output_path; file .tmp yang setengah jadi dibuang di sini
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _run_zip(job, items):
+    run = _run_zip_pipeline if job.profile else _run_zip_pool
+    _write_output(job, lambda tmp_path: run(job, items, tmp_path))
+
+
+def _run_merged(job, profiles, group_by):
+    def on_profile(_):
+        job.done += 1
+
+    def write(tmp_path):
+        photos = pipeline.prefetch(profiles, lambda profile: get_thumbnail(profile[1]))
+        pdf_bytes = render_merged(
+            ((data, thumbnail) for (data, _), thumbnail in photos),
+            group_by=group_by, progress=on_profile,
+        )
+        with open(tmp_path, "wb") as f:
+            f.write(pdf_bytes)
+
+    _write_output(job, write)
+
+
+def _start(job, target, *args):
+    os.makedirs(JOB_DIR, exist_ok=True)
+    cleanup_jobs()
+    with _lock:
+        _jobs[job.id] = job
+
+    def run():
+        job.status = "running"
+        job.started = time.time()
+        status = "failed"
+        with timing.collect(f"job.{target.__name__.lstrip('_')}", profile=job.profile,
+                            profiles=job.total, file_name=job.file_name) as timings:
+            job.timings = timings
+            try:
+                target(job, *args)
+                status = "done"
+            except Exception as e:
+                job.error = str(e)
+        job.finished = time.time()
+        # Status diisi terakhir supaya halaman tidak melihat job selesai tanpa waktu selesai
+        job.status = status
+
+    _get_coordinators().submit(run)
+    return job
+
+
+def submit_zip(items, file_name, profile=False):
+    """
+    Mulai job ZIP berisi satu PDF per profil.
+
+    Args:
+        items: List berisi (nama_file_di_zip, data, foto_path asli)
+        file_name: Nama file ZIP untuk diunduh
+        profile: Rekam cProfile; profil dirender di thread job, bukan di pool
+    """
+    items = list(items)
+    return _start(BatchJob(len(items), file_name, "application/zip", profile), _run_zip, items)
+
+
+def submit_merged(profiles, file_name, group_by=None, profile=False):
+    """
+    Mulai job satu PDF gabungan dengan bookmark per NIPP.
+
+    Args:
+        profiles: List berisi (data, foto_path asli)
+        profile: Rekam cProfile untuk job ini
+    """
+    profiles = list(profiles)
+    return _start(BatchJob(len(profiles), file_name, "application/pdf", profile), _run_merged, profiles, group_by)
+
+
+def get_job(job_id):
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def cleanup_jobs(ttl=JOB_TTL):
+    """Hapus job yang sudah selesai lebih dari ttl detik beserta file hasilnya"""
+    now = time.time()
+    with _lock:
+        expired = [job for job in _jobs.values() if job.finished and now - job.finished > ttl]
+        for job in expired:
+            del _jobs[job.id]
+    for job in expired:
+        if os.path.exists(job.output_path):
+            os.remove(job.output_path)
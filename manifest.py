@@ -0,0 +1,145 @@
+"""
+Manifest fingerprint per NIPP untuk regenerasi PDF secara incremental
+
+Setiap folder output menyimpan .manifest.json berisi fingerprint tiap
+profil: isi baris yang sudah dibersihkan, isi file foto, dan versi
+renderer. Saat generate ulang, hanya baris yang fingerprint-nya berubah
+yang dirender; PDF milik baris yang hilang dari file input dihapus.
+"""
+
+import hashlib
+import json
+import os
+
+import fpdf
+
+from custom_pdf import RENDERER_VERSION
+from photo_cache import JPEG_QUALITY, PHOTO_DPI
+from talent_data import normalize_nipp
+
+MANIFEST_NAME = ".manifest.json"
+
+# Versi layout, fpdf dan pengaturan thumbnail; berubah berarti semua dirender ulang
+RENDERER = f"{RENDERER_VERSION}/fpdf-{fpdf.FPDF_VERSION}/foto-{PHOTO_DPI}dpi-q{JPEG_QUALITY}"
+
+
+def _json_default(value):
+    # NaN, Timestamp dan tipe numpy disimpan sebagai teks
+    return str(value)
+
+
+class Manifest:
+    def __init__(self, output_dir, reset=False):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = {}
+        self.photos = {}
+        if not reset and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+            self.entries = saved.get("profiles", {})
+            self.photos = saved.get("photos", {})
+        self.seen = set()
+        self.in_use = set()
+        self.unchanged = 0
+        self.duplicates = 0
+
+    @property
+    def renderer(self):
+        return RENDERER
+
+    def photo_digest(self, foto_path):
+        """SHA-1 isi foto; di-cache per (mtime, ukuran) supaya foto tidak dibaca ulang"""
+        if not foto_path:
+            return ""
+        stat = os.stat(foto_path)
+        key = os.path.abspath(foto_path)
+        cached = self.photos.get(key)
+        if cached and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return cached[2]
+        with open(foto_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        self.photos[key] = [stat.st_mtime_ns, stat.st_size, digest]
+        return digest
+
+    def fingerprint(self, data, foto_path):
+        """Fingerprint isi baris + foto + versi renderer"""
+        row = json.dumps(data, sort_keys=True, ensure_ascii=False, default=_json_default)
+        content = "\n".join([self.renderer, row, self.photo_digest(foto_path)])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def key(self, data, output_path):
+        """
+        NIPP sebagai kunci; path output kalau NIPP kosong.
+
+        NIPP yang muncul lagi di input yang sama (baris duplikat sengaja
+        dipertahankan, lihat merge_sources) memakai NIPP + path output, supaya
+        kedua baris punya entri sendiri dan tidak saling menimpa.
+        """
+        nipp = normalize_nipp(data.get("NIPP"))
+        if not nipp:
+            return self._relpath(output_path)
+        if nipp in self.seen:
+            self.duplicates += 1
+            return f"{nipp}|{self._relpath(output_path)}"
+        return nipp
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.output_dir)
+
+    def plan(self, jobs):
+        """
+        Pisahkan jobs (data, foto_path, output_path) yang perlu dirender.
+
+        Returns:
+            (jobs yang harus dirender, dict output_path -> (kunci, fingerprint))
+        """
+        todo, pending = [], {}
+        for data, foto_path, output_path in jobs:
+            key = self.key(data, output_path)
+            fingerprint = self.fingerprint(data, foto_path)
+            self.seen.add(key)
+            self.in_use.add(self._relpath(output_path))
+            entry = self.entries.get(key)
+            current = (
+                entry is not None
+                and entry["fingerprint"] == fingerprint
+                and entry["output"] == self._relpath(output_path)
+                and os.path.exists(output_path)
+            )
+            if current:
+                self.unchanged += 1
+            else:
+                todo.append((data, foto_path, output_path))
+                pending[output_path] = (key, fingerprint)
+        return todo, pending
+
+    def record(self, key, fingerprint, output_path):
+        old = self.entries.get(key)
+        new_output = self._relpath(output_path)
+        # Nama atau grup berubah: PDF lama tidak dipakai lagi
+        if old and old["output"] != new_output:
+            self._remove(old["output"])
+        self.entries[key] = {"fingerprint": fingerprint, "output": new_output}
+
+    def prune(self):
+        """Hapus PDF dan entri untuk kunci yang tidak muncul di input; kembalikan jumlahnya"""
+        gone = [key for key in self.entries if key not in self.seen]
+        for key in gone:
+            self._remove(self.entries.pop(key)["output"])
+        return len(gone)
+
+    def _remove(self, relpath):
+        if relpath in self.in_use:
+            # Sudah jadi output profil lain di run ini
+            return
+        path = os.path.join(self.output_dir, relpath)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"renderer": self.renderer, "profiles": self.entries, "photos": self.photos}, f, indent=1)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,231 @@
+"""
+Gabungkan beberapa workbook talent (per PIC atau per batch) menjadi satu data
+
+Setiap file dibaca dan dibersihkan sendiri-sendiri secara paralel, jadi
+header yang berbeda antar file (urutan kolom, kolom tambahan, variasi
+penulisan di HEADER_ALIASES) sudah seragam sebelum digabung. Baris digabung
+per NIPP:
+
+- NIPP yang ada di beberapa file: baris dari file yang lebih baru menang.
+  Kolom yang tidak ada di file baru tetap diambil dari file lama.
+- Setiap nilai yang berbeda dicatat sebagai konflik (CONFLICT_COLUMNS).
+- Baris tanpa NIPP dan NIPP kembar di dalam satu file tidak digabung,
+  sama seperti kalau file itu dibaca sendirian.
+
+"Lebih baru" berarti lebih belakang di urutan sources. Dari command line
+file diurutkan menurut waktu modifikasi (urutan argumen kalau sama); di
+aplikasi Streamlit menurut urutan upload.
+
+Contoh:
+    python merge_sources.py "Talent Profile D6 REVISI.xlsx" "Talent Profile D6 khusus.xlsx" -o gabungan.xlsx
+    python merge_sources.py data/*.xlsx --conflicts konflik.xlsx
+"""
+
+import argparse
+import io
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+import timing
+from ingest_cache import load_cleaned
+from talent_data import clean_talent_data, normalize_nipp, read_talent_file
+
+MERGE_WORKERS = int(os.environ.get("TALENT_MERGE_WORKERS", min(4, os.cpu_count() or 1)))
+
+CONFLICT_COLUMNS = ["NIPP", "Nama", "kolom", "nilai lama", "nilai baru", "file lama", "file baru"]
+# Jumlah konflik yang dicetak ke layar; selengkapnya lewat --conflicts
+PRINT_LIMIT = 20
+
+
+def _read_path(path, sheet_name=None):
+    return clean_talent_data(read_talent_file(path, sheet_name=sheet_name))
+
+
+def read_sources(paths, sheet_name=None, workers=MERGE_WORKERS):
+    """
+    Baca dan bersihkan beberapa file dari disk, satu proses per file.
+
+    Returns:
+        List (nama file, DataFrame) dengan urutan sama seperti paths
+    """
+    paths = list(paths)
+    if workers <= 1 or len(paths) <= 1:
+        frames = [_read_path(path, sheet_name) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            frames = list(pool.map(_read_path, paths, [sheet_name] * len(paths)))
+    return [(os.path.basename(path), df) for path, df in zip(paths, frames)]
+
+
+def load_uploads(files, workers=MERGE_WORKERS, **kwargs):
+    """
+    load_cleaned untuk beberapa file upload sekaligus, satu thread per file.
+
+    files berisi (nama file, isi bytes); kwargs diteruskan ke load_cleaned.
+    File yang sudah pernah diupload langsung diambil dari cache.
+    """
+    files = list(files)
+    timings = timing.current()
+
+    def load(item):
+        filename, data = item
+        with timing.attach(timings):
+            return filename, load_cleaned(data, filename, **kwargs)
+
+    if workers <= 1 or len(files) <= 1:
+        return [load(item) for item in files]
+    with ThreadPoolExecutor(max_workers=min(workers, len(files)), thread_name_prefix="ingest") as pool:
+        return list(pool.map(load, files))
+
+
+def _cell_text(value):
+    """Nilai sel untuk dibandingkan: kosong, 12.0 dan "12" dianggap sama dengan versi rapinya"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return " ".join(str(value).split())
+
+
+@timing.timed("merge")
+def merge_frames(sources, key="NIPP", name_column="Nama"):
+    """
+    Gabungkan DataFrame hasil pembersihan, file lama dulu lalu yang lebih baru.
+
+    Args:
+        sources: List (nama file, DataFrame) urut dari yang paling lama
+        key: Kolom NIPP untuk mencocokkan baris antar file
+        name_column: Kolom nama untuk laporan konflik
+
+    Returns:
+        (DataFrame gabungan, DataFrame konflik dengan CONFLICT_COLUMNS).
+        attrs["source_columns"] berisi gabungan header asli semua file dan
+        attrs["sources"] jumlah baris per file.
+    """
+    columns, source_columns = [], []
+    records, owners = [], []
+    positions = {}
+    conflicts = []
+
+    for source, df in sources:
+        columns.extend(col for col in df.columns if col not in columns)
+        source_columns.extend(col for col in df.attrs.get("source_columns", []) if col not in source_columns)
+        seen = set()
+        has_key = key in df.columns
+        for data in df.to_dict("records"):
+            nipp = normalize_nipp(data.get(key)) if has_key else ""
+            position = positions.get(nipp) if nipp and nipp not in seen else None
+            if nipp:
+                seen.add(nipp)
+            if position is None:
+                if nipp and nipp not in positions:
+                    positions[nipp] = len(records)
+                records.append(data)
+                owners.append(source)
+                continue
+
+            old = records[position]
+            for col, value in data.items():
+                if col in old and _cell_text(old[col]) != _cell_text(value):
+                    conflicts.append((nipp, data.get(name_column, old.get(name_column)), col,
+                                      old[col], value, owners[position], source))
+            old.update(data)
+            owners[position] = source
+
+    # dtype object: NIPP tetap int walau file lain tanpa NIPP (bukan 47172.0),
+    # jadi fingerprint manifest sama dengan kalau file dibaca sendirian
+    merged = pd.DataFrame(records, columns=columns, dtype=object)
+    merged.attrs["source_columns"] = source_columns
+    merged.attrs["sources"] = {source: len(df) for source, df in sources}
+    return merged, pd.DataFrame(conflicts, columns=CONFLICT_COLUMNS)
+
+
+def by_mtime(paths):
+    """Urutkan path dari yang paling lama diubah; urutan argumen kalau waktunya sama"""
+    return sorted(paths, key=os.path.getmtime)
+
+
+def load_merged(paths, sheet_name=None, workers=MERGE_WORKERS):
+    """read_sources + merge_frames untuk path di disk, file terbaru menang"""
+    return merge_frames(read_sources(by_mtime(paths), sheet_name, workers))
+
+
+def load_uploaded(files, name_column="Nama", workers=MERGE_WORKERS, **kwargs):
+    """
+    Data untuk satu atau beberapa file upload (urut dari yang paling lama).
+
+    Satu file dikembalikan apa adanya dari load_cleaned; beberapa file
+    digabung dengan merge_frames. kwargs diteruskan ke load_cleaned.
+
+    Returns:
+        (DataFrame, DataFrame konflik)
+    """
+    sources = load_uploads(((f.name, f.getvalue()) for f in files), workers, **kwargs)
+    if len(sources) == 1:
+        return sources[0][1], pd.DataFrame(columns=CONFLICT_COLUMNS)
+    return merge_frames(sources, name_column=name_column)
+
+
+def print_conflicts(conflicts, file=sys.stderr):
+    if conflicts.empty:
+        return
+    # Satu baris per NIPP; nilai lengkapnya (sering multi-baris) ada di --conflicts
+    groups = conflicts.groupby(["NIPP", "file lama", "file baru"], sort=False)
+    print(f"{conflicts['NIPP'].nunique()} NIPP berbeda antar file ({len(conflicts)} nilai), "
+          "dipakai nilai dari file yang lebih baru:", file=file)
+    for (nipp, old_file, new_file), group in itertools.islice(groups, PRINT_LIMIT):
+        print(f"  - {nipp} {group['Nama'].iloc[0]} | {', '.join(group['kolom'])} ({old_file} -> {new_file})",
+              file=file)
+    if groups.ngroups > PRINT_LIMIT:
+        print(f"  ... dan {groups.ngroups - PRINT_LIMIT} lainnya", file=file)
+
+
+def save_table(df, path):
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+
+def to_excel_bytes(df):
+    """Isi file .xlsx untuk tombol download"""
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gabungkan beberapa file talent berdasarkan NIPP")
+    parser.add_argument("inputs", nargs="+", help="File Excel (.xlsx) atau CSV template talent")
+    parser.add_argument("-o", "--output", help="Simpan data gabungan ke file .xlsx atau .csv")
+    parser.add_argument("--conflicts", help="Simpan daftar konflik ke file .xlsx atau .csv")
+    parser.add_argument("--sheet", help="Nama atau index sheet Excel")
+    parser.add_argument("-j", "--workers", type=int, default=MERGE_WORKERS, help="Jumlah proses pembaca file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sheet = int(args.sheet) if args.sheet and args.sheet.isdigit() else args.sheet
+
+    merged, conflicts = load_merged(args.inputs, sheet, args.workers)
+    for source, rows in merged.attrs["sources"].items():
+        print(f"{source}: {rows} baris")
+    print(f"Gabungan: {len(merged)} baris, {len(conflicts)} konflik")
+    print_conflicts(conflicts, file=sys.stdout)
+
+    if args.output:
+        save_table(merged, args.output)
+        print(f"\nData gabungan disimpan ke {args.output}")
+    if args.conflicts:
+        save_table(conflicts, args.conflicts)
+        print(f"Konflik disimpan ke {args.conflicts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
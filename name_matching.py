@@ -0,0 +1,233 @@
+"""
+Deteksi nama kembar dan nama mirip (varian ejaan) dengan blocking
+
+Nama dinormalisasi dulu ("MOH." / "MUH" / "MOCHAMAD" -> "MUHAMMAD", titik
+inisial dibuang), lalu hanya pasangan yang berbagi kunci blocking yang
+dibandingkan: kode fonetik setiap token nama, dan kode fonetik token
+pertama + terakhir. Pasangan diberi skor 0..1; nama yang hanya berbeda
+ejaan ("DJ"/"J", "OE"/"U", "SUPRIYADI"/"SUPRIADI") atau inisial dianggap
+sangat mirip. Kunci yang terlalu umum
+(misalnya kode "MUHAMMAD") dilewati supaya jumlah pasangan tidak meledak,
+jadi tidak ada perbandingan O(n²).
+
+Contoh:
+    python name_matching.py "Template_Talent Profile 28 Jul - 8 Aug(FORMAT).csv"
+    python name_matching.py "Talent Profile D6 REVISI.xlsx" --threshold 0.9 --report nama_mirip.xlsx
+"""
+
+import argparse
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+import pandas as pd
+
+from talent_data import clean_talent_data, normalize_nipp, read_talent_file
+
+# Varian penulisan nama depan yang dianggap sama
+NAME_VARIANTS = {
+    "MUHAMMAD": {"MOH", "MOHD", "MOCH", "MUH", "MUHD", "MOHAMAD", "MOHAMMAD", "MOHAMMED",
+                 "MOCHAMAD", "MOCHAMMAD", "MUCHAMAD", "MUCHAMMAD", "MUHAMAD", "M"},
+    "ABDUL": {"ABD"},
+}
+_VARIANTS = {variant: name for name, variants in NAME_VARIANTS.items() for variant in variants}
+
+# Pasangan dengan skor di bawah ini tidak dilaporkan
+DEFAULT_THRESHOLD = 0.93
+# Skor untuk nama yang hanya berbeda ejaan (spelling_key) atau inisial
+PHONETIC_MATCH_SCORE = 0.95
+# Blok lebih besar dari ini dianggap kunci umum dan dilewati
+MAX_BLOCK_SIZE = 50
+
+REPORT_COLUMNS = ["cluster", "skor", "NIPP", "Nama", "Nama normal", "PIC"]
+
+
+def name_tokens(name):
+    """Token nama huruf besar tanpa aksen dan tanda baca, varian belum diseragamkan"""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Z ]", " ", text.upper()).split()
+
+
+def normalize_token(token):
+    """Satu token dari name_tokens dengan varian diseragamkan: "MOCH" -> "MUHAMMAD" """
+    return _VARIANTS.get(token, token)
+
+
+def normalize_name(name):
+    """Nama huruf besar tanpa aksen dan tanda baca, dengan varian MUHAMMAD dsb. diseragamkan"""
+    return " ".join(normalize_token(token) for token in name_tokens(name))
+
+
+# Ejaan lama dan variasi ejaan yang umum di nama Indonesia
+_SPELLING = [
+    (r"DJ", "J"), (r"TJ", "C"), (r"SJ", "SY"), (r"OE", "U"), (r"CH", "K"), (r"KH", "H"),
+    (r"PH", "F"), (r"TH", "T"), (r"Q", "K"), (r"V", "F"), (r"(?<=[AIUEO])Y(?=[AIUEO])", ""),
+    (r"Y", "I"), (r"AI|AE", "E"), (r"(.)\1+", r"\1"),
+]
+
+
+@lru_cache(maxsize=None)
+def spelling_key(token):
+    """Token dengan variasi ejaan diseragamkan: SUPRIYADI -> SUPRIADI, ZAINAL -> ZENAL"""
+    for pattern, replacement in _SPELLING:
+        token = re.sub(pattern, replacement, token)
+    return token
+
+
+@lru_cache(maxsize=None)
+def phonetic_key(token):
+    """Kode kasar untuk blocking: huruf pertama + konsonan dari spelling_key"""
+    token = spelling_key(token)
+    return token[:1] + re.sub(r"[AIUEOH]", "", token[1:])
+
+
+def blocking_keys(normalized):
+    tokens = normalized.split()
+    if not tokens:
+        return set()
+    codes = [phonetic_key(token) for token in tokens]
+    keys = {"T:" + code for token, code in zip(tokens, codes) if len(token) > 2}
+    keys.add("FL:" + codes[0] + "|" + codes[-1])
+    return keys
+
+
+def _spelling_tokens(name):
+    # Inisial satu huruf ("USEP P. SUHERMAN") tidak ikut dibandingkan
+    return sorted(spelling_key(token) for token in name.split() if len(token) > 1)
+
+
+def _ratio(a, b, threshold):
+    # quick_ratio adalah batas atas ratio dan jauh lebih murah
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+
+def name_score(a, b, threshold=0.0):
+    """
+    Kemiripan 0..1 dari dua nama yang sudah dinormalisasi; urutan token diabaikan.
+    Skor di bawah threshold boleh dikembalikan sebagai 0.
+    """
+    if a == b:
+        return 1.0
+    if _spelling_tokens(a) == _spelling_tokens(b):
+        return PHONETIC_MATCH_SCORE
+    direct = _ratio(a, b, threshold)
+    ordered = _ratio(" ".join(sorted(a.split())), " ".join(sorted(b.split())), threshold)
+    return max(direct, ordered)
+
+
+def candidate_pairs(names):
+    """Pasangan (a, b) nama unik yang berbagi minimal satu kunci blocking"""
+    blocks = defaultdict(list)
+    for name in names:
+        for key in blocking_keys(name):
+            blocks[key].append(name)
+
+    pairs = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                pairs.add((a, b) if a < b else (b, a))
+    return pairs
+
+
+def find_clusters(df, threshold=DEFAULT_THRESHOLD):
+    """
+    Kelompok baris dengan nama sama atau mirip.
+
+    Returns:
+        DataFrame REPORT_COLUMNS, satu baris per talent, diurutkan per cluster.
+        Skor adalah kemiripan tertinggi nama itu dengan anggota lain cluster.
+    """
+    df = df[df["Nama"].notna()]
+    normalized = df["Nama"].map(normalize_name)
+    rows_by_name = defaultdict(list)
+    for label, name in normalized.items():
+        rows_by_name[name].append(label)
+
+    # Union-find di atas nama unik
+    parent = {name: name for name in rows_by_name}
+    best = defaultdict(float)
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    for name, labels in rows_by_name.items():
+        if len(labels) > 1:
+            best[name] = 1.0
+    for a, b in candidate_pairs(rows_by_name):
+        score = name_score(a, b, threshold)
+        if score >= threshold:
+            parent[find(a)] = find(b)
+            best[a] = max(best[a], score)
+            best[b] = max(best[b], score)
+
+    clusters = defaultdict(list)
+    for name in rows_by_name:
+        clusters[find(name)].append(name)
+
+    records, labels = [], []
+    groups = [sorted(members) for members in clusters.values()
+              if sum(len(rows_by_name[name]) for name in members) > 1]
+    for cluster, members in enumerate(sorted(groups), start=1):
+        for name in members:
+            for label in rows_by_name[name]:
+                records.append((cluster, round(best[name], 3), name))
+                labels.append(label)
+
+    rows = df.loc[labels]
+    report = pd.DataFrame(records, columns=["cluster", "skor", "Nama normal"])
+    report["NIPP"] = rows["NIPP"].map(normalize_nipp).values if "NIPP" in rows else ""
+    report["Nama"] = rows["Nama"].values
+    report["PIC"] = rows["PIC"].values if "PIC" in rows else ""
+    return report[REPORT_COLUMNS]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cari nama kembar dan nama mirip di file talent")
+    parser.add_argument("input", help="File Excel (.xlsx) atau CSV template talent")
+    parser.add_argument("--sheet", help="Nama atau index sheet Excel")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Skor minimal nama dianggap mirip (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--report", help="Simpan hasil ke file .xlsx atau .csv")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sheet = int(args.sheet) if args.sheet and args.sheet.isdigit() else args.sheet
+
+    df = clean_talent_data(read_talent_file(args.input, sheet_name=sheet))
+    if "Nama" not in df.columns:
+        print("Kolom 'Nama' wajib ada di file input.", file=sys.stderr)
+        return 1
+
+    report = find_clusters(df, threshold=args.threshold)
+    print(f"{report['cluster'].nunique()} kelompok nama kembar/mirip ({len(report)} baris)")
+    for cluster, group in report.groupby("cluster"):
+        print(f"\n#{cluster}")
+        for row in group.itertuples(index=False):
+            pic = f" | {row.PIC}" if isinstance(row.PIC, str) and row.PIC else ""
+            print(f"  {row.NIPP:>8} | {row.Nama}{pic} (skor {row.skor:.2f})")
+
+    if args.report:
+        if args.report.lower().endswith(".csv"):
+            report.to_csv(args.report, index=False)
+        else:
+            report.to_excel(args.report, index=False)
+        print(f"\nHasil disimpan ke {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Cache thumbnail foto talent untuk kotak foto 30 x 38 mm di PDF
+
+Foto asli dari kamera di-crop dan diperkecil sekali ke ukuran cetak pada DPI
+tertentu, lalu disimpan di .cache/photos dengan kunci path, mtime dan ukuran
+file sumber. Foto yang berubah otomatis dibuat ulang karena kuncinya berubah.
+
+Warm-up cache untuk satu folder:
+    python photo_cache.py "Foto Talent Profile"
+"""
+
+import hashlib
+import os
+import sys
+import threading
+
+import timing
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow tidak terpasang: pakai foto asli
+    Image = None
+
+PHOTO_CACHE_DIR = os.environ.get("TALENT_PHOTO_CACHE", os.path.join(".cache", "photos"))
+PHOTO_DPI = 200
+PHOTO_SIZE_MM = (30, 38)
+JPEG_QUALITY = 85
+
+
+def thumbnail_size(dpi=PHOTO_DPI):
+    """Ukuran piksel kotak foto di PDF untuk DPI tertentu"""
+    return tuple(int(round(mm / 25.4 * dpi)) for mm in PHOTO_SIZE_MM)
+
+
+def cache_path(src_path, dpi=PHOTO_DPI, cache_dir=PHOTO_CACHE_DIR):
+    """Path thumbnail di cache untuk kondisi file sumber saat ini"""
+    stat = os.stat(src_path)
+    key = f"{os.path.abspath(src_path)}|{stat.st_mtime_ns}|{stat.st_size}|{dpi}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, digest[:2], digest + ".jpg")
+
+
+def make_thumbnail(src_path, dst_path, dpi=PHOTO_DPI):
+    """Crop tengah ke rasio 30:38, perkecil, dan simpan sebagai JPEG RGB"""
+    with Image.open(src_path) as img:
+        img = ImageOps.exif_transpose(img)
+        img = ImageOps.fit(img.convert("RGB"), thumbnail_size(dpi), Image.LANCZOS)
+
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    # Tulis ke file sementara dulu supaya worker lain tidak membaca file setengah jadi;
+    # nama unik per proses dan per thread karena pipeline, jobs dan profile_service
+    # bisa membuat thumbnail yang sama dari beberapa thread sekaligus
+    tmp_path = f"{dst_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        img.save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@timing.timed("thumbnail")
+def get_thumbnail(src_path, dpi=PHOTO_DPI, cache_dir=PHOTO_CACHE_DIR):
+    """
+    Path thumbnail siap pakai untuk CustomPDF.add_profile.
+
+    Kalau Pillow tidak ada atau foto gagal diproses, path asli dikembalikan.
+    """
+    if not src_path or Image is None:
+        return src_path
+    try:
+        dst_path = cache_path(src_path, dpi, cache_dir)
+        if not os.path.exists(dst_path):
+            make_thumbnail(src_path, dst_path, dpi)
+        return dst_path
+    except Exception:
+        return src_path
+
+
+def warm_cache(photo_dir, dpi=PHOTO_DPI, cache_dir=PHOTO_CACHE_DIR):
+    """Buat thumbnail untuk semua foto di folder, kembalikan jumlah foto"""
+    count = 0
+    for name in sorted(os.listdir(photo_dir)):
+        if name.lower().endswith((".jpg", ".jpeg", ".png")):
+            get_thumbnail(os.path.join(photo_dir, name), dpi, cache_dir)
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    folders = sys.argv[1:] or ["Foto Talent Profile"]
+    for folder in folders:
+        print(f"{folder}: {warm_cache(folder)} foto")
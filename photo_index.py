@@ -0,0 +1,150 @@
+"""
+Index foto talent di semua folder foto: nama file (NIPP) -> path foto
+
+Semua folder di PHOTO_DIRS di-scan sekali per proses (termasuk subfolder
+seperti "tambahan foto d6/tambahan foto d6"). Pencocokan tidak membedakan
+huruf besar/kecil dan ekstensi, jadi "40943.jpg" di data tetap ketemu
+sebagai "40943.JPG". Kalau satu NIPP punya foto di beberapa folder, file
+yang paling baru yang dipakai.
+
+Index dipakai bersama semua thread. Paling sering sekali per
+REFRESH_INTERVAL detik mtime folder dicek; kalau ada folder yang berubah
+(file ditambah, dihapus atau diganti nama) index di-scan ulang.
+
+Laporan talent tanpa foto:
+    python photo_index.py "Template_Talent Profile 28 Jul - 8 Aug(FORMAT).csv" --report talent_tanpa_foto.xlsx
+"""
+
+import os
+import sys
+import threading
+import time
+
+PHOTO_DIRS = os.environ.get("TALENT_PHOTO_DIRS", os.pathsep.join(["Foto Talent Profile", "tambahan foto d6"])).split(os.pathsep)
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png")
+REFRESH_INTERVAL = 2.0
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def photo_key(name):
+    """'40943.JPG' / ' 40943 ' -> '40943'"""
+    name = str(name).strip()
+    stem, ext = os.path.splitext(name)
+    return (stem if ext.lower() in PHOTO_EXTENSIONS else name).lower()
+
+
+class PhotoIndex:
+    def __init__(self, photo_dirs):
+        self.photo_dirs = tuple(photo_dirs)
+        self.photos = {}
+        self.files = []
+        self._dir_mtimes = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._scan()
+
+    def _scan(self):
+        photos, files, dir_mtimes = {}, [], {}
+        stack = list(self.photo_dirs)
+        while stack:
+            current = stack.pop()
+            try:
+                dir_mtimes[current] = os.stat(current).st_mtime_ns
+                entries = list(os.scandir(current))
+            except FileNotFoundError:
+                dir_mtimes[current] = None
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(PHOTO_EXTENSIONS):
+                    mtime = entry.stat().st_mtime_ns
+                    files.append(entry.path)
+                    key = photo_key(entry.name)
+                    if key not in photos or mtime > photos[key][0]:
+                        photos[key] = (mtime, entry.path)
+        self.photos = {key: path for key, (_, path) in photos.items()}
+        self.files = sorted(files)
+        self._dir_mtimes = dir_mtimes
+        self._checked = time.monotonic()
+
+    def _changed(self):
+        for path, mtime in self._dir_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except FileNotFoundError:
+                if mtime is not None:
+                    return True
+        return False
+
+    def refresh(self, force=False):
+        """Scan ulang kalau ada folder yang berubah sejak scan terakhir"""
+        with self._lock:
+            if not force and time.monotonic() - self._checked < REFRESH_INTERVAL:
+                return
+            if force or self._changed():
+                self._scan()
+            else:
+                self._checked = time.monotonic()
+
+    def lookup(self, *names):
+        """Path foto untuk nama pertama yang ada di index (nama file atau NIPP), atau None"""
+        self.refresh()
+        for name in names:
+            if name is None or name != name:  # None atau NaN
+                continue
+            path = self.photos.get(photo_key(name))
+            if path:
+                return path
+        return None
+
+
+def get_index(photo_dirs=None):
+    """PhotoIndex bersama untuk daftar folder (default PHOTO_DIRS)"""
+    if isinstance(photo_dirs, str):
+        photo_dirs = [photo_dirs]
+    key = tuple(photo_dirs or PHOTO_DIRS)
+    with _lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = PhotoIndex(key)
+    return index
+
+
+def main(argv=None):
+    import argparse
+
+    # talent_data memakai modul ini, jadi baru diimpor saat dijalankan sebagai script
+    from talent_data import clean_talent_data, photo_coverage, read_talent_file
+
+    parser = argparse.ArgumentParser(description="Laporan talent yang belum punya foto")
+    parser.add_argument("input", help="File Excel (.xlsx) atau CSV template talent")
+    parser.add_argument("--photo-dir", action="append", help="Folder foto, boleh diulang (default: PHOTO_DIRS)")
+    parser.add_argument("--report", help="Simpan daftar talent tanpa foto ke file .xlsx atau .csv")
+    args = parser.parse_args(argv)
+
+    df = photo_coverage(clean_talent_data(read_talent_file(args.input)), args.photo_dir)
+    df = df[df["Nama"].notna()]
+    missing = df[~df["Punya Foto?"]]
+    index = get_index(args.photo_dir)
+    print(f"{len(index.files)} file foto di {', '.join(index.photo_dirs)}")
+    print(f"{len(df) - len(missing)} dari {len(df)} talent punya foto, {len(missing)} belum")
+    columns = [col for col in ("PIC", "NIPP", "LEVEL", "Nama", "Foto") if col in missing.columns]
+    for row in missing[columns].itertuples(index=False):
+        print("  - " + " | ".join(str(value) for value in row))
+
+    if args.report:
+        report = missing[columns + ["Punya Foto?"]]
+        if args.report.lower().endswith(".csv"):
+            report.to_csv(args.report, index=False)
+        else:
+            report.to_excel(args.report, index=False)
+        print(f"Laporan disimpan ke {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
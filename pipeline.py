@@ -0,0 +1,236 @@
+"""
+Pipeline batch PDF: baca foto, render dan tulis hasil berjalan bersamaan
+
+Di loop batch biasa setiap profil dikerjakan berurutan di satu thread:
+stat/baca foto dan buat thumbnail, render PDF, lalu tulis ke ZIP atau file.
+Di sini ketiganya menjadi tahap yang dihubungkan antrean terbatas:
+
+    pembaca (thread)  ->  render (thread pemanggil)  ->  penulis (thread)
+
+Pembaca menyiapkan foto untuk paling banyak PREFETCH profil berikutnya,
+penulis menulis PDF yang sudah jadi. Karena antreannya dibatasi, memori
+tetap kecil walau batch ribuan profil. Baca/tulis file dan decode foto oleh
+Pillow melepas GIL, jadi waktu tunggu I/O (terutama folder foto di
+jaringan) tertutup oleh render.
+
+TALENT_PREFETCH=0 menjalankan semua tahap berurutan di thread pemanggil.
+"""
+
+import os
+import queue
+import threading
+import zipfile
+
+import timing
+from custom_pdf import load_image, render_profile
+from photo_cache import get_thumbnail
+
+PREFETCH = int(os.environ.get("TALENT_PREFETCH", 8))
+
+_DONE = object()
+_POLL = 0.1
+
+
+def _put(q, item, stop):
+    """Masukkan item ke antrean; False kalau stop di-set sebelum ada tempat"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def prefetch(items, load, depth=PREFETCH):
+    """
+    Iterasi (item, load(item)) dengan load dikerjakan di thread pembaca.
+
+    Urutan item tetap. Kalau load gagal, hasilnya exception tersebut dan
+    iterasi berlanjut; kalau items sendiri gagal dibaca, exception-nya
+    dilempar ke pemanggil. Berhenti iterasi lebih awal menghentikan pembaca.
+    """
+    if depth <= 0:
+        for item in items:
+            try:
+                yield item, load(item)
+            except Exception as e:
+                yield item, e
+        return
+
+    results = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    timings = timing.current()
+
+    def read():
+        with timing.attach(timings):
+            try:
+                for item in items:
+                    try:
+                        result = load(item)
+                    except Exception as e:
+                        result = e
+                    if not _put(results, (item, result), stop):
+                        return
+                _put(results, _DONE, stop)
+            except Exception as e:
+                _put(results, (_DONE, e), stop)
+
+    thread = threading.Thread(target=read, name="batch-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            entry = results.get()
+            if entry is _DONE:
+                break
+            if entry[0] is _DONE:
+                raise entry[1]
+            yield entry
+    finally:
+        stop.set()
+        thread.join()
+
+
+class Writer:
+    """
+    Thread penulis: write(*args) dipanggil berurutan untuk setiap put(*args).
+
+    Kesalahan menulis dilempar lagi di put() berikutnya atau saat close().
+    """
+
+    def __init__(self, write, depth=PREFETCH, name="batch-writer"):
+        self.write = write
+        self.error = None
+        self.thread = None
+        if depth > 0:
+            self.queue = queue.Queue(maxsize=depth)
+            self.timings = timing.current()
+            self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        with timing.attach(self.timings):
+            while True:
+                args = self.queue.get()
+                if args is _DONE:
+                    return
+                if self.error is None:
+                    try:
+                        self.write(*args)
+                    except Exception as e:
+                        # Tetap kosongkan antrean supaya put() tidak tertahan
+                        self.error = e
+
+    def put(self, *args):
+        if self.error is not None:
+            raise self.error
+        if self.thread is None:
+            self.write(*args)
+        else:
+            self.queue.put(args)
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(_DONE)
+            self.thread.join()
+            self.thread = None
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Jangan tutupi exception asli dengan kesalahan menulis
+            try:
+                self.close()
+            except Exception:
+                pass
+
+
+def prepare_photo(foto_path):
+    """Tahap pembaca: (thumbnail, hasil load_image) untuk foto asli, image None kalau gagal dibaca"""
+    thumbnail = get_thumbnail(foto_path)
+    if not thumbnail:
+        return thumbnail, None
+    try:
+        return thumbnail, load_image(thumbnail)
+    except Exception:
+        return thumbnail, None
+
+
+def _prepare_item(item):
+    return prepare_photo(item[-1])
+
+
+def render_items(items, depth=PREFETCH):
+    """
+    Render (kunci, data, foto_path asli) berurutan dengan foto disiapkan di thread pembaca.
+
+    Menghasilkan (kunci, pdf_bytes, error); pdf_bytes None kalau render gagal.
+    """
+    for (key, data, foto_path), prepared in prefetch(items, _prepare_item, depth):
+        thumbnail, image = (foto_path, None) if isinstance(prepared, Exception) else prepared
+        try:
+            yield key, render_profile(data, thumbnail, image), None
+        except Exception as e:
+            yield key, None, e
+
+
+def write_zip(fileobj, items, depth=PREFETCH, progress=None):
+    """
+    Tulis ZIP berisi satu PDF per profil dengan pipeline baca -> render -> tulis.
+
+    Args:
+        fileobj: File tujuan yang bisa ditulis, misalnya SpooledTemporaryFile
+        items: Iterable berisi (nama_file_di_zip, data, foto_path asli)
+        progress: Fungsi yang dipanggil dengan (nama_file, error) setiap profil selesai
+
+    Returns:
+        List (nama_file, pesan error) untuk profil yang gagal
+    """
+    errors = []
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_STORED) as zipf:
+        def write(arcname, pdf_bytes):
+            with timing.stage("zip_write"):
+                zipf.writestr(arcname, pdf_bytes)
+
+        with Writer(write, depth) as writer:
+            for arcname, pdf_bytes, error in render_items(items, depth):
+                if error is None:
+                    writer.put(arcname, pdf_bytes)
+                else:
+                    errors.append((arcname, str(error)))
+                if progress:
+                    progress(arcname, error)
+    return errors
+
+
+def write_files(items, depth=PREFETCH):
+    """
+    Render (output_path, data, foto_path asli) ke file PDF masing-masing.
+
+    Returns:
+        (path yang berhasil, list (path, pesan error) yang gagal)
+    """
+    done, failed = [], []
+
+    def write(output_path, pdf_bytes):
+        # Gagal menulis satu file tidak menghentikan file lain
+        try:
+            with timing.stage("pdf_write"), open(output_path, "wb") as f:
+                f.write(pdf_bytes)
+            done.append(output_path)
+        except OSError as e:
+            failed.append((output_path, str(e)))
+
+    with Writer(write, depth) as writer:
+        for output_path, pdf_bytes, error in render_items(items, depth):
+            if error is None:
+                writer.put(output_path, pdf_bytes)
+            else:
+                failed.append((output_path, str(error)))
+    return done, failed
@@ -0,0 +1,128 @@
+"""
+Preview data per halaman untuk app.py dan app_enhanced.py
+
+st.dataframe untuk seluruh sheet mengirim semua baris, termasuk teks
+panjang Working Experience dan Knowledge, ke browser. Di sini yang dikirim
+hanya satu halaman (PAGE_SIZE baris) dengan teks dipotong PREVIEW_CHARS
+huruf; teks lengkap baru ditampilkan untuk baris yang dipilih.
+
+Pengurutan, filter dan potongan halaman dikerjakan di server oleh fungsi
+fetch(offset, limit, sort, descending, filters, name) -> (records, total):
+store_fetch memakai index talent_store, frame_fetch memakai DataFrame
+di memori (app_enhanced). Ukuran data yang dikirim sama untuk 170 maupun
+8.500 baris.
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+import talent_store
+
+PAGE_SIZE = int(os.environ.get("TALENT_PREVIEW_PAGE", 50))
+PREVIEW_CHARS = 60
+
+
+def truncate(value, limit=PREVIEW_CHARS):
+    """Baris pertama nilai sebagai teks, dipotong limit huruf; None untuk nilai kosong"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    # Semua sel jadi teks supaya kolom campuran angka/teks tidak dikonversi ulang oleh Arrow
+    text = str(value).strip()
+    first_line = text.split("\n", 1)[0]
+    if len(first_line) > limit:
+        return first_line[:limit].rstrip() + "…"
+    return first_line + " …" if first_line != text else first_line
+
+
+def trim_records(records, columns):
+    """DataFrame halaman preview: hanya columns, teks panjang dipotong"""
+    return pd.DataFrame([{col: truncate(data.get(col)) for col in columns} for data in records], columns=columns)
+
+
+def store_fetch(path=None):
+    """fetch untuk show_preview dari talent_store (kolom filter/sort harus ber-index)"""
+    def fetch(offset, limit, sort, descending, filters, name):
+        return talent_store.page(offset, limit, sort, descending, filters, name, path)
+    return fetch
+
+
+def frame_fetch(df, name_column):
+    """fetch untuk show_preview dari DataFrame di memori"""
+    def fetch(offset, limit, sort, descending, filters, name):
+        view = df
+        for col, value in filters.items():
+            if value:
+                view = view[view[col].astype(str).str.strip() == value]
+        if name and name.strip() and name_column in view.columns:
+            view = view[view[name_column].astype(str).str.contains(name.strip(), case=False, regex=False)]
+        if sort:
+            view = view.sort_values(sort, ascending=not descending, kind="stable", key=lambda s: s.astype(str))
+        elif descending:
+            view = view.iloc[::-1]
+        return view.iloc[offset:offset + limit].to_dict("records"), len(view)
+    return fetch
+
+
+def frame_values(df, col):
+    """Nilai unik (tidak kosong, urut) satu kolom DataFrame untuk pilihan filter"""
+    values = df[col].dropna().astype(str).str.strip()
+    return sorted(set(values[values != ""]))
+
+
+def show_preview(fetch, columns, sort_columns=(), filter_values=None, name_label="Nama", key="preview"):
+    """
+    Tabel preview satu halaman dengan kontrol urut, filter dan halaman.
+
+    Args:
+        fetch: Lihat store_fetch / frame_fetch
+        columns: Kolom yang ditampilkan di tabel
+        sort_columns: Kolom yang boleh dipakai untuk mengurutkan
+        filter_values: dict kolom -> list nilai untuk filter
+        name_label: Label kolom nama untuk pencarian teks dan judul detail
+    """
+    filter_values = filter_values or {}
+    controls = st.columns(2 + len(filter_values))
+    with controls[0]:
+        name = st.text_input(f"Cari {name_label}", key=f"{key}_name")
+    with controls[1]:
+        sort = st.selectbox("Urutkan", [None, *sort_columns], key=f"{key}_sort",
+                            format_func=lambda col: "Urutan file" if col is None else col)
+        descending = st.toggle("Menurun", key=f"{key}_desc")
+    filters = {}
+    for control, (col, values) in zip(controls[2:], filter_values.items()):
+        with control:
+            filters[col] = st.selectbox(col, [None, *values], key=f"{key}_{col}",
+                                        format_func=lambda value: "Semua" if value is None else value)
+
+    # Jumlah halaman baru diketahui setelah query; halaman yang lewat batas dikembalikan ke akhir
+    page_number = st.session_state.get(f"{key}_page", 1)
+    records, total = fetch((page_number - 1) * PAGE_SIZE, PAGE_SIZE, sort, descending, filters, name)
+    pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+    if page_number > pages:
+        page_number = st.session_state[f"{key}_page"] = pages
+        records, total = fetch((page_number - 1) * PAGE_SIZE, PAGE_SIZE, sort, descending, filters, name)
+
+    event = st.dataframe(trim_records(records, columns), use_container_width=True, hide_index=True,
+                         on_select="rerun", selection_mode="single-row", key=f"{key}_table")
+    info_col, page_col = st.columns([3, 1])
+    with page_col:
+        st.number_input("Halaman", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    with info_col:
+        if total:
+            first = (page_number - 1) * PAGE_SIZE + 1
+            st.caption(f"Baris {first}–{first + len(records) - 1} dari {total} · "
+                       "pilih baris untuk melihat teks lengkap")
+        else:
+            st.caption("Tidak ada baris yang cocok")
+
+    selected = event.selection.rows if event is not None else []
+    if selected and selected[0] < len(records):
+        data = records[selected[0]]
+        with st.expander(f"Detail: {data.get(name_label, '-')}", expanded=True):
+            for col, value in data.items():
+                if value is None or (isinstance(value, float) and pd.isna(value)):
+                    continue
+                st.markdown(f"**{col}**")
+                st.text(str(value))
@@ -0,0 +1,411 @@
+"""
+Layanan HTTP lokal untuk PDF profil, tanpa Streamlit
+
+Layar lain (misalnya "View Profile (export)" di Talent Master Data dan
+"Export Profile" di Succession Plan) bisa mengambil profil yang sama
+dengan yang dibuat app.py:
+
+    GET  /profile/<NIPP>.pdf   satu profil
+    POST /batch                daftar NIPP (JSON list, {"nipp": [...]},
+                               atau teks dipisah koma/baris) -> ZIP
+    GET  /health               jumlah data di store dan statistik cache
+
+Data dibaca dari talent_store, jadi upload dulu lewat app.py. Profil
+dirender di process pool oleh renderer yang sama dengan job batch
+(jobs.render_item). PDF yang sudah jadi disimpan di cache LRU di memori
+(SERVICE_CACHE_MB) dengan kunci ETag: hash isi baris, foto (path, mtime,
+ukuran) dan versi renderer. Permintaan dengan If-None-Match yang cocok
+dijawab 304 tanpa render; permintaan bersamaan untuk profil yang sama
+menunggu satu render yang sama.
+
+Jalankan dari folder repo:
+    python profile_service.py [--host 127.0.0.1] [--port 8502]
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote
+
+import talent_store
+import timing
+from jobs import render_item
+from manifest import RENDERER
+from talent_data import get_photo_path, normalize_nipp
+
+SERVICE_WORKERS = int(os.environ.get("TALENT_SERVICE_WORKERS", os.cpu_count() or 1))
+SERVICE_CACHE_MB = int(os.environ.get("TALENT_SERVICE_CACHE_MB", 256))
+BATCH_LIMIT = int(os.environ.get("TALENT_SERVICE_BATCH_LIMIT", 2000))
+SPOOL_MAX_SIZE = 32 * 1024 * 1024
+# Body POST /batch: BATCH_LIMIT NIPP muat jauh di bawah batas ini
+BODY_MAX_SIZE = 1024 * 1024
+
+_pool = None
+_pending = {}
+_lock = threading.Lock()
+
+
+class RenderCache:
+    """PDF per ETag, dibuang mulai dari yang paling lama tidak dipakai kalau lewat max_bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pdf_bytes = self._items.get(key)
+            if pdf_bytes is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return pdf_bytes
+
+    def put(self, key, pdf_bytes):
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = pdf_bytes
+            self.size += len(pdf_bytes)
+            while self.size > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self.size -= len(old)
+
+    def size_of(self, key):
+        """Ukuran PDF di cache, atau None; tidak dihitung sebagai hit/miss"""
+        with self._lock:
+            pdf_bytes = self._items.get(key)
+            return None if pdf_bytes is None else len(pdf_bytes)
+
+    def stats(self):
+        with self._lock:
+            return {"profiles": len(self._items), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+_cache = RenderCache(SERVICE_CACHE_MB * 1024 * 1024)
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # spawn: fork dari server yang multi-thread tidak aman (seperti jobs.py)
+            _pool = ProcessPoolExecutor(max_workers=SERVICE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(broken):
+    """Ganti pool yang rusak (worker mati) dengan pool baru"""
+    global _pool
+    with _lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+    return _get_pool()
+
+
+def etag(data, foto_path):
+    """Penanda isi PDF: berubah kalau baris, file foto atau versi renderer berubah"""
+    row = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    photo = ""
+    if foto_path:
+        # Kunci foto sama dengan photo_cache: path, mtime dan ukuran file
+        stat = os.stat(foto_path)
+        photo = f"{os.path.abspath(foto_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    content = "\n".join([RENDERER, row, photo])
+    return '"' + hashlib.sha256(content.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _finish(tag, future):
+    with _lock:
+        if _pending.get(tag) is future:
+            del _pending[tag]
+    if future.exception() is None:
+        _cache.put(tag, future.result()[0])
+
+
+def render(data, foto_path, tag):
+    """
+    Future berisi (pdf_bytes, stages) untuk satu profil.
+
+    Dari cache kalau ada; profil yang sedang dirender untuk permintaan lain
+    tidak dirender dua kali.
+    """
+    pdf_bytes = _cache.get(tag)
+    if pdf_bytes is not None:
+        future = Future()
+        future.set_result((pdf_bytes, {}))
+        return future
+
+    def submit(pool):
+        with _lock:
+            future = _pending.get(tag)
+            # Future yang sudah gagal (callback _finish belum jalan) tidak dipakai ulang
+            if future is not None and not (future.done() and future.exception() is not None):
+                return future, False
+            future = _pending[tag] = pool.submit(render_item, data, foto_path)
+            return future, True
+
+    pool = _get_pool()
+    try:
+        future, created = submit(pool)
+    except BrokenProcessPool:
+        # Worker mati (misalnya kehabisan memori): pool lama tidak bisa dipakai lagi
+        future, created = submit(_reset_pool(pool))
+    if created:
+        # Di luar _lock: callback langsung dijalankan kalau future sudah selesai
+        future.add_done_callback(lambda done: _finish(tag, done))
+    return future
+
+
+def render_result(data, foto_path, tag, future=None):
+    """(pdf_bytes, stages) dari render(); dicoba sekali lagi kalau pool rusak di tengah render"""
+    try:
+        return (future or render(data, foto_path, tag)).result()
+    except BrokenProcessPool:
+        return render(data, foto_path, tag).result()
+
+
+def pdf_name(data):
+    return f"Profil_{str(data.get('Nama', '-')).strip()}_{normalize_nipp(data.get('NIPP'))}.pdf"
+
+
+def parse_nipps(body, content_type=""):
+    """Daftar NIPP unik (urutan dipertahankan) dari body POST /batch"""
+    text = body.decode("utf-8-sig").strip()
+    if "json" in content_type or text.startswith(("[", "{")):
+        values = json.loads(text or "[]")
+        if isinstance(values, dict):
+            values = values.get("nipp", [])
+        if not isinstance(values, list):
+            raise ValueError("Body JSON harus list NIPP atau {\"nipp\": [...]}")
+    else:
+        values = re.split(r"[\s,;]+", text)
+    nipps = (normalize_nipp(value) for value in values)
+    return list(dict.fromkeys(nipp for nipp in nipps if nipp))
+
+
+def write_batch(fileobj, nipps, timings=None):
+    """
+    Tulis ZIP profil untuk nipps ke fileobj, urut seperti nipps.
+
+    NIPP yang tidak ada di store atau gagal dirender dicatat di
+    tidak_dibuat.txt di dalam ZIP.
+
+    Returns:
+        Jumlah PDF di dalam ZIP
+    """
+    records = {normalize_nipp(data.get("NIPP")): data for data in talent_store.get_records(nipps)}
+    skipped = [f"{nipp}: tidak ada di data" for nipp in nipps if nipp not in records]
+    count = 0
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_STORED) as zipf:
+        pending = deque()
+
+        def write_oldest():
+            nonlocal count
+            nipp, arcname, data, foto_path, tag, future = pending.popleft()
+            try:
+                pdf_bytes, stages = render_result(data, foto_path, tag, future)
+            except Exception as e:
+                skipped.append(f"{nipp}: {e}")
+                return
+            if timings is not None:
+                timings.merge(stages)
+            with timing.stage("zip_write"):
+                zipf.writestr(arcname, pdf_bytes)
+            count += 1
+
+        for nipp in nipps:
+            data = records.get(nipp)
+            if data is None:
+                continue
+            foto_path = get_photo_path(data, thumbnail=False)
+            tag = etag(data, foto_path)
+            # Dua kali jumlah worker di antrean supaya pool tidak menganggur selagi ZIP ditulis
+            pending.append((nipp, pdf_name(data), data, foto_path, tag, render(data, foto_path, tag)))
+            if len(pending) >= 2 * SERVICE_WORKERS:
+                write_oldest()
+        while pending:
+            write_oldest()
+        if skipped:
+            zipf.writestr("tidak_dibuat.txt", "\n".join(skipped) + "\n")
+    return count
+
+
+class ProfileHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 supaya klien bisa memakai ulang koneksi untuk banyak profil
+    protocol_version = "HTTP/1.1"
+    # Header dan body ditulis terpisah; tanpa ini keep-alive menunggu delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = "TalentProfile/1"
+    quiet = False
+
+    def _send(self, status, body=b"", content_type="application/json", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_headers(self, status, headers):
+        """Status dan header saja, tanpa body dan tanpa Content-Length buatan (304, HEAD)"""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _error(self, status, message, headers=None):
+        self._send(status, json.dumps({"error": message}, ensure_ascii=False).encode("utf-8"), headers=headers)
+
+    def _read_body(self):
+        """Body request sesuai Content-Length; None (error sudah dikirim) kalau tidak valid"""
+        # Body yang tidak dibaca tidak bisa dilewati, jadi koneksi ditutup setelah error
+        close = {"Connection": "close"}
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            self._error(HTTPStatus.LENGTH_REQUIRED, "Kirim body dengan Content-Length", close)
+            return None
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._error(HTTPStatus.BAD_REQUEST, "Content-Length tidak ada atau tidak valid", close)
+            return None
+        if length > BODY_MAX_SIZE:
+            self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body paling besar {BODY_MAX_SIZE} byte", close)
+            return None
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        path = unquote(self.path.split("?", 1)[0])
+        if path == "/health":
+            body = {"store": talent_store.info()["count"], "cache": _cache.stats(), "workers": SERVICE_WORKERS}
+            return self._send(HTTPStatus.OK, json.dumps(body).encode("utf-8"))
+        match = re.fullmatch(r"/profile/([^/]+)\.pdf", path)
+        if not match:
+            return self._error(HTTPStatus.NOT_FOUND, "Pakai /profile/<NIPP>.pdf atau POST /batch")
+        self.send_profile(normalize_nipp(match.group(1)))
+
+    def do_HEAD(self):
+        match = re.fullmatch(r"/profile/([^/]+)\.pdf", unquote(self.path.split("?", 1)[0]))
+        if not match:
+            # /health dan 404 murah; _send tidak menulis body untuk HEAD
+            return self.do_GET()
+        self.send_profile(normalize_nipp(match.group(1)), head=True)
+
+    def send_profile(self, nipp, head=False):
+        data = talent_store.get_record(nipp) if nipp else None
+        if data is None:
+            return self._error(HTTPStatus.NOT_FOUND, f"NIPP {nipp} tidak ada di data")
+        foto_path = get_photo_path(data, thumbnail=False)
+        tag = etag(data, foto_path)
+        # no-cache: klien boleh menyimpan PDF tapi harus cek ulang, karena upload baru bisa mengubahnya
+        headers = {"ETag": tag, "Cache-Control": "no-cache"}
+        if tag in [value.strip() for value in self.headers.get("If-None-Match", "").split(",")]:
+            # Content-Length: 0 di 304 dibaca cache sebagai ukuran PDF (RFC 9110 8.6), jadi tidak dikirim
+            return self._send_headers(HTTPStatus.NOT_MODIFIED, headers)
+        headers["Content-Disposition"] = f"inline; filename*=UTF-8''{quote(pdf_name(data))}"
+        if head:
+            # Header dari store dan cache saja: tidak merender dan tidak menulis body.
+            # Content-Length hanya diketahui kalau PDF sudah ada di cache.
+            headers["Content-Type"] = "application/pdf"
+            size = _cache.size_of(tag)
+            if size is not None:
+                headers["Content-Length"] = str(size)
+            return self._send_headers(HTTPStatus.OK, headers)
+        try:
+            pdf_bytes, _ = render_result(data, foto_path, tag)
+        except Exception as e:
+            return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Gagal render {nipp}: {e}")
+        self._send(HTTPStatus.OK, pdf_bytes, "application/pdf", headers)
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/batch":
+            return self._error(HTTPStatus.NOT_FOUND, "Pakai POST /batch")
+        body = self._read_body()
+        if body is None:
+            return
+        try:
+            nipps = parse_nipps(body, self.headers.get("Content-Type", ""))
+        except ValueError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+        if not nipps:
+            return self._error(HTTPStatus.BAD_REQUEST, "Daftar NIPP kosong")
+        if len(nipps) > BATCH_LIMIT:
+            return self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Paling banyak {BATCH_LIMIT} NIPP per batch")
+
+        with timing.collect("service.batch", profiles=len(nipps)) as timings, \
+                tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            count = write_batch(spool, nipps, timings)
+            if not count:
+                return self._error(HTTPStatus.NOT_FOUND, "Tidak ada NIPP yang ditemukan di data")
+            size = spool.tell()
+            spool.seek(0)
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Content-Length", str(size))
+            self.send_header("Content-Disposition", f"attachment; filename=profil_{count}.zip")
+            self.send_header("X-Profile-Count", str(count))
+            self.end_headers()
+            shutil.copyfileobj(spool, self.wfile)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8502, quiet=False):
+    """ThreadingHTTPServer untuk layanan ini; port 0 memilih port bebas"""
+    handler = type("Handler", (ProfileHandler,), {"quiet": quiet})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP PDF profil talent")
+    parser.add_argument("--host", default="127.0.0.1", help="Alamat server (default: hanya lokal)")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--quiet", action="store_true", help="Jangan tulis log per request")
+    args = parser.parse_args(argv)
+
+    count = talent_store.info()["count"]
+    if not count:
+        print(f"Store {talent_store.STORE_PATH} masih kosong; upload data lewat app.py dulu.", file=sys.stderr)
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"{count} profil tersedia di http://{args.host}:{server.server_port}/profile/<NIPP>.pdf "
+          f"({SERVICE_WORKERS} worker, cache {SERVICE_CACHE_MB} MB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""
+Rekonsiliasi file sumber, folder output PDF dan folder foto berdasarkan NIPP
+
+Setiap folder (output dan foto) di-scan sekali dengan os.scandir lalu dicocokkan
+lewat dict, jadi tetap cepat untuk ribuan profil dan beberapa folder output.
+Status yang dilaporkan:
+
+- missing   : NIPP ada di sumber tapi PDF-nya tidak ada
+- orphaned  : PDF yang tidak cocok dengan NIPP mana pun di sumber
+- stale     : PDF lebih lama dari datanya (fingerprint di .manifest.json
+              berbeda, atau tanpa manifest: foto lebih baru dari PDF)
+- duplicated: NIPP muncul lebih dari sekali di sumber, beberapa PDF untuk
+              satu NIPP, atau PDF bernama sama untuk beberapa NIPP
+- no_photo  : baris sumber yang fotonya tidak ditemukan
+- unused_photo: file foto yang tidak dirujuk baris mana pun
+
+Contoh:
+    python reconcile.py "Talent Profile D6 REVISI.xlsx" "TalentProfile_D6(REVISI)" TalentProfile_D6
+    python reconcile.py "Talent Profile D6 REVISI.xlsx" "TalentProfile_D6(REVISI)" --report rekonsiliasi.xlsx
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+import pandas as pd
+
+from generate_profiles import build_jobs
+from manifest import Manifest
+from photo_index import get_index
+from talent_data import clean_talent_data, normalize_nipp, read_talent_file
+
+REPORT_COLUMNS = ["status", "folder", "NIPP", "Nama", "file", "keterangan"]
+# Jumlah baris per status yang dicetak ke layar; selengkapnya lewat --report
+PRINT_LIMIT = 20
+
+
+def scan_files(root, extensions):
+    """
+    Semua file di bawah root (rekursif) dengan ekstensi tertentu, satu kali scan.
+
+    Returns:
+        dict path relatif -> (path, mtime)
+    """
+    files = {}
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                stack.append(entry.path)
+            elif entry.name.lower().endswith(extensions):
+                files[os.path.relpath(entry.path, root)] = (entry.path, entry.stat().st_mtime)
+    return files
+
+
+def _pdf_name(filename):
+    """'Profil_NAMA_12345.pdf' -> 'NAMA_12345'"""
+    stem = os.path.splitext(filename)[0]
+    return stem[len("Profil_"):] if stem.startswith("Profil_") else stem
+
+
+class Reconciler:
+    """Indeks sumber dan foto, dibangun sekali lalu dipakai untuk setiap folder output"""
+
+    def __init__(self, df, photo_dir=None, group_by=None):
+        self.photo_dir = photo_dir
+        self.group_by = group_by
+        self.df = df = df[df["Nama"].notna()]
+        self.rows = defaultdict(list)
+        self.by_name = defaultdict(set)
+        for data in df.to_dict("records"):
+            nipp = normalize_nipp(data.get("NIPP"))
+            self.rows[nipp].append(data)
+            self.by_name[str(data["Nama"]).strip().upper()].add(nipp)
+
+        # Semua file foto, termasuk yang kalah oleh foto lebih baru dengan NIPP sama
+        self.photos = {
+            os.path.abspath(path): (path, os.stat(path).st_mtime)
+            for path in get_index(photo_dir).files
+        }
+
+    def source_issues(self, jobs):
+        """Masalah yang tidak bergantung pada folder output"""
+        issues = []
+        for nipp, rows in self.rows.items():
+            if not nipp:
+                for data in rows:
+                    issues.append(("duplicated", "", "", data["Nama"], "", "baris tanpa NIPP"))
+            elif len(rows) > 1:
+                names = ", ".join(sorted({str(data["Nama"]) for data in rows}))
+                issues.append(("duplicated", "", nipp, names, "", f"NIPP muncul {len(rows)}x di sumber"))
+
+        used = set()
+        for data, foto_path, _ in jobs:
+            if foto_path:
+                used.add(os.path.abspath(foto_path))
+            else:
+                issues.append(("no_photo", "", normalize_nipp(data.get("NIPP")), data["Nama"],
+                               str(data.get("Foto", "")), "foto tidak ditemukan"))
+        for path, (photo_path, _) in sorted(self.photos.items()):
+            if path not in used:
+                issues.append(("unused_photo", os.path.dirname(photo_path), "", "", os.path.basename(photo_path),
+                               "tidak dirujuk sumber"))
+        return issues
+
+    def output_issues(self, output_dir, jobs):
+        """Bandingkan satu folder output dengan jobs yang seharusnya ada"""
+        pdfs = scan_files(output_dir, (".pdf",))
+        manifest = Manifest(output_dir)
+        by_output = {entry["output"]: key for key, entry in manifest.entries.items()}
+
+        expected = {}
+        by_basename = defaultdict(set)
+        for data, foto_path, output_path in jobs:
+            # Kunci sama dengan manifest: NIPP, path output kalau NIPP kosong,
+            # NIPP + path output untuk NIPP yang muncul lagi
+            key = manifest.key(data, output_path)
+            manifest.seen.add(key)
+            expected[key] = (data, foto_path, os.path.relpath(output_path, output_dir))
+            by_basename[os.path.basename(output_path)].add(key)
+
+        issues = []
+        found = defaultdict(list)
+        for relpath, (_, mtime) in sorted(pdfs.items()):
+            basename = os.path.basename(relpath)
+            if relpath in by_output and by_output[relpath] in expected:
+                candidates = {by_output[relpath]}
+            elif basename in by_basename:
+                candidates = by_basename[basename]
+            else:
+                # Nama file lama: cocokkan lewat akhiran _NIPP atau lewat nama
+                name = _pdf_name(basename)
+                prefix, _, suffix = name.rpartition("_")
+                if prefix and suffix in self.rows:
+                    candidates = {suffix}
+                else:
+                    candidates = self.by_name.get(name.strip().upper(), set())
+
+            if not candidates:
+                issues.append(("orphaned", output_dir, "", "", relpath, "tidak ada di sumber"))
+            elif len(candidates) > 1:
+                issues.append(("duplicated", output_dir, ", ".join(sorted(candidates)), "", relpath,
+                               "nama file dipakai beberapa NIPP"))
+            else:
+                found[next(iter(candidates))].append((relpath, mtime))
+
+        for key, (data, foto_path, relpath) in expected.items():
+            nipp = normalize_nipp(data.get("NIPP"))
+            outputs = found.get(key)
+            if not outputs:
+                issues.append(("missing", output_dir, nipp, data["Nama"], relpath, "PDF belum dibuat"))
+                continue
+            if len(outputs) > 1:
+                files = ", ".join(path for path, _ in outputs)
+                issues.append(("duplicated", output_dir, nipp, data["Nama"], files, f"{len(outputs)} PDF"))
+
+            entry = manifest.entries.get(key)
+            for path, mtime in outputs:
+                if entry and entry["output"] == path:
+                    if entry["fingerprint"] != manifest.fingerprint(data, foto_path):
+                        issues.append(("stale", output_dir, nipp, data["Nama"], path, "data atau foto berubah"))
+                elif foto_path and self.photos.get(os.path.abspath(foto_path), (None, 0))[1] > mtime:
+                    issues.append(("stale", output_dir, nipp, data["Nama"], path, "foto lebih baru dari PDF"))
+        return issues
+
+    def report(self, output_dirs):
+        """DataFrame semua masalah untuk sumber, foto dan setiap folder output"""
+        issues = []
+        jobs = build_jobs(self.df, "", group_by=self.group_by, photo_dir=self.photo_dir)
+        issues.extend(self.source_issues(jobs))
+        for output_dir in output_dirs:
+            jobs = build_jobs(self.df, output_dir, group_by=self.group_by, photo_dir=self.photo_dir)
+            issues.extend(self.output_issues(output_dir, jobs))
+        return pd.DataFrame(issues, columns=REPORT_COLUMNS)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rekonsiliasi sumber, PDF output dan foto berdasarkan NIPP")
+    parser.add_argument("input", help="File Excel (.xlsx) atau CSV template talent")
+    parser.add_argument("outputs", nargs="*", help="Folder output PDF yang dicek")
+    parser.add_argument("--sheet", help="Nama atau index sheet Excel")
+    parser.add_argument("--group-by", help="Kolom subfolder yang dipakai saat generate, misalnya PIC")
+    parser.add_argument("--photo-dir", action="append",
+                        help="Folder foto talent, boleh diulang (default: semua folder di photo_index.PHOTO_DIRS)")
+    parser.add_argument("--report", help="Simpan laporan lengkap ke file .xlsx atau .csv")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sheet = int(args.sheet) if args.sheet and args.sheet.isdigit() else args.sheet
+
+    df = clean_talent_data(read_talent_file(args.input, sheet_name=sheet))
+    if "Nama" not in df.columns:
+        print("Kolom 'Nama' wajib ada di file input.", file=sys.stderr)
+        return 1
+
+    report = Reconciler(df, photo_dir=args.photo_dir, group_by=args.group_by).report(args.outputs)
+    print(f"{df['Nama'].notna().sum()} baris sumber, {len(args.outputs)} folder output")
+    for status, group in report.groupby("status", sort=False):
+        print(f"\n{status}: {len(group)}")
+        for issue in group.head(PRINT_LIMIT).itertuples(index=False):
+            detail = " | ".join(str(v) for v in (issue.folder, issue.NIPP, issue.Nama, issue.file) if v)
+            print(f"  - {detail} ({issue.keterangan})")
+        if len(group) > PRINT_LIMIT:
+            print(f"  ... dan {len(group) - PRINT_LIMIT} lainnya")
+    if report.empty:
+        print("Tidak ada selisih.")
+
+    if args.report:
+        if args.report.lower().endswith(".csv"):
+            report.to_csv(args.report, index=False)
+        else:
+            report.to_excel(args.report, index=False)
+        print(f"\nLaporan disimpan ke {args.report}")
+    return 1 if len(report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
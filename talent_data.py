@@ -0,0 +1,209 @@
+"""
+Pembacaan dan pembersihan data Talent Profile
+Dipakai bersama oleh app.py dan generate_profiles.py
+"""
+
+import codecs
+
+import pandas as pd
+
+import timing
+from date_formatter import format_date_column
+from excel_ingest import read_excel_columns
+from photo_cache import get_thumbnail
+from photo_index import get_index
+
+# Kolom Excel (huruf besar) -> nama kolom yang dipakai CustomPDF.add_profile
+RENAME_DICT = {
+    "NIPP": "NIPP",
+    "PIC": "PIC",
+    "STATUS": "Status",
+    "LEVEL": "LEVEL",
+    "NAMA": "Nama",
+    "TALENT CLASSIFICATION": "Talent Classification",
+    "WORKING EXPERIENCE": "Working Experience",
+    "NILAI KINERJA (2022)": "Nilai Kinerja (2022)",
+    "NILAI KINERJA (2023)": "Nilai Kinerja (2023)",
+    "NILAI KINERJA (2024)": "Nilai Kinerja (2024)",
+    "BEHAVIOUR COMPETENCIES (BUMN ASSESSMENT)": "Behaviour Competencies BUMN",
+    "BEHAVIOUR COMPETENCIES (MULTIRATER)": "Behaviour Competencies Multirater",
+    "KNOWLEDGE": "Knowledge",
+    "PERSONAL ATTRIBUTES (PLACE AND DATE OF BIRTH)": "Tempat & Tanggal Lahir",
+    "PERSONAL ATTRIBUTES (AGE)": "Usia",
+    "PERSONAL ATTRIBUTES (EDUCATION)": "Pendidikan",
+    "PERSONAL ATTRIBUTES (GRADE)": "Grade",
+    "PERSONAL ATTRIBUTES (AWARD)": "Penghargaan",
+    "PERSONAL ATTRIBUTES (HUKUMAN DISIPLIN)": "Hukuman Disiplin",
+    "Tempat & Tanggal Lahir": "Tempat & Tanggal Lahir",
+    "PHOTO": "Foto"
+}
+
+
+# Kolom file sumber (huruf besar) yang dibutuhkan clean_talent_data
+SOURCE_COLUMNS = set(RENAME_DICT) | {
+    "PERSONAL ATTRIBUTES (BIRTHPLACE)",
+    "PERSONAL ATTRIBUTES (DATE OF BIRTH)",
+}
+
+# Variasi header di file sumber -> header standar (sesudah normalize_header)
+HEADER_ALIASES = {
+    "BEHAVIOUR COMPETENCIES (ASSESSMENT)": "BEHAVIOUR COMPETENCIES (BUMN ASSESSMENT)",
+}
+
+# Jumlah baris CSV per chunk
+CSV_CHUNK_ROWS = 200
+
+
+def normalize_header(col):
+    """Header huruf besar dengan spasi dirapikan, lalu dipetakan lewat HEADER_ALIASES"""
+    name = " ".join(str(col).upper().split())
+    name = name.replace("( ", "(").replace(" )", ")")
+    return HEADER_ALIASES.get(name, name)
+
+
+def _csv_encoding(path, block_size=1 << 20):
+    """utf-8 kalau seluruh file valid UTF-8, selain itu cp1252 (export Excel di Windows)"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    f = path if hasattr(path, "read") else open(path, "rb")
+    try:
+        f.seek(0)
+        while True:
+            block = f.read(block_size)
+            decoder.decode(block, final=not block)
+            if not block:
+                return "utf-8"
+    except UnicodeDecodeError:
+        return "cp1252"
+    finally:
+        if f is path:
+            f.seek(0)
+        else:
+            f.close()
+
+
+def iter_talent_csv(path, columns=SOURCE_COLUMNS, chunksize=CSV_CHUNK_ROWS):
+    """
+    Baca CSV template talent per chunk DataFrame mentah.
+
+    Sel ber-quote yang berisi baris baru (misalnya Working Experience) tetap
+    utuh. Semua nilai dibaca sebagai teks supaya tipe kolom sama di setiap
+    chunk; semua header asli ada di chunk.attrs["source_columns"].
+    """
+    encoding = _csv_encoding(path)
+    header = [str(col) for col in pd.read_csv(path, nrows=0, encoding=encoding).columns]
+    if hasattr(path, "seek"):
+        path.seek(0)
+
+    usecols = None
+    if columns is not None:
+        usecols = lambda col: normalize_header(col) in columns
+    with pd.read_csv(path, usecols=usecols, encoding=encoding, dtype=str, chunksize=chunksize) as reader:
+        for chunk in reader:
+            chunk.attrs["source_columns"] = header
+            yield chunk
+
+
+@timing.timed("read_file")
+def read_talent_file(path, sheet_name=None, filename=None, columns=SOURCE_COLUMNS):
+    """
+    Baca file Excel (.xlsx) atau CSV template talent.
+
+    path boleh berupa file-like (misalnya BytesIO dari upload); isi filename
+    dengan nama file asli supaya CSV dikenali. Hanya kolom di columns yang
+    dibaca (None untuk semua kolom); semua header asli ada di
+    df.attrs["source_columns"]. sheet_name None memilih sheet FORMAT atau
+    sheet pertama yang punya kolom NAMA.
+    """
+    if not str(filename or path).lower().endswith(".csv"):
+        return read_excel_columns(path, columns=columns, sheet_name=sheet_name, key=normalize_header)
+
+    chunks = list(iter_talent_csv(path, columns=columns))
+    if not chunks:
+        return pd.DataFrame()
+    df = pd.concat(chunks, ignore_index=True)
+    df.attrs["source_columns"] = chunks[0].attrs["source_columns"]
+    return df
+
+
+@timing.timed("clean")
+def clean_talent_data(df):
+    """Samakan nama kolom dan ambil kolom yang dipakai untuk profil"""
+    df = df.copy()
+    df.columns = [normalize_header(col) for col in df.columns]
+
+    if "PERSONAL ATTRIBUTES (BIRTHPLACE)" in df.columns and "PERSONAL ATTRIBUTES (DATE OF BIRTH)" in df.columns:
+        with timing.stage("date_parsing"):
+            df["Tempat & Tanggal Lahir"] = (
+                df["PERSONAL ATTRIBUTES (BIRTHPLACE)"].astype(str) + ", " +
+                format_date_column(df["PERSONAL ATTRIBUTES (DATE OF BIRTH)"])
+            )
+
+    available_cols = [k for k in RENAME_DICT if k in df.columns]
+    return df[available_cols].rename(columns={k: RENAME_DICT[k] for k in available_cols})
+
+
+def normalize_nipp(value):
+    """
+    NIPP sebagai string bersih: tanpa koma ribuan dan tanpa sisa float ".0".
+
+    Excel sering menyimpan NIPP sebagai angka sehingga terbaca 12345.0 atau
+    tampil sebagai "12,345". Nilai kosong menghasilkan string kosong.
+    """
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    nipp = str(value).replace(",", "").strip()
+    if nipp.endswith(".0") and nipp[:-2].isdigit():
+        nipp = nipp[:-2]
+    return "" if nipp.lower() == "nan" else nipp
+
+
+def build_nipp_index(df, column="NIPP"):
+    """
+    Index NIPP -> label baris df, dibuat sekali setelah upload.
+
+    Kalau satu NIPP muncul lebih dari sekali, baris pertama yang dipakai.
+    Baris tanpa NIPP tidak masuk index.
+    """
+    index = {}
+    for label, value in zip(df.index, df[column]):
+        nipp = normalize_nipp(value)
+        if nipp and nipp not in index:
+            index[nipp] = label
+    return index
+
+
+def find_photo(foto_file, nipp=None, photo_dirs=None):
+    """
+    Path foto asli dari photo_index: dicari lewat nama file di kolom Foto,
+    lalu lewat NIPP. None kalau tidak ada di folder foto mana pun.
+    """
+    return get_index(photo_dirs).lookup(foto_file, normalize_nipp(nipp))
+
+
+def get_photo_path(data, photo_dir=None, thumbnail=True):
+    """
+    Path foto talent, atau None kalau file tidak ada.
+
+    photo_dir bisa satu folder atau list folder (default semua PHOTO_DIRS).
+    Dengan thumbnail=True yang dikembalikan adalah versi kecil dari
+    photo_cache, bukan foto asli dari kamera.
+    """
+    img_path = find_photo(data.get("Foto"), data.get("NIPP"), photo_dir)
+    if not img_path:
+        return None
+    return get_thumbnail(img_path) if thumbnail else img_path
+
+
+def photo_coverage(df, photo_dirs=None):
+    """
+    Salinan df dengan kolom "Punya Foto?" dan "Path Foto" dari satu scan
+    folder foto, pengganti daftar talent_tanpa_foto.xlsx yang dibuat manual.
+    """
+    index = get_index(photo_dirs)
+    foto = df["Foto"] if "Foto" in df.columns else pd.Series(None, index=df.index)
+    nipp = df["NIPP"] if "NIPP" in df.columns else pd.Series(None, index=df.index)
+    paths = [index.lookup(f, normalize_nipp(n)) for f, n in zip(foto, nipp)]
+    df = df.copy()
+    df["Punya Foto?"] = [path is not None for path in paths]
+    df["Path Foto"] = paths
+    return df
@@ -0,0 +1,141 @@
+"""
+Pencarian staff di server untuk pemilih individu
+
+st.selectbox dengan semua nama mengirim ribuan opsi ke browser di setiap
+rerun. Di sini pencarian dilakukan di server: hanya SEARCH_LIMIT hasil
+teratas yang menjadi opsi selectbox.
+
+Index dibangun sekali per isi talent_store (dipakai bersama semua sesi,
+dibangun ulang kalau ada upload baru):
+
+- setiap token nama disimpan apa adanya ("MOCH") dan dinormalisasi
+  seperti name_matching ("MUHAMMAD"), ditambah versi ejaannya
+  ("SUPRIYADI" -> "SUPRIADI")
+- token disimpan terurut, jadi semua token berawalan "SUP" didapat
+  dengan bisect (seperti trie datar)
+- NIPP juga terurut untuk pencarian awalan angka
+
+Setiap kata di query harus cocok sebagai awalan salah satu token nama,
+angka sebagai awalan NIPP. Kata terakhir yang masih diketik tidak
+dinormalisasi ("M" belum tentu "MUHAMMAD", "MOC" harus tetap menemukan
+"MOCH ARIF"); kata yang sudah lengkap dicari apa adanya maupun versi
+normalnya. Hasil diurutkan: NIPP atau nama persis, nama
+yang diawali query, lalu sisanya menurut urutan di file.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+import talent_store
+from name_matching import name_tokens, normalize_name, normalize_token, spelling_key
+
+SEARCH_LIMIT = 20
+
+# Filter -> posisi kolom di talent_store.index_rows
+FILTER_COLUMNS = {name: position for position, name in enumerate(talent_store.INDEXED_COLUMNS.values())}
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+class SearchIndex:
+    def __init__(self, rows):
+        """rows: hasil talent_store.index_rows (kolom INDEXED_COLUMNS, NIPP pertama)"""
+        self.rows = []
+        self.names = []
+        self.raw_names = []
+        postings = defaultdict(set)
+        seen = set()
+        for row in rows:
+            nipp = row[0]
+            if nipp in seen:
+                continue
+            seen.add(nipp)
+            position = len(self.rows)
+            raw = name_tokens(row[1])
+            name = normalize_name(row[1])
+            self.rows.append(row)
+            self.names.append(name)
+            self.raw_names.append(" ".join(raw))
+            for token in {*raw, *name.split()}:
+                postings[token].add(position)
+                postings[spelling_key(token)].add(position)
+
+        self.tokens = sorted(postings)
+        self.postings = [postings[token] for token in self.tokens]
+        self.nipps = sorted((row[0], position) for position, row in enumerate(self.rows))
+
+    def _token_prefix(self, prefix):
+        positions = set()
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + "\uffff", start)
+        for ids in self.postings[start:end]:
+            positions |= ids
+        return positions
+
+    def _nipp_prefix(self, prefix):
+        start = bisect_left(self.nipps, (prefix,))
+        end = bisect_left(self.nipps, (prefix + "\uffff",), start)
+        return {position for _, position in self.nipps[start:end]}
+
+    def search(self, query="", limit=SEARCH_LIMIT, filters=None):
+        """
+        List (NIPP, Nama) paling cocok, paling banyak limit.
+
+        filters: dict kolom -> nilai, misalnya {"PIC": "ODIE", "LEVEL": "BoD-2"};
+        nilai kosong/None diabaikan. Query kosong mengembalikan baris
+        pertama yang lolos filter.
+        """
+        tokens = name_tokens(query)
+        raw = " ".join(tokens)
+        name = normalize_name(query)
+        digits = re.findall(r"\d+", str(query))
+        # Kata terakhir masih diketik kalau query berakhir dengan huruf
+        typing = str(query)[-1:].isalpha()
+
+        candidates = None
+        for n, token in enumerate(tokens):
+            # Awalan token apa adanya atau versi ejaannya ("SUPRIY" -> "SUPRI")
+            lookups = {token, spelling_key(token)}
+            if not (typing and n == len(tokens) - 1):
+                normal = normalize_token(token)
+                lookups |= {normal, spelling_key(normal)}
+            matches = set().union(*(self._token_prefix(lookup) for lookup in lookups))
+            candidates = matches if candidates is None else candidates & matches
+        for number in digits:
+            matches = self._nipp_prefix(number)
+            candidates = matches if candidates is None else candidates & matches
+        if candidates is None:
+            candidates = range(len(self.rows))
+
+        for column, value in (filters or {}).items():
+            if value:
+                position = FILTER_COLUMNS[column]
+                candidates = [i for i in candidates if self.rows[i][position] == value]
+
+        def rank(i):
+            if self.rows[i][0] in digits or (name and self.names[i] == name):
+                return 0, i
+            if name and (self.names[i].startswith(name) or self.raw_names[i].startswith(raw)):
+                return 1, i
+            return 2, i
+
+        return [(self.rows[i][0], self.rows[i][1]) for i in heapq.nsmallest(limit, candidates, key=rank)]
+
+
+def get_index(path=None):
+    """SearchIndex untuk isi talent_store saat ini; dibangun ulang setelah upload baru"""
+    version = talent_store.version(path)
+    key = path or talent_store.STORE_PATH
+    with _lock:
+        cached = _indexes.get(key)
+        if cached is None or cached[0] != version:
+            cached = _indexes[key] = (version, SearchIndex(talent_store.index_rows(path)))
+    return cached[1]
+
+
+def search(query="", limit=SEARCH_LIMIT, filters=None, path=None):
+    return get_index(path).search(query, limit, filters)
@@ -0,0 +1,269 @@
+"""
+Data talent tersimpan di SQLite, supaya app tidak perlu upload ulang setiap sesi
+
+File yang diupload (satu atau gabungan beberapa file) ditulis sekali ke
+STORE_PATH. Sesi berikutnya, dan proses Streamlit lain, langsung membaca
+dari store: daftar orang, nilai PIC/LEVEL dan record per NIPP diambil
+dengan query ber-index, bukan dengan membangun ulang DataFrame.
+
+Setiap baris disimpan utuh sebagai JSON (semua kolom hasil
+clean_talent_data, NaN tetap NaN) ditambah kolom teks ber-index untuk
+INDEXED_COLUMNS. Database memakai mode WAL, jadi banyak pembaca bisa
+berjalan bersamaan dengan satu penulis; upload baru mengganti seluruh isi
+store dalam satu transaksi, pembaca melihat data lama atau baru, tidak
+pernah setengah-setengah.
+
+Naikkan STORE_VERSION kalau skema berubah; store lama dibuat ulang dan
+perlu diupload lagi.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+import timing
+from talent_data import normalize_nipp
+
+STORE_PATH = os.environ.get("TALENT_STORE", os.path.join(".cache", "talent.sqlite3"))
+STORE_VERSION = 1
+
+# Kolom SQL ber-index -> kolom DataFrame (RENAME_DICT)
+INDEXED_COLUMNS = {
+    "nipp": "NIPP",
+    "nama": "Nama",
+    "pic": "PIC",
+    "level": "LEVEL",
+    "status": "Status",
+    "talent_class": "Talent Classification",
+}
+_SQL_COLUMNS = {column: sql for sql, column in INDEXED_COLUMNS.items()}
+
+# Batas jumlah parameter per query IN (...)
+QUERY_CHUNK = 500
+
+_ready = set()
+_lock = threading.Lock()
+
+
+def _create(conn):
+    conn.execute("DROP TABLE IF EXISTS talent")
+    conn.execute("DROP TABLE IF EXISTS meta")
+    conn.execute(
+        "CREATE TABLE talent (id INTEGER PRIMARY KEY, "
+        + ", ".join(f"{sql} TEXT NOT NULL" for sql in INDEXED_COLUMNS)
+        + ", data TEXT NOT NULL)"
+    )
+    for sql in INDEXED_COLUMNS:
+        # nipp dan nama ikut di setiap index supaya people() cukup membaca index,
+        # tidak menyentuh kolom data (JSON) yang besar
+        covering = [column for column in ("nipp", "nama") if column != sql]
+        conn.execute(f"CREATE INDEX talent_{sql} ON talent ({', '.join([sql, *covering])})")
+    conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+
+def connect(path=None):
+    """Koneksi baru ke store; skema dibuat (atau dibuat ulang) sekali per proses"""
+    path = path or STORE_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA busy_timeout = 30000")
+    if path not in _ready:
+        with _lock:
+            if path not in _ready:
+                # journal_mode tersimpan di file database, cukup diset sekali
+                conn.execute("PRAGMA journal_mode = WAL")
+                if conn.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+                    with conn:
+                        _create(conn)
+                _ready.add(path)
+    return conn
+
+
+def _text(value):
+    """Nilai kolom ber-index: teks tanpa spasi di ujung, kosong untuk NaN"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def _index_values(data):
+    values = [normalize_nipp(data.get("NIPP"))]
+    values.extend(_text(data.get(column)) for sql, column in INDEXED_COLUMNS.items() if sql != "nipp")
+    return values
+
+
+@timing.timed("store_write")
+def replace_all(df, digest=None, sources=None, path=None):
+    """
+    Ganti seluruh isi store dengan df (hasil clean_talent_data atau merge_frames).
+
+    Args:
+        digest: Penanda isi upload, supaya rerun dengan file yang sama
+            tidak menulis ulang (lihat stored_digest)
+        sources: dict nama file -> jumlah baris, untuk ditampilkan
+
+    Returns:
+        Jumlah baris yang disimpan
+    """
+    rows = []
+    for data in df.to_dict("records"):
+        # NaN ditulis sebagai NaN (bukan null) supaya PDF sama dengan dari DataFrame
+        rows.append((*_index_values(data), json.dumps(data, ensure_ascii=False, default=str)))
+    meta = {
+        "digest": digest or "",
+        "sources": json.dumps(sources or {}, ensure_ascii=False),
+        "columns": json.dumps([str(col) for col in df.columns], ensure_ascii=False),
+        "source_columns": json.dumps(df.attrs.get("source_columns", []), ensure_ascii=False),
+        "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "version": str(time.time_ns()),
+    }
+    placeholders = ", ".join("?" * (len(INDEXED_COLUMNS) + 1))
+    conn = connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM talent")
+        conn.executemany(f"INSERT INTO talent ({', '.join(INDEXED_COLUMNS)}, data) VALUES ({placeholders})", rows)
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def _query(sql, params=(), path=None):
+    conn = connect(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def stored_digest(path=None):
+    rows = _query("SELECT value FROM meta WHERE key = 'digest'", path=path)
+    return rows[0][0] if rows else None
+
+
+def version(path=None):
+    """Penanda isi store yang berubah setiap replace_all; None kalau store kosong"""
+    rows = _query("SELECT value FROM meta WHERE key = 'version'", path=path)
+    return rows[0][0] if rows else None
+
+
+def info(path=None):
+    """
+    Ringkasan store: count, columns, source_columns, sources, loaded_at.
+
+    count 0 berarti store masih kosong.
+    """
+    meta = dict(_query("SELECT key, value FROM meta", path=path))
+    return {
+        "count": _query("SELECT COUNT(*) FROM talent", path=path)[0][0],
+        "columns": json.loads(meta.get("columns", "[]")),
+        "source_columns": json.loads(meta.get("source_columns", "[]")),
+        "sources": json.loads(meta.get("sources", "{}")),
+        "loaded_at": meta.get("loaded_at"),
+    }
+
+
+def _where(column, value):
+    if column is None:
+        return "", ()
+    return f" AND {_SQL_COLUMNS[column]} = ?", (_text(value),)
+
+
+@timing.timed("store_read")
+def people(column=None, value=None, path=None):
+    """
+    List (NIPP, Nama) urut seperti di file, satu per NIPP (baris pertama).
+
+    column/value membatasi ke satu nilai kolom ber-index, misalnya
+    people("PIC", "ODIE"). Baris tanpa NIPP tidak ikut.
+    """
+    where, params = _where(column, value)
+    rows = _query(f"SELECT id, nipp, nama FROM talent WHERE nipp != ''{where}", params, path)
+    result, seen = [], set()
+    for _, nipp, nama in sorted(rows):
+        if nipp not in seen:
+            seen.add(nipp)
+            result.append((nipp, nama))
+    return result
+
+
+@timing.timed("store_read")
+def index_rows(path=None):
+    """Semua kolom ber-index per baris ber-NIPP, urut seperti di file, untuk talent_search"""
+    columns = ", ".join(INDEXED_COLUMNS)
+    return _query(f"SELECT {columns} FROM talent WHERE nipp != '' ORDER BY id", path=path)
+
+
+@timing.timed("store_read")
+def distinct(column, path=None):
+    """Nilai unik (tidak kosong, urut) dari satu kolom ber-index, misalnya distinct("PIC")"""
+    sql = f"SELECT DISTINCT {_SQL_COLUMNS[column]} FROM talent WHERE {_SQL_COLUMNS[column]} != ''"
+    return sorted(value for value, in _query(sql, path=path))
+
+
+@timing.timed("store_read")
+def get_record(nipp, path=None):
+    """Data satu orang (dict kolom -> nilai) lewat index NIPP, atau None"""
+    rows = _query("SELECT data FROM talent WHERE nipp = ? ORDER BY id LIMIT 1", (normalize_nipp(nipp),), path)
+    return json.loads(rows[0][0]) if rows else None
+
+
+@timing.timed("store_read")
+def get_records(nipps, path=None):
+    """Data beberapa NIPP sekaligus, urut seperti nipps; NIPP yang tidak ada dilewati"""
+    nipps = [normalize_nipp(nipp) for nipp in nipps]
+    found = {}
+    for start in range(0, len(nipps), QUERY_CHUNK):
+        chunk = nipps[start:start + QUERY_CHUNK]
+        sql = f"SELECT nipp, data FROM talent WHERE nipp IN ({', '.join('?' * len(chunk))}) ORDER BY id DESC"
+        # Urut id menurun: baris pertama NIPP yang sama ditulis terakhir
+        found.update(_query(sql, chunk, path))
+    return [json.loads(found[nipp]) for nipp in nipps if nipp in found]
+
+
+@timing.timed("store_read")
+def page(offset=0, limit=50, sort=None, descending=False, filters=None, name=None, path=None):
+    """
+    Satu halaman baris store untuk preview.
+
+    Args:
+        sort: Kolom ber-index untuk pengurutan, None untuk urutan di file
+        filters: dict kolom ber-index -> nilai; nilai kosong/None diabaikan
+        name: Potongan nama (tidak membedakan huruf besar/kecil)
+
+    Returns:
+        (list dict data baris di halaman ini, jumlah baris yang lolos filter)
+    """
+    where, params = ["1"], []
+    for column, value in (filters or {}).items():
+        if value:
+            where.append(f"{_SQL_COLUMNS[column]} = ?")
+            params.append(_text(value))
+    if name and name.strip():
+        where.append("nama LIKE ?")
+        params.append(f"%{name.strip()}%")
+    where = " AND ".join(where)
+    direction = "DESC" if descending else "ASC"
+    order = f"{_SQL_COLUMNS[sort]} {direction}, id" if sort else f"id {direction}"
+
+    conn = connect(path)
+    try:
+        total = conn.execute(f"SELECT COUNT(*) FROM talent WHERE {where}", params).fetchone()[0]
+        # id halaman ini dicari lewat index dulu, jadi baris yang dilewati offset
+        # tidak perlu dibaca JSON-nya
+        ids = [row_id for row_id, in conn.execute(
+            f"SELECT id FROM talent WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?", [*params, limit, offset])]
+        data = dict(conn.execute(f"SELECT id, data FROM talent WHERE id IN ({', '.join('?' * len(ids))})", ids))
+    finally:
+        conn.close()
+    return [json.loads(data[row_id]) for row_id in ids], total
@@ -0,0 +1,162 @@
+"""
+Layout teks untuk PDF profil: pemotongan baris multi_cell dengan cache
+
+FPDF.multi_cell mengukur teks huruf per huruf lewat get_string_width setiap
+kali dipanggil, termasuk judul dan label yang sama di setiap profil
+("BUMN Assessment", "KNOWLEDGE", ...). Di sini lebar huruf diambil dari
+tabel per font dan ukuran, dan hasil pemotongan baris per teks disimpan di
+LRU cache, jadi teks yang sama cukup dihitung sekali per proses.
+
+Pemotongan baris mengikuti FPDF 1.7 multi_cell persis (termasuk spasi rata
+kiri-kanan), sehingga PDF yang dihasilkan tidak berubah. Karena baris sudah
+diketahui sebelum digambar, tinggi blok teks bisa dihitung dulu dengan
+text_height untuk memutuskan pindah halaman.
+"""
+
+import functools
+
+LAYOUT_CACHE_SIZE = 8192
+
+_tables = {}
+
+
+class WidthTable:
+    """Lebar huruf satu font pada satu ukuran, dalam satuan yang dipakai multi_cell"""
+
+    def __init__(self, font, font_size):
+        self.cw = font['cw']
+        self.unicode = font['type'] == 'TTF'
+        self.missing = font.get('desc', {}).get('MissingWidth') or 500
+        self.font_size = font_size
+        self.widths = {}
+
+    def units(self, c):
+        """Lebar satu huruf dalam 1/1000 em, seperti get_string_width"""
+        if not self.unicode:
+            return self.cw.get(c, 0)
+        n = ord(c)
+        return self.cw[n] if len(self.cw) > n else self.missing
+
+    def char(self, c):
+        w = self.widths.get(c)
+        if w is None:
+            units = self.units(c)
+            # Sama dengan get_string_width(c) / font_size * 1000 di multi_cell,
+            # supaya pembulatan dan titik potong baris identik
+            w = self.widths[c] = units * self.font_size / 1000.0 / self.font_size * 1000.0 if self.unicode else units
+        return w
+
+
+def _table_key(pdf, font=None):
+    """Kunci tabel lebar untuk font aktif, atau font=(family, style, size) tanpa set_font"""
+    if font is None:
+        font, font_size = pdf.current_font, pdf.font_size
+    else:
+        family, style, size = font
+        font, font_size = pdf.fonts[family.lower() + style.upper()], size / pdf.k
+    key = (font['name'], font_size)
+    if key not in _tables:
+        _tables[key] = WidthTable(font, font_size)
+    return key
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _string_width(key, s):
+    table = _tables[key]
+    return sum(table.units(c) for c in s) * table.font_size / 1000.0
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _wrap(key, wmax, s):
+    """
+    Potong s menjadi baris selebar wmax (1/1000 em).
+
+    Setiap baris berupa (teks, rata): rata berisi (sisa_lebar, jumlah_spasi)
+    kalau baris dipotong di spasi (untuk align='J'), selain itu None.
+    """
+    char = _tables[key].char
+    s = s.replace("\r", "")
+    nb = len(s)
+    if nb > 0 and s[nb - 1] == "\n":
+        nb -= 1
+    lines = []
+    sep = -1
+    i = j = ns = 0
+    l = ls = 0
+    while i < nb:
+        c = s[i]
+        if c == "\n":
+            lines.append((s[j:i], None))
+            i += 1
+            sep = -1
+            j = i
+            l = ns = 0
+            continue
+        if c == " ":
+            sep = i
+            ls = l
+            ns += 1
+        l += char(c)
+        if l > wmax:
+            if sep == -1:
+                if i == j:
+                    i += 1
+                lines.append((s[j:i], None))
+            else:
+                lines.append((s[j:sep], (wmax - ls, ns)))
+                i = sep + 1
+            sep = -1
+            j = i
+            l = ns = 0
+        else:
+            i += 1
+    lines.append((s[j:i], None))
+    return tuple(lines)
+
+
+def string_width(pdf, s):
+    """Pengganti FPDF.get_string_width dengan cache per font dan teks"""
+    return _string_width(_table_key(pdf), pdf.normalize_text(s))
+
+
+def wrap(pdf, w, txt, font=None):
+    """Baris (teks, rata) untuk multi_cell selebar w dengan font aktif pdf atau font"""
+    if w == 0:
+        w = pdf.w - pdf.r_margin - pdf.x
+    key = _table_key(pdf, font)
+    wmax = (w - 2 * pdf.c_margin) * 1000.0 / _tables[key].font_size
+    return _wrap(key, wmax, pdf.normalize_text(txt))
+
+
+def text_height(pdf, w, h, txt, font=None):
+    """Tinggi blok multi_cell(w, h, txt) tanpa menggambar; font=(family, style, size) opsional"""
+    return len(wrap(pdf, w, txt, font)) * h
+
+
+def multi_cell(pdf, w, h, txt='', border=0, align='J', fill=0):
+    """Gambar teks seperti FPDF.multi_cell dari baris yang sudah dipotong"""
+    if w == 0:
+        w = pdf.w - pdf.r_margin - pdf.x
+    lines = wrap(pdf, w, txt)
+    b = b2 = 0
+    if border:
+        if border == 1:
+            border, b, b2 = 'LTRB', 'LRT', 'LR'
+        else:
+            b2 = ''.join(side for side in 'LR' if side in border)
+            b = b2 + 'T' if 'T' in border else b2
+    last = len(lines) - 1
+    for n, (text, justify) in enumerate(lines):
+        if justify is None or align != 'J':
+            if justify is None and pdf.ws > 0:
+                pdf.ws = 0
+                pdf._out('0 Tw')
+        else:
+            slack, spaces = justify
+            pdf.ws = slack / 1000.0 * pdf.font_size / (spaces - 1) if spaces > 1 else 0
+            pdf._out('%.3f Tw' % (pdf.ws * pdf.k))
+        line_border = b if n == 0 else b2
+        if n == last and border and 'B' in border:
+            line_border += 'B'
+        pdf.cell(w, h, text, line_border, 2, align, fill)
+    pdf.x = pdf.l_margin
@@ -0,0 +1,168 @@
+"""
+Pencatatan waktu per tahap (baca file, parsing tanggal, font, gambar, output PDF, ZIP)
+
+Kode yang diukur cukup dibungkus timing.stage("nama"). Selama tidak ada
+pengumpul aktif di thread itu, stage tidak mengukur apa pun. Pengumpul
+dibuat per request dengan timing.collect(...): semua stage di thread yang
+sama dijumlahkan ke satu Timings, lalu ditulis sebagai satu baris JSON ke
+TIMING_LOG saat selesai.
+
+Stage boleh bersarang; waktu stage anak tidak dihitung lagi di induknya,
+jadi jumlah semua stage tidak melebihi total request. Thread latar (misalnya
+tahap pembaca dan penulis di pipeline.py) bisa mencatat ke Timings yang sama
+lewat timing.attach; stage-nya berjalan bersamaan dengan thread pemanggil,
+jadi jumlahnya boleh melebihi total.
+
+Dengan profile=True seluruh request juga direkam cProfile ke
+.cache/profiles/<nama>-<waktu>.prof (buka dengan snakeviz atau pstats).
+"""
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+TIMING_LOG = os.environ.get("TALENT_TIMING_LOG", os.path.join(".cache", "timing.jsonl"))
+PROFILE_DIR = os.environ.get("TALENT_PROFILE_DIR", os.path.join(".cache", "profiles"))
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class Timings:
+    """Total detik dan jumlah pemanggilan per stage untuk satu request"""
+
+    def __init__(self, name, **meta):
+        self.name = name
+        self.meta = meta
+        self.seconds = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.total = 0.0
+        self.profile_path = None
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds, count=1):
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.counts[stage] += count
+
+    def merge(self, stages):
+        """Gabungkan hasil as_dict()["stages"] dari proses lain (misalnya worker)"""
+        for stage, values in stages.items():
+            self.add(stage, values["seconds"], values["count"])
+
+    def rows(self):
+        """Baris tabel per stage untuk ditampilkan; sisa waktu masuk baris "lainnya"."""
+        rows = [{"stage": stage, "detik": round(seconds, 3), "jumlah": self.counts[stage]}
+                for stage, seconds in sorted(self.seconds.items(), key=lambda item: item[1], reverse=True)]
+        other = self.total - sum(self.seconds.values())
+        if other > 0.0005:
+            rows.append({"stage": "lainnya", "detik": round(other, 3), "jumlah": None})
+        for row in rows:
+            row["%"] = round(row["detik"] / self.total * 100, 1) if self.total else 0.0
+        return rows
+
+    def as_dict(self):
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "request": self.name,
+            **self.meta,
+            "total": round(self.total, 4),
+            "stages": {stage: {"seconds": round(self.seconds[stage], 4), "count": self.counts[stage]}
+                       for stage in sorted(self.seconds, key=self.seconds.get, reverse=True)},
+            "profile": self.profile_path,
+        }
+
+
+def current():
+    """Timings yang sedang aktif di thread ini, atau None"""
+    return getattr(_local, "timings", None)
+
+
+@contextmanager
+def stage(name):
+    timings = current()
+    if timings is None:
+        yield
+        return
+    stack = _local.stack
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        children = stack.pop()
+        timings.add(name, elapsed - children)
+        if stack:
+            stack[-1] += elapsed
+
+
+def timed(name):
+    """Decorator: seluruh pemanggilan fungsi dicatat sebagai stage name"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def attach(timings):
+    """Catat stage di thread ini ke timings milik thread lain (None: tidak dicatat)"""
+    previous = current(), getattr(_local, "stack", None)
+    _local.timings, _local.stack = timings, []
+    try:
+        yield
+    finally:
+        _local.timings, _local.stack = previous
+
+
+def write_log(timings, path=None):
+    path = path or TIMING_LOG
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    line = json.dumps(timings.as_dict(), ensure_ascii=False)
+    with _log_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+@contextmanager
+def collect(name, log=True, profile=False, **meta):
+    """
+    Kumpulkan semua stage di thread ini selama blok berjalan.
+
+    Args:
+        name: Nama request di log, misalnya "app.batch_zip"
+        log: Tulis hasil ke TIMING_LOG saat selesai
+        profile: Rekam cProfile untuk blok ini
+        meta: Keterangan tambahan untuk log (jumlah profil, nama file, ...)
+    """
+    timings = Timings(name, **meta)
+    previous = current(), getattr(_local, "stack", None)
+    _local.timings, _local.stack = timings, []
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield timings
+    finally:
+        if profiler:
+            profiler.disable()
+        timings.total = time.perf_counter() - start
+        _local.timings, _local.stack = previous
+        if profiler:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            timings.profile_path = os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+            profiler.dump_stats(timings.profile_path)
+        if log:
+            try:
+                write_log(timings)
+            except OSError:
+                pass